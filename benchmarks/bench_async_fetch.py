@@ -0,0 +1,56 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+import parsel
+from webscraperr import WebScraperRequest, AsyncWebScraperRequest, logger
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, WebScraperDBSqlite
+from .stub_server import StubServer
+
+
+def parse_info_func(response):
+    selector = parsel.Selector(text=response.text)
+    return {
+        'name': selector.css('h4::text').get(),
+        'price': selector.css('.price::text').get()
+    }
+
+
+def run(scraper_class, base_url: str, items: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        config['SCRAPER']['CONCURRENCY'] = concurrency
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        with WebScraperDBSqlite(config['DATABASE']) as conn:
+            conn.save_urls([[f"{base_url}/item/{i}"] for i in range(items)])
+        with scraper_class(config) as scraper:
+            scraper.parse_info_func = parse_info_func
+            start = time.perf_counter()
+            scraper.scrape_items_infos()
+            elapsed = time.perf_counter() - start
+        with WebScraperDBSqlite(config['DATABASE']) as conn:
+            assert len(conn.get_all_without_info()) == 0
+    return items / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serial and async item info scraping")
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+    with StubServer(args.latency) as server:
+        serial = run(WebScraperRequest, server.base_url, args.items, args.concurrency)
+        concurrent = run(AsyncWebScraperRequest, server.base_url, args.items, args.concurrency)
+    print(f"serial  WebScraperRequest      {serial:10.1f} pages/sec")
+    print(f"async   AsyncWebScraperRequest {concurrent:10.1f} pages/sec (concurrency={args.concurrency})")
+    print(f"speedup {concurrent / serial:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import copy
+import logging
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+from webscraperr import logger
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.driver import get_driver, get_driver_memory_mb
+from .stub_server import StubServer
+
+
+class HeavySiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        if self.path.startswith('/asset/'):
+            body = os.urandom(self.server.asset_size)
+            content_type = 'application/octet-stream'
+        else:
+            assets = self.server.page_weight
+            body = "".join([
+                "<html><head>",
+                "<link rel='stylesheet' href='/asset/style.css'>",
+                "<script src='http://analytics.localhost/track.js'></script>",
+                "</head><body><h4>Product</h4>",
+                "".join(f"<img src='/asset/{self.path.strip('/')}-{i}.jpg'>" for i in range(assets)),
+                "<video src='/asset/promo.mp4' autoplay muted></video>",
+                "</body></html>"
+            ]).encode()
+            content_type = 'text/html'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(config: dict, base_url: str, pages: int):
+    driver = get_driver(config['DRIVER'])
+    try:
+        load_times = []
+        peak_memory_mb = 0.0
+        for i in range(pages):
+            start = time.perf_counter()
+            driver.get(f"{base_url}/product-{i}")
+            load_times.append(time.perf_counter() - start)
+            peak_memory_mb = max(peak_memory_mb, get_driver_memory_mb(driver) or 0.0)
+    finally:
+        driver.quit()
+    return sum(load_times) / len(load_times), peak_memory_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chrome page load time and memory with and without request blocking")
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-weight', type=int, default=40, help="Images per page")
+    parser.add_argument('--asset-size', type=int, default=200_000, help="Bytes per asset")
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    config = get_default_config()
+    config['DATABASE']['DATABASE'] = 'unused.db'
+    validate_config(config)
+    filtered = copy.deepcopy(config)
+    filtered['DRIVER']['BLOCK']['RESOURCE_TYPES'] = ['image', 'font', 'media', 'stylesheet']
+    filtered['DRIVER']['BLOCK']['DOMAINS'] = ['analytics.localhost']
+    filtered['DRIVER']['CAPTURE']['MAX_REQUESTS'] = 0
+    validate_config(filtered)
+
+    with StubServer(args.latency, args.page_weight, handler=HeavySiteHandler) as server:
+        server.server.asset_size = args.asset_size
+        for name, run_config in [('unfiltered', config), ('filtered', filtered)]:
+            load_time, peak_memory_mb = run(run_config, server.base_url, args.pages)
+            print(f"{name:10}  {load_time * 1000:8.1f} ms/page  peak {peak_memory_mb:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
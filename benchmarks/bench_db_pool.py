@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import DBTypes, init_sqlite, init_mysql, get_db_class_by_config, get_db_pool_by_config
+
+
+def write_latency(database_config: dict, writes: int, pooled: bool):
+    pool = get_db_pool_by_config(database_config) if pooled else None
+    db_class = get_db_class_by_config(database_config, pool)
+    with db_class(database_config) as conn:
+        conn.clear_database()
+        conn.save_urls([[f"http://localhost/item/{i}"] for i in range(writes)])
+        ids = [row['ID'] for row in conn.get_all()]
+    info = json.dumps({'name': 'item', 'price': '$1.00'})
+    start = time.perf_counter()
+    for id in ids:
+        with db_class(database_config) as conn:
+            conn.set_info_by_id(id, info)
+    elapsed = time.perf_counter() - start
+    if pool is not None:
+        pool.close()
+    return elapsed / writes * 1000
+
+
+def report(name: str, database_config: dict, writes: int):
+    before = write_latency(database_config, writes, pooled=False)
+    after = write_latency(database_config, writes, pooled=True)
+    print(f"{name:7} unpooled {before:8.3f} ms/write  pooled {after:8.3f} ms/write  ({before / after:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-write latency with and without connection pooling")
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--mysql-host', help="Also benchmark a MySQL compatible server, e.g. a local MariaDB")
+    parser.add_argument('--mysql-user', default='root')
+    parser.add_argument('--mysql-password', default='')
+    parser.add_argument('--mysql-database', default='webscraperr_bench')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        report('SQLITE', config['DATABASE'], args.writes)
+
+    if args.mysql_host:
+        config = get_default_config()
+        config['DATABASE']['TYPE'] = DBTypes.MYSQL
+        config['DATABASE']['DATABASE'] = args.mysql_database
+        config['DATABASE']['AUTH'] = {
+            'user': args.mysql_user,
+            'password': args.mysql_password,
+            'host': args.mysql_host,
+            'database': args.mysql_database
+        }
+        validate_config(config)
+        init_mysql(config['DATABASE'])
+        report('MYSQL', config['DATABASE'], args.writes)
+    else:
+        print("MYSQL   skipped, pass --mysql-host to benchmark a MySQL compatible server")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, get_db_class_by_config
+from webscraperr.export import ExportFormats, export_items
+
+
+def fill_items(database_config: dict, rows: int):
+    db_class = get_db_class_by_config(database_config)
+    batch = 10000
+    for start in range(0, rows, batch):
+        datas = []
+        for i in range(start, min(start + batch, rows)):
+            info = {
+                'name': f"Item {i}",
+                'price': i * 1.25,
+                'stock': i % 50,
+                'tags': ['sale', 'new'] if i % 2 else [],
+                'description': "Lorem ipsum dolor sit amet " * 4
+            }
+            datas.append([f"http://localhost/item/{i}", json.dumps(info)])
+        with db_class(database_config) as conn:
+            conn.save_url_and_info_many(datas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows per second exported for each format")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        fill_items(config['DATABASE'], args.rows)
+
+        for export_format in ExportFormats:
+            path = os.path.join(tmp, f"items.{export_format.lower()}")
+            try:
+                start = time.perf_counter()
+                exported = export_items(config['DATABASE'], path, export_format, chunk_size=args.chunk_size)
+                elapsed = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{export_format:7} skipped, {e}")
+                continue
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"{export_format:7} {exported / elapsed:10.0f} rows/s  {size:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ['seleniumwire', 'undetected_chromedriver', 'selenium', 'mysql.connector', 'requests']
+
+STATEMENTS = [
+    'pass',
+    'import webscraperr',
+    'from webscraperr import WebScraperRequest',
+    'from webscraperr.db import WebScraperDBSqlite',
+    'from webscraperr import WebScraperChrome'
+]
+
+CODE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'SECONDS': elapsed,
+    'RSS_MB': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'MODULES': [module for module in {heavy_modules!r} if module in sys.modules]
+}}))
+"""
+
+
+def measure(statement: str, runs: int):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', CODE.format(statement=statement, heavy_modules=HEAVY_MODULES)],
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output))
+    return {
+        'SECONDS': statistics.median(result['SECONDS'] for result in results),
+        'RSS_MB': statistics.median(result['RSS_MB'] for result in results),
+        'MODULES': results[0]['MODULES']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time and memory of webscraperr, each import in a fresh interpreter")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+    results = {statement: measure(statement, args.runs) for statement in STATEMENTS}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for statement, result in results.items():
+        print(f"{statement:45} {result['SECONDS'] * 1000:8.1f} ms  {result['RSS_MB']:6.1f} MB  {', '.join(result['MODULES'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+from webscraperr import WebScraperRequest, logger
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, WebScraperDBSqlite
+from webscraperr.metrics import get_metrics
+from .bench_async_fetch import parse_info_func
+from .stub_server import StubServer
+
+
+def run(base_url: str, items: int, metrics_config: dict):
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        config['SCRAPER']['METRICS'].update(metrics_config)
+        config['SCRAPER']['METRICS']['PROFILE_DIR'] = os.path.join(tmp, 'profiles')
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        with WebScraperDBSqlite(config['DATABASE']) as conn:
+            conn.save_urls([[f"{base_url}/item/{i}"] for i in range(items)])
+        with WebScraperRequest(config) as scraper:
+            scraper.parse_info_func = parse_info_func
+            start = time.perf_counter()
+            scraper.scrape_items_infos()
+            elapsed = time.perf_counter() - start
+            snapshot = scraper.metrics.snapshot() if metrics_config.get('ENABLED') else None
+    return items / elapsed, snapshot
+
+
+def time_calls(metrics, calls: int):
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.timer('PARSE'):
+            pass
+        metrics.inc('pages_total')
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overhead of the metrics and stage profilers")
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--calls', type=int, default=200000)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    for name, config in [('disabled', {'ENABLED': False}), ('enabled', {'ENABLED': True})]:
+        print(f"{name:9} timer + counter {time_calls(get_metrics(config), args.calls):8.0f} ns/call")
+
+    modes = [
+        ('disabled', {'ENABLED': False}),
+        ('enabled', {'ENABLED': True}),
+        ('cprofile', {'ENABLED': True, 'PROFILE': 'cprofile', 'PROFILE_STAGES': ['PARSE']})
+    ]
+    with StubServer(args.latency) as server:
+        baseline = None
+        for name, config in modes:
+            rate, snapshot = run(server.base_url, args.items, config)
+            baseline = baseline or rate
+            print(f"{name:9} {rate:10.1f} pages/sec  {(baseline / rate - 1) * 100:+6.1f}%")
+            if snapshot and name == 'enabled':
+                for stage, summary in snapshot['HISTOGRAMS'].items():
+                    print(f"          {stage:20} p50 {summary['P50'] * 1000:7.2f} ms  p99 {summary['P99'] * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
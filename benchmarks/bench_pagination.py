@@ -0,0 +1,97 @@
+import argparse
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit, parse_qs, urljoin
+import parsel
+from webscraperr import WebScraperRequest
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, WebScraperDBSqlite
+from webscraperr.urls import set_query_param
+from .stub_server import StubServer, StubHandler
+
+
+class ListingHandler(StubHandler):
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+        page = int(parse_qs(parts.query).get('page', ['1'])[0])
+        pages = self.server.pages
+        links = ""
+        if page <= pages:
+            links = "".join(f"<a class='item' href='/item{parts.path}/{page}/{i}'>Item</a>" for i in range(self.server.page_size))
+        next_link = f"<a class='next' href='{parts.path}?page={page + 1}'>Next</a>" if page < pages else ""
+        body = f"<html><body><span class='pages'>{pages}</span>{links}{next_link}</body></html>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def get_items_urls_func(response):
+    return [urljoin(response.url, href) for href in parsel.Selector(text=response.text).css('a.item::attr(href)').getall()]
+
+
+def get_next_page_func(response):
+    href = parsel.Selector(text=response.text).css('a.next::attr(href)').get()
+    return urljoin(response.url, href) if href else None
+
+
+def get_page_urls_func(response):
+    pages = int(parsel.Selector(text=response.text).css('.pages::text').get())
+    return [set_query_param(response.url, 'page', page) for page in range(2, pages + 1)]
+
+
+def run(mode: str, base_url: str, seeds: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        config['SCRAPER']['CONCURRENCY'] = concurrency
+        if mode in ['param', 'probe']:
+            config['SCRAPER']['PAGINATION']['PARAM'] = 'page'
+            config['SCRAPER']['PAGINATION']['PROBE_LAST_PAGE'] = mode == 'probe'
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        with WebScraperRequest(config) as scraper:
+            scraper.get_items_urls_func = get_items_urls_func
+            if mode in ['serial', 'seeds']:
+                scraper.get_next_page_func = get_next_page_func
+            if mode == 'listed':
+                scraper.get_page_urls_func = get_page_urls_func
+            urls = [f"{base_url}/cat{i}" for i in range(seeds)]
+            start = time.perf_counter()
+            if mode == 'serial':
+                for url in urls:
+                    scraper.scrape_items_urls([url])
+            else:
+                scraper.scrape_items_urls(urls)
+            elapsed = time.perf_counter() - start
+        with WebScraperDBSqlite(config['DATABASE']) as conn:
+            count = conn.get_count()
+    return elapsed, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing pages crawled serially, with seeds in parallel and with parallel pagination")
+    parser.add_argument('--seeds', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=25)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency, handler=ListingHandler) as server:
+        server.server.pages = args.pages
+        server.server.page_size = args.page_size
+        expected = args.seeds * args.pages * args.page_size
+        for mode in ['serial', 'seeds', 'listed', 'param', 'probe']:
+            elapsed, count = run(mode, server.base_url, args.seeds, args.concurrency)
+            print(f"{mode:7} {elapsed:6.2f} s  {args.seeds * args.pages / elapsed:7.1f} pages/s  {count}/{expected} urls")
+
+
+if __name__ == '__main__':
+    import logging
+    from webscraperr import logger
+    logger.setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+import parsel
+from webscraperr import PipelineWebScraperRequest, logger
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, WebScraperDBSqlite
+from .stub_server import StubServer
+
+
+def parse_info_func(response):
+    selector = parsel.Selector(text=response.text)
+    return {
+        'name': selector.css('h4::text').get(),
+        'price': selector.css('.price::text').get(),
+        'variants': [
+            {'sku': row.css('.sku::text').get(), 'desc': row.css('.desc::text').get()}
+            for row in selector.css('tr')
+        ]
+    }
+
+
+def run(base_url: str, items: int, parse_workers: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = os.path.join(tmp, 'bench.db')
+        config['SCRAPER']['PARSE_WORKERS'] = parse_workers
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        with WebScraperDBSqlite(config['DATABASE']) as conn:
+            conn.save_urls([[f"{base_url}/item/{i}"] for i in range(items)])
+        with PipelineWebScraperRequest(config) as scraper:
+            scraper.parse_info_func = parse_info_func
+            start = time.perf_counter()
+            scraper.scrape_items_infos()
+            elapsed = time.perf_counter() - start
+    return items / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse throughput of PipelineWebScraperRequest by number of parser processes")
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--page-weight', type=int, default=2000, help="Table rows per page")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+    workers = 1
+    with StubServer(latency=0, page_weight=args.page_weight) as server:
+        while workers <= args.max_workers:
+            print(f"parse workers {workers:3}  {run(server.base_url, args.items, workers):10.1f} pages/sec")
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
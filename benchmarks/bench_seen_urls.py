@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, get_db_class_by_config
+from webscraperr.buffer import WriteBuffer
+
+
+def make_config(tmp: str, name: str, seen_urls_type: str = None):
+    config = get_default_config()
+    database_config = config['DATABASE']
+    database_config['DATABASE'] = os.path.join(tmp, f"{name}.db")
+    database_config['BUFFER']['INTERVAL'] = None
+    if seen_urls_type:
+        database_config['SEEN_URLS'].update(ENABLED=True, TYPE=seen_urls_type, PATH=os.path.join(tmp, f"{name}.seen"))
+    validate_config(config)
+    init_sqlite(database_config)
+    return database_config
+
+
+def run(database_config: dict, items: int, pages: int, page_size: int, seen_ratio: float):
+    db_class = get_db_class_by_config(database_config)
+    with db_class(database_config) as conn:
+        conn.save_urls([[f"http://localhost/item/{i}"] for i in range(items)])
+    with WriteBuffer(db_class, database_config):
+        pass
+    random.seed(0)
+    next_new = items
+    start = time.perf_counter()
+    with WriteBuffer(db_class, database_config) as write_buffer:
+        opened = time.perf_counter() - start
+        for _ in range(pages):
+            urls = []
+            for _ in range(page_size):
+                if random.random() < seen_ratio:
+                    urls.append([f"http://localhost/item/{random.randrange(items)}"])
+                else:
+                    urls.append([f"http://localhost/item/{next_new}"])
+                    next_new += 1
+            write_buffer.save_urls(urls)
+    return opened, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time spent saving discovered URLs when most of them were already seen")
+    parser.add_argument('--items', type=int, default=200000)
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--seen-ratio', type=float, default=0.9)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, seen_urls_type in [('none', None), ('set', 'SET'), ('bloom', 'BLOOM')]:
+            database_config = make_config(tmp, name, seen_urls_type)
+            opened, elapsed = run(database_config, args.items, args.pages, args.page_size, args.seen_ratio)
+            size = ""
+            if seen_urls_type:
+                size = f"  index {os.path.getsize(database_config['SEEN_URLS']['PATH']) / 1024 / 1024:6.1f} MB"
+            print(f"{name:6} startup {opened * 1000:8.1f} ms  total {elapsed:6.2f} s  {args.pages * args.page_size / elapsed:9.0f} urls/s{size}")
+
+
+if __name__ == '__main__':
+    main()
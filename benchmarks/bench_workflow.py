@@ -0,0 +1,227 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
+from urllib.parse import urljoin
+import parsel
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import DBTypes, get_db_class_by_config, init_sqlite, init_mysql
+from .fake_shop import FakeShop
+
+SCRAPERS = ['request', 'async', 'pipeline', 'chrome']
+
+
+def get_items_urls_func(response):
+    return [urljoin(response.url, href) for href in parsel.Selector(text=response.text).css('a.item::attr(href)').getall()]
+
+
+def get_next_page_func(response):
+    href = parsel.Selector(text=response.text).css('a.next::attr(href)').get()
+    return urljoin(response.url, href) if href else None
+
+
+def parse_info_func(response):
+    selector = parsel.Selector(text=response.text)
+    return {
+        'name': selector.css('h4::text').get(),
+        'price': selector.css('.price::text').get(),
+        'variants': len(selector.css('td.sku'))
+    }
+
+
+def get_items_urls_chrome(driver):
+    return [urljoin(driver.current_url, href) for href in parsel.Selector(text=driver.page_source).css('a.item::attr(href)').getall()]
+
+
+def get_next_page_chrome(driver):
+    href = parsel.Selector(text=driver.page_source).css('a.next::attr(href)').get()
+    return urljoin(driver.current_url, href) if href else None
+
+
+def parse_info_chrome(driver):
+    selector = parsel.Selector(text=driver.page_source)
+    return {
+        'name': selector.css('h4::text').get(),
+        'price': selector.css('.price::text').get(),
+        'variants': len(selector.css('td.sku'))
+    }
+
+
+def get_scraper(name: str, config: dict):
+    import webscraperr
+    if name == 'chrome':
+        scraper = webscraperr.WebScraperChrome(config)
+        scraper.get_items_urls_func = get_items_urls_chrome
+        scraper.get_next_page_func = get_next_page_chrome
+        scraper.parse_info_func = parse_info_chrome
+        return scraper
+    scraper_class = {
+        'request': webscraperr.WebScraperRequest,
+        'async': webscraperr.AsyncWebScraperRequest,
+        'pipeline': webscraperr.PipelineWebScraperRequest
+    }[name]
+    scraper = scraper_class(config)
+    scraper.get_items_urls_func = get_items_urls_func
+    scraper.get_next_page_func = get_next_page_func
+    scraper.parse_info_func = parse_info_func
+    return scraper
+
+
+def get_latency(snapshot: dict):
+    latency = {}
+    for name, summary in snapshot['HISTOGRAMS'].items():
+        if summary['COUNT']:
+            latency[name.upper()] = {
+                'COUNT': summary['COUNT'],
+                'P50_MS': round(summary['P50'] * 1000, 3),
+                'P99_MS': round(summary['P99'] * 1000, 3)
+            }
+    return latency
+
+
+def run_scenario(scraper_name: str, database_config: dict, catalogue_url: str, items: int, concurrency: int):
+    from webscraperr import logger
+    logger.setLevel(logging.WARNING)
+    config = get_default_config()
+    config['DATABASE'] = database_config
+    config['SCRAPER']['CONCURRENCY'] = concurrency
+    config['SCRAPER']['METRICS']['ENABLED'] = True
+    validate_config(config)
+
+    with get_scraper(scraper_name, config) as scraper:
+        start = time.perf_counter()
+        scraper.scrape_items_urls([catalogue_url])
+        urls_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        scraper.scrape_items_infos()
+        infos_elapsed = time.perf_counter() - start
+        snapshot = scraper.metrics.snapshot()
+
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        saved = conn.get_count()
+        with_info = len(list(conn.iter_with_info()))
+    return {
+        'URLS_SECONDS': round(urls_elapsed, 3),
+        'INFOS_SECONDS': round(infos_elapsed, 3),
+        'URLS_PER_SECOND': round(saved / urls_elapsed, 1),
+        'ITEMS_PER_SECOND': round(with_info / infos_elapsed, 1),
+        'URLS_SAVED': saved,
+        'ITEMS_SCRAPED': with_info,
+        'ITEMS_MISSING': items - with_info,
+        'LATENCY': get_latency(snapshot),
+        'COUNTERS': snapshot['COUNTERS'],
+        'PEAK_RSS_MB': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'PEAK_CHILD_RSS_MB': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    }
+
+
+def get_mysql_config(args, table: str):
+    config = get_default_config()['DATABASE']
+    config['TYPE'] = DBTypes.MYSQL
+    config['DATABASE'] = args.mysql_database
+    config['TABLE'] = table
+    config['AUTH'] = {'user': args.mysql_user, 'password': args.mysql_password, 'host': args.mysql_host, 'database': args.mysql_database}
+    return config
+
+
+def prepare_mysql(database_config: dict):
+    from mysql.connector import connect, Error
+    try:
+        init_mysql(database_config)
+        with connect(**database_config['AUTH']) as conn:
+            cursor = conn.cursor()
+            for suffix in ['', '_frontier', '_checkpoints', '_dead_letters']:
+                cursor.execute(f"TRUNCATE TABLE `{database_config['TABLE']}{suffix}`")
+    except Error as e:
+        return str(e)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full scrape_items_urls and scrape_items_infos workflow against a local fake shop")
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--page-weight', type=int, default=20, help="Table rows per product page")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scrapers', default='request,async,pipeline', help=f"Comma separated list of {', '.join(SCRAPERS)}")
+    parser.add_argument('--mysql-host', default=os.environ.get('WEBSCRAPERR_BENCH_MYSQL_HOST'))
+    parser.add_argument('--mysql-user', default=os.environ.get('WEBSCRAPERR_BENCH_MYSQL_USER', 'root'))
+    parser.add_argument('--mysql-password', default=os.environ.get('WEBSCRAPERR_BENCH_MYSQL_PASSWORD', ''))
+    parser.add_argument('--mysql-database', default=os.environ.get('WEBSCRAPERR_BENCH_MYSQL_DATABASE', 'webscraperr_bench'))
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    args = parser.parse_args()
+    scrapers = args.scrapers.split(',')
+    for name in scrapers:
+        if name not in SCRAPERS:
+            parser.error(f"unknown scraper {name}")
+
+    try:
+        package_version = version('webscraperr')
+    except PackageNotFoundError:
+        package_version = None
+    report = {
+        'BENCHMARK': 'workflow',
+        'VERSION': package_version,
+        'PYTHON': platform.python_version(),
+        'PLATFORM': platform.platform(),
+        'CPUS': os.cpu_count(),
+        'TIMESTAMP': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'PARAMETERS': {
+            'ITEMS': args.items,
+            'PAGE_SIZE': args.page_size,
+            'LATENCY': args.latency,
+            'ERROR_RATE': args.error_rate,
+            'PAGE_WEIGHT': args.page_weight,
+            'SEED': args.seed,
+            'CONCURRENCY': args.concurrency
+        },
+        'RESULTS': []
+    }
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        for scraper_name in scrapers:
+            databases = [DBTypes.SQLITE, DBTypes.MYSQL] if args.mysql_host else [DBTypes.SQLITE]
+            for database_type in databases:
+                result = {'SCRAPER': scraper_name, 'DATABASE': database_type.value}
+                if database_type == DBTypes.MYSQL:
+                    database_config = get_mysql_config(args, f"bench_{scraper_name}")
+                    error = prepare_mysql(database_config)
+                else:
+                    database_config = get_default_config()['DATABASE']
+                    database_config['DATABASE'] = os.path.join(tmp, f"{scraper_name}.db")
+                    init_sqlite(database_config)
+                    error = None
+                if error:
+                    result['SKIPPED'] = error
+                else:
+                    with FakeShop(args.items, args.page_size, args.latency, args.error_rate, args.page_weight, args.seed) as shop:
+                        with ProcessPoolExecutor(1, mp_context=context) as executor:
+                            future = executor.submit(run_scenario, scraper_name, database_config, shop.catalogue_url, args.items, args.concurrency)
+                            try:
+                                result.update(future.result())
+                            except Exception as e:
+                                result['ERROR'] = f"{type(e).__name__}: {e}"
+                print(f"{scraper_name:8} {database_type.value:6} {json.dumps({k: v for k, v in result.items() if k in ['URLS_PER_SECOND', 'ITEMS_PER_SECOND', 'PEAK_RSS_MB', 'ERROR', 'SKIPPED']})}", file=sys.stderr)
+                report['RESULTS'].append(result)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from .stub_server import StubServer
+
+
+def should_fail(server, path: str):
+    if not server.error_rate:
+        return False
+    with server.lock:
+        attempt = server.attempts[path]
+        server.attempts[path] += 1
+    digest = hashlib.blake2b(f"{server.seed}:{path}:{attempt}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') / 2 ** 64 < server.error_rate
+
+
+class FakeShopHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        if should_fail(self.server, self.path):
+            self.send_body(503, "<html><body>Service Unavailable</body></html>")
+            return
+        parts = urlsplit(self.path)
+        if parts.path == '/catalogue':
+            page = int(parse_qs(parts.query).get('page', ['1'])[0])
+            self.send_catalogue_page(page)
+        elif parts.path.startswith('/item/') and parts.path[6:].isdigit() and int(parts.path[6:]) < self.server.items:
+            self.send_item_page(int(parts.path[6:]))
+        else:
+            self.send_body(404, "<html><body>Not Found</body></html>")
+
+    def send_catalogue_page(self, page: int):
+        server = self.server
+        pages = math.ceil(server.items / server.page_size)
+        first = (page - 1) * server.page_size
+        links = "".join(f"<a class='item' href='/item/{i}'>Product {i}</a>" for i in range(max(first, 0), min(first + server.page_size, server.items)))
+        next_link = f"<a class='next' href='/catalogue?page={page + 1}'>Next</a>" if page < pages else ""
+        self.send_body(200, f"<html><body><span class='pages'>{pages}</span>{links}{next_link}</body></html>")
+
+    def send_item_page(self, item: int):
+        rows = "".join(f"<tr><td class='sku'>{item}-{i}</td><td class='desc'>Variant {i} of product {item}</td></tr>" for i in range(self.server.page_weight))
+        price = (item * 7919) % 100000 / 100
+        self.send_body(200, f"<html><body><h4>Product {item}</h4><span class='price'>${price:.2f}</span><table>{rows}</table></body></html>")
+
+    def send_body(self, status: int, text: str):
+        body = text.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeShop(StubServer):
+    def __init__(self, items: int = 1000, page_size: int = 20, latency: float = 0.01, error_rate: float = 0.0,
+                 page_weight: int = 20, seed: int = 0):
+        super().__init__(latency, page_weight, FakeShopHandler)
+        self.server.items = items
+        self.server.page_size = page_size
+        self.server.error_rate = error_rate
+        self.server.seed = seed
+        self.server.attempts = Counter()
+        self.server.lock = threading.Lock()
+
+    @property
+    def catalogue_url(self):
+        return f"{self.base_url}/catalogue"
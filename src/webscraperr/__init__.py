@@ -1,23 +1,38 @@
 from typing import Callable, List, Dict, Union, Tuple
 from .db import *
 from .exceptions import *
-from .driver import get_driver
+from .ratelimit import RateLimiter
+from .buffer import WriteBuffer
+from .cache import HTTPCache
+from .utils import get_parse_workers, parse_raw_response
+from .urls import set_query_param
+from .metrics import get_metrics
+from .retry import RetryQueue
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import importlib
 import json
-import seleniumwire.undetected_chromedriver as uc
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.action_chains import ActionChains
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-stream_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-stream_handler.setFormatter(formatter)
+LAZY_ATTRIBUTES = {
+    'WebScraperChrome': '.chrome',
+    'get_driver': '.driver',
+    'ChromeDriverPool': '.driver',
+    'ResponseArchive': '.archive'
+}
 
-logger.addHandler(stream_handler)
+def __getattr__(name: str):
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
 
 def config_sleep(seconds: Union[float, None]):
     if seconds is not None:
@@ -29,204 +44,607 @@ class WebScraperRequest:
         self.get_items_urls_func : Callable[[requests.Response], List[str]] = None
         self.get_items_urls_and_infos_func: Callable[[requests.Response], List[Tuple[str, Dict]]] = None
         self.get_next_page_func : Callable[[requests.Response], str] = None
+        self.get_page_urls_func : Callable[[requests.Response], List[str]] = None
         self.parse_info_func : Callable[[requests.Response], Dict] = None
         self.session: requests.Session = None
-        self.db_class = get_db_class_by_config(config['DATABASE'])
+        self.db_pool = get_db_pool_by_config(config['DATABASE'])
+        self.db_class = get_db_class_by_config(config['DATABASE'], self.db_pool)
+        self.rate_limiter = RateLimiter(config['SCRAPER'])
+        self.metrics = get_metrics(config['SCRAPER'].get('METRICS'))
+        self.write_buffer = WriteBuffer(self.db_class, config['DATABASE'], self.metrics)
+        self.retry_queue = RetryQueue(config['SCRAPER'].get('RETRY'))
+        self.http_cache: HTTPCache = None
+        if config['SCRAPER'].get('HTTP_CACHE', {}).get('ENABLED'):
+            self.http_cache = HTTPCache(config['SCRAPER']['HTTP_CACHE'])
+        self.archive: 'ResponseArchive' = None
+        if config['SCRAPER'].get('ARCHIVE', {}).get('ENABLED'):
+            self.archive = importlib.import_module('.archive', __name__).ResponseArchive(config['SCRAPER']['ARCHIVE'])
 
     def __enter__(self):
+        self.metrics.start()
+        self.metrics.gauge('write_buffer_pending', self.write_buffer.__len__)
+        self.metrics.gauge('retry_queue_pending', self.retry_queue.__len__)
+        self.metrics.gauge_group('rate_limit', self.rate_limiter.metrics, 'host')
         self.session = requests.Session()
+        if self.http_cache:
+            self.http_cache.open()
+        if self.archive:
+            self.archive.open()
+        self.write_buffer.__enter__()
         return self
     
     def __exit__(self, type, value, traceback):
-        self.session.close()
+        try:
+            self.write_buffer.close()
+        finally:
+            self.db_pool.close()
+            self.session.close()
+            if self.http_cache:
+                self.http_cache.close()
+            if self.archive:
+                self.archive.close()
+            self.metrics.close()
+
+    def get(self, url: str):
+        with self.metrics.timer('RATE_LIMIT'):
+            self.rate_limiter.wait(url)
+        return self.fetch(url)
+
+    def fetch(self, url: str):
+        cached = self.http_cache.get(url) if self.http_cache else None
+        headers = self.http_cache.get_conditional_headers(cached) if self.http_cache else None
+        try:
+            with self.metrics.timer('FETCH'):
+                response = self.session.get(url, headers=headers)
+        except requests.RequestException:
+            self.metrics.inc('fetch_errors_total')
+            raise
+        self.metrics.inc('responses_total', status=response.status_code)
+        self.metrics.inc('bytes_downloaded_total', len(response.content))
+        self.rate_limiter.update(url, response)
+        if self.http_cache:
+            response = self.http_cache.update(url, response, cached)
+        return response
+
+    def get_page(self, url: str):
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = self.get(url)
+            except requests.RequestException as e:
+                response, status_code, error = None, None, str(e)
+            else:
+                if response.ok:
+                    return response, None, attempts
+                status_code, error = response.status_code, f"HTTP {response.status_code}"
+            delay = self.retry_queue.get_backoff(attempts, status_code)
+            if delay is None:
+                return response, error, attempts
+            logger.warning("RETRYING %s IN %.2fs (%s)", url, delay, error)
+            self.metrics.inc('retries_total')
+            time.sleep(delay)
+
+    def retry_item(self, item, status_code: Union[int, None], error: str):
+        delay = self.retry_queue.schedule(item['URL'], item, status_code)
+        if delay is not None:
+            logger.warning("RETRYING %s IN %.2fs (%s)", item['URL'], delay, error)
+            self.metrics.inc('retries_total')
+            return
+        self.write_buffer.fail_item(item['ID'], error)
+        self.dead_letter(item['URL'], DeadLetterKind.ITEM, item['ID'], None, status_code, error, self.retry_queue.pop_attempts(item['URL']))
+
+    def dead_letter(self, url: str, kind: DeadLetterKind, item_id: Union[int, None], seed_url: Union[str, None], status_code: Union[int, None], error: str, attempts: int):
+        if self.retry_queue.enabled:
+            logger.error("DEAD LETTER %s AFTER %d ATTEMPTS (%s)", url, attempts, error)
+            self.write_buffer.save_dead_letter(url, kind, item_id, seed_url, status_code, error, attempts)
+
+    def parse(self, parse_func: Callable, response: requests.Response):
+        with self.metrics.timer('PARSE'):
+            return parse_func(response)
+
+    def archive_response(self, item, response: requests.Response):
+        if self.archive:
+            self.archive.append(item['ID'], response)
+
+    def reparse(self, parse_info_func: Callable[[requests.Response], Dict] = None):
+        if self.archive is None:
+            raise ValueError("SCRAPER ARCHIVE must be enabled to reparse")
+        parse_info_func = parse_info_func or self.parse_info_func
+        if parse_info_func is None:
+            raise ParserNotSetException()
+        return self.archive.reparse(parse_info_func, self.write_buffer, self.config['SCRAPER']['PARSE_WORKERS'])
+
+    def get_item_columns(self):
+        return ALL_COLUMNS if self.http_cache else URL_COLUMNS
+
+    def is_unchanged(self, item, response: requests.Response):
+        return getattr(response, 'unchanged', False) and item['INFO'] is not None
+
+    def cache_response(self, response: requests.Response):
+        cache_row = getattr(response, 'cache_row', None)
+        if cache_row is not None:
+            self.write_buffer.after_flush(self.http_cache.store_many, cache_row)
+
+    def write_info(self, item, info: dict, update: bool):
+        if update:
+            self.write_buffer.merge_info(item['ID'], json.dumps(info), overwrite=False)
+        else:
+            self.write_buffer.set_info(item['ID'], json.dumps(info))
 
     def scrape_items_urls(self, urls: list):
         if self.get_items_urls_func is None and self.get_items_urls_and_infos_func is None:
             raise ParserNotSetException()
-        for url in urls:
-            next_page = url[:]
-            while next_page:
-                logger.info("SCRAPING URLS %s", next_page)
-                response = self.session.get(next_page)
-                config_sleep(self.config['SCRAPER']['REQUEST_DELAY'])
-                if not response.ok:
-                    logger.error("FETCH FAILED %s", next_page)
-                    continue
-                if self.get_items_urls_func:
-                    items_urls = [[i] for i in self.get_items_urls_func(response)]
-                    if items_urls:
-                        with self.db_class(self.config['DATABASE']) as conn:
-                            conn.save_urls(items_urls)
-                            logger.info("FOUND %d URLS IN %s", len(items_urls), next_page)
-                    else:
-                        logger.info("NO URLS FOUND IN %s", next_page)
-
-                if self.get_items_urls_and_infos_func:
-                    items_urls_and_infos = [[i[0], json.dumps(i[1])] for i in self.get_items_urls_and_infos_func(response)]
-                    if items_urls_and_infos:
-                        with self.db_class(self.config['DATABASE']) as conn:
-                            conn.save_url_and_info_many(items_urls_and_infos)
-                            logger.info("FOUND %d URLS AND INFOS IN %s", len(items_urls_and_infos), next_page)
-                    else:
-                        logger.info("NO URLS AND INFOS FOUND IN %s", next_page)
-
-                next_page = None
-                if self.get_next_page_func:
-                    logger.info("GOING TO NEXT PAGE %s", next_page)
-                    next_page = self.get_next_page_func(response)                      
-    
+        urls = list(urls)
+        concurrency = self.config['SCRAPER']['CONCURRENCY']
+        with ThreadPoolExecutor(max_workers=concurrency) as page_executor, \
+                ThreadPoolExecutor(max_workers=max(1, min(len(urls), concurrency))) as seed_executor:
+            for future in [seed_executor.submit(self._scrape_seed_urls, url, page_executor) for url in urls]:
+                future.result()
+        self.write_buffer.flush()
+
+    def _scrape_seed_urls(self, url: str, page_executor: ThreadPoolExecutor):
+        next_page = get_start_page(self.db_class, self.config['DATABASE'], url)
+        if next_page is None:
+            logger.info("SEED ALREADY DONE %s", url)
+            return
+        self._scrape_seed_pages(url, next_page, page_executor)
+
+    def _scrape_seed_pages(self, url: str, next_page: str, page_executor: ThreadPoolExecutor):
+        pagination = self.config['SCRAPER']['PAGINATION']
+        if self.get_page_urls_func:
+            self._scrape_listed_pages(url, page_executor)
+            self.write_buffer.save_checkpoint(url, None, True)
+            return
+        if pagination['PARAM']:
+            if pagination['PROBE_LAST_PAGE']:
+                self._scrape_probed_pages(url, page_executor)
+            else:
+                self._scrape_numbered_pages(url, page_executor)
+            self.write_buffer.save_checkpoint(url, None, True)
+            return
+        while next_page:
+            response, found = self._scrape_page(next_page, url)
+            if found is None:
+                return
+            next_page = None
+            if self.get_next_page_func:
+                logger.info("GOING TO NEXT PAGE %s", next_page)
+                next_page = self.get_next_page_func(response)
+            self.write_buffer.save_checkpoint(url, next_page, next_page is None)
+
+    def _save_page_urls(self, page_url: str, response: requests.Response):
+        found = 0
+        if self.get_items_urls_func:
+            items_urls = [[i] for i in self.parse(self.get_items_urls_func, response)]
+            if items_urls:
+                self.write_buffer.save_urls(items_urls)
+                logger.info("FOUND %d URLS IN %s", len(items_urls), page_url)
+            else:
+                logger.info("NO URLS FOUND IN %s", page_url)
+            found += len(items_urls)
+
+        if self.get_items_urls_and_infos_func:
+            items_urls_and_infos = [[i[0], json.dumps(i[1])] for i in self.parse(self.get_items_urls_and_infos_func, response)]
+            if items_urls_and_infos:
+                self.write_buffer.save_url_and_info_many(items_urls_and_infos)
+                logger.info("FOUND %d URLS AND INFOS IN %s", len(items_urls_and_infos), page_url)
+            else:
+                logger.info("NO URLS AND INFOS FOUND IN %s", page_url)
+            found += len(items_urls_and_infos)
+        return found
+
+    def _scrape_page(self, page_url: str, seed_url: str = None):
+        logger.info("SCRAPING URLS %s", page_url)
+        self.metrics.inc('pages_total')
+        response, error, attempts = self.get_page(page_url)
+        if error is not None:
+            logger.error("FETCH FAILED %s", page_url)
+            status_code = response.status_code if response is not None else None
+            if status_code not in [404, 410]:
+                self.dead_letter(page_url, DeadLetterKind.PAGE, None, seed_url, status_code, error, attempts)
+            return response, None
+        found = self._save_page_urls(page_url, response)
+        self.cache_response(response)
+        return response, found
+
+    def _is_last_page(self, response: requests.Response, found: int):
+        return found == 0 or (response is not None and response.status_code in [404, 410])
+
+    def _get_page_url(self, url: str, page: int):
+        return set_query_param(url, self.config['SCRAPER']['PAGINATION']['PARAM'], page)
+
+    def _scrape_listed_pages(self, url: str, page_executor: ThreadPoolExecutor):
+        response, found = self._scrape_page(url, url)
+        if found is None:
+            return
+        page_urls = list(self.get_page_urls_func(response))
+        logger.info("FOUND %d PAGES IN %s", len(page_urls), url)
+        for future in [page_executor.submit(self._scrape_page, page_url, url) for page_url in page_urls]:
+            future.result()
+
+    def _scrape_numbered_pages(self, url: str, page_executor: ThreadPoolExecutor):
+        pagination = self.config['SCRAPER']['PAGINATION']
+        window = self.config['SCRAPER']['CONCURRENCY']
+        page = pagination['START']
+        last_page = page + pagination['MAX_PAGES'] - 1 if pagination['MAX_PAGES'] else float('inf')
+        in_flight = {}
+        failed = set()
+        while in_flight or page <= last_page:
+            while page <= last_page and len(in_flight) < window:
+                in_flight[page_executor.submit(self._scrape_page, self._get_page_url(url, page), url)] = page
+                page += 1
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_page = in_flight.pop(future)
+                response, found = future.result()
+                if self._is_last_page(response, found):
+                    last_page = min(last_page, done_page - 1)
+                elif found is None:
+                    failed.add(done_page)
+                    first_failed = done_page
+                    while first_failed - 1 in failed:
+                        first_failed -= 1
+                    last_failed = done_page
+                    while last_failed + 1 in failed:
+                        last_failed += 1
+                    if last_failed - first_failed + 1 >= pagination['MAX_FAILED_PAGES']:
+                        logger.error("STOPPING AFTER %d FAILED PAGES OF %s", last_failed - first_failed + 1, url)
+                        last_page = min(last_page, first_failed - 1)
+        logger.info("SCRAPED PAGES UP TO %s OF %s", last_page, url)
+
+    def _scrape_probed_pages(self, url: str, page_executor: ThreadPoolExecutor):
+        pagination = self.config['SCRAPER']['PAGINATION']
+        first_page = pagination['START']
+        max_page = first_page + pagination['MAX_PAGES'] - 1 if pagination['MAX_PAGES'] else None
+        scraped = set()
+        failures = 0
+
+        def has_items(page: int):
+            nonlocal failures
+            response, found = self._scrape_page(self._get_page_url(url, page), url)
+            scraped.add(page)
+            failures = failures + 1 if found is None else 0
+            if failures >= pagination['MAX_FAILED_PAGES']:
+                logger.error("STOPPING AFTER %d FAILED PAGES OF %s", failures, url)
+                return False
+            return not self._is_last_page(response, found)
+
+        if not has_items(first_page):
+            return
+        low, high, step = first_page, None, 1
+        while high is None:
+            probe = low + step
+            if max_page is not None and probe > max_page:
+                high = max_page + 1
+            elif has_items(probe):
+                low, step = probe, step * 2
+            else:
+                high = probe
+        while high - low > 1:
+            middle = (low + high) // 2
+            if has_items(middle):
+                low = middle
+            else:
+                high = middle
+        logger.info("LAST PAGE OF %s IS %d", url, low)
+        pages = [page for page in range(first_page, low + 1) if page not in scraped]
+        for future in [page_executor.submit(self._scrape_page, self._get_page_url(url, page), url) for page in pages]:
+            future.result()
+
     def scrape_items_infos(self, update=False, items_filter=ItemsFilterByInfo.WITHOUT_INFO):
         if self.parse_info_func is None:
             raise ParserNotSetException()
-        items = []
-        with self.db_class(self.config['DATABASE']) as conn:
-            items = get_items_by_filter(conn, items_filter)
-        for item in items:
+        self.write_buffer.flush()
+        columns = self.get_item_columns()
+        items = iter_items_to_scrape(self.db_class, self.config['DATABASE'], items_filter, columns)
+        self._scrape_items(items, update)
+
+    def _scrape_items(self, items, update: bool):
+        for item in self.retry_queue.iter_with_retries(items):
             logger.info("GETTING INFO %s", item['URL'])
-            response = self.session.get(item['URL'])
-            config_sleep(self.config['SCRAPER']['REQUEST_DELAY'])
+            try:
+                response = self.get(item['URL'])
+            except requests.RequestException as e:
+                logger.exception("FETCH FAILED %s", item['URL'])
+                self.retry_item(item, None, str(e))
+                continue
             if not response.ok:
                 logger.error("FETCH FAILED %s", item['URL'])
+                self.retry_item(item, response.status_code, f"HTTP {response.status_code}")
+                continue
+            self.retry_queue.pop_attempts(item['URL'])
+            if self.is_unchanged(item, response):
+                logger.info("INFO UNCHANGED %s", item['URL'])
+                self.metrics.inc('items_unchanged_total')
+                self.write_buffer.complete_item(item['ID'])
                 continue
-            info = self.parse_info_func(response)
+            self.archive_response(item, response)
+            info = self.parse(self.parse_info_func, response)
             if info is None:
                 logger.info("NO INFO %s", item['URL'])
+                self.write_buffer.fail_item(item['ID'], "NO INFO")
                 continue
-            with self.db_class(self.config['DATABASE']) as conn:
-                if update and item['INFO'] is not None:
-                    info.update(json.loads(item['INFO']))
-                conn.set_info_by_id(item['ID'], json.dumps(info))
-                logger.info("INFO SAVED %s", item['URL'])
+            self.write_info(item, info, update)
+            self.cache_response(response)
+            self.write_buffer.complete_item(item['ID'])
+            logger.info("INFO SAVED %s", item['URL'])
+        self.write_buffer.flush()
 
-    def scrape_items_infos_key_url(self, key: str, parse_info_func: Callable[[requests.Response], Dict]):
-        items = []
+    def redrive_dead_letters(self, update=False):
+        self.write_buffer.flush()
+        started = time.time()
+        with self.db_class(self.config['DATABASE']) as conn:
+            dead_letters = conn.get_dead_letters()
+            items = conn.get_by_ids([row['ITEM_ID'] for row in dead_letters if row['KIND'] == DeadLetterKind.ITEM], self.get_item_columns())
+        pages = [row for row in dead_letters if row['KIND'] == DeadLetterKind.PAGE]
+        urls = [row for row in dead_letters if row['KIND'] == DeadLetterKind.URL]
+        if pages and self.get_items_urls_func is None and self.get_items_urls_and_infos_func is None:
+            raise ParserNotSetException()
+        if items and self.parse_info_func is None:
+            raise ParserNotSetException()
+        logger.info("REDRIVING %d PAGES, %d ITEMS AND %d URLS", len(pages), len(items), len(urls))
+        self.write_buffer.save_urls([[row['URL']] for row in urls if row['INFO'] is None])
+        self.write_buffer.save_url_and_info_many([[row['URL'], row['INFO']] for row in urls if row['INFO'] is not None])
+        if pages:
+            concurrency = self.config['SCRAPER']['CONCURRENCY']
+            with ThreadPoolExecutor(max_workers=concurrency) as page_executor, \
+                    ThreadPoolExecutor(max_workers=max(1, min(len(pages), concurrency))) as seed_executor:
+                for future in [seed_executor.submit(self._redrive_page, row['URL'], row['SEED_URL'], page_executor) for row in pages]:
+                    future.result()
+        if items:
+            self._scrape_items(iter(items), update)
+        self.write_buffer.flush()
         with self.db_class(self.config['DATABASE']) as conn:
-            items = conn.get_all_with_info()
-            for item in items:
-                info = json.loads(item['INFO'])
-                if key not in info:
-                    logger.error("KEY NOT FOUND IN %s", item['URL'])
-                    continue
-                key_url = info.get(key)
-                if key_url is None:
-                    logger.error("NO KEY VALUE %s", item['URL'])
-                    continue                
-                logger.info("GETTING KEY INFO %s", item['URL'])
-                response = self.session.get(key_url)
-                config_sleep(self.config['SCRAPER']['REQUEST_DELAY'])
-                if not response.ok:
-                    logger.error("FETCH FAILED %s", key_url)
-                    continue
-                key_info = parse_info_func(response)
-                if key_info is None:
-                    logger.info("NO INFO %s", key_url)
-                    continue
-                info.update(key_info)
-                with self.db_class(self.config['DATABASE']) as conn:
-                    conn.set_info_by_id(item['ID'], json.dumps(info))
-                    logger.info("INFO SAVED %s", item['URL'])
-
-class WebScraperChrome:
+            conn.delete_dead_letters(started)
+        return len(dead_letters)
+
+    def _redrive_page(self, page_url: str, seed_url: str, page_executor: ThreadPoolExecutor):
+        pagination = self.config['SCRAPER']['PAGINATION']
+        if page_url == seed_url or not (self.get_page_urls_func or pagination['PARAM']):
+            self._scrape_seed_pages(seed_url or page_url, page_url, page_executor)
+        else:
+            self._scrape_page(page_url, seed_url)
+
+    def scrape_items_infos_key_url(self, key: str, parse_info_func: Callable[[requests.Response], Dict]):
+        self.write_buffer.flush()
+        items = iter_key_url_items(self.db_class, self.config['DATABASE'], key)
+        for item in items:
+            key_url = item['KEY_URL']
+            logger.info("GETTING KEY INFO %s", item['URL'])
+            response = self.get(key_url)
+            if not response.ok:
+                logger.error("FETCH FAILED %s", key_url)
+                continue
+            if getattr(response, 'unchanged', False):
+                logger.info("KEY INFO UNCHANGED %s", key_url)
+                self.metrics.inc('items_unchanged_total')
+                continue
+            key_info = self.parse(parse_info_func, response)
+            if key_info is None:
+                logger.info("NO INFO %s", key_url)
+                continue
+            self.write_buffer.merge_info(item['ID'], json.dumps(key_info))
+            self.cache_response(response)
+            logger.info("INFO SAVED %s", item['URL'])
+        self.write_buffer.flush()
+
+class AsyncWebScraperRequest(WebScraperRequest):
     def __init__(self, config: dict):
-        self.config = config
-        self.get_items_urls_func : Callable[[uc.Chrome], List[str]] = None
-        self.get_items_urls_and_infos_func: Callable[[uc.Chrome], List[Tuple[str, Dict]]] = None
-        self.get_next_page_func : Callable[[uc.Chrome], Union[str, WebElement]] = None
-        self.parse_info_func : Callable[[uc.Chrome], Dict] = None
-        self.driver : uc.Chrome = None
-        self.db_class = get_db_class_by_config(config['DATABASE'])
+        super().__init__(config)
+        self.executor: ThreadPoolExecutor = None
+        self.db_executor: ThreadPoolExecutor = None
+        self.in_flight = 0
 
     def __enter__(self):
-        self.driver = get_driver(self.config['DRIVER'])
+        super().__enter__()
+        concurrency = self.config['SCRAPER']['CONCURRENCY']
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.db_executor = ThreadPoolExecutor(max_workers=1)
         return self
-    
+
     def __exit__(self, type, value, traceback):
-        try:
-            self.driver.close()
-        except:
-            logger.error("There was a problem closing the chrome instances. You will need to close them manually")
+        self.executor.shutdown(wait=True)
+        self.db_executor.shutdown(wait=True)
+        super().__exit__(type, value, traceback)
 
-    def scrape_items_urls(self, urls: list):
-        if self.get_items_urls_func is None and self.get_items_urls_and_infos_func is None:
+    def scrape_items_infos(self, update=False, items_filter=ItemsFilterByInfo.WITHOUT_INFO):
+        if self.parse_info_func is None:
             raise ParserNotSetException()
-        
-        for url in urls:
-            logger.info("SCRAPING URLS %s", url)
-            self.driver.get(url)
-            while True:
-                config_sleep(self.config['DRIVER']['AFTER_GET_DELAY'])
-                if self.get_items_urls_func:
-                    items_urls = [[i] for i in self.get_items_urls_func(self.driver)]
-                    if len(items_urls) > 0:
-                        with self.db_class(self.config['DATABASE']) as conn:
-                            conn.save_urls(items_urls)
-                            logger.info("FOUND %d URLS IN %s", len(items_urls), self.driver.current_url)
-                    else:
-                        logger.info("NO URLS FOUND IN %s", url)
-                
-                if self.get_items_urls_and_infos_func:
-                    items_urls_and_infos = [[i[0], json.dumps(i[1])] for i in self.get_items_urls_and_infos_func(self.driver)]
-                    if len(items_urls_and_infos) > 0:
-                        with self.db_class(self.config['DATABASE']) as conn:
-                            conn.save_url_and_info_many(items_urls_and_infos)
-                            logger.info("FOUND %d URLS AND INFOS IN %s", len(items_urls_and_infos), url)
-                    else:
-                        logger.info("NO URLS AND INFOS FOUND IN %s", url)
-
-                if self.get_next_page_func:
-                    next_page = self.get_next_page_func(self.driver)
-                    if isinstance(next_page, str):
-                        logger.info("GOING TO NEXT PAGE %s", next_page)
-                        self.driver.get(next_page)
-                    elif isinstance(next_page, WebElement):
-                        logger.info("GOING TO NEXT PAGE ELEMENT %s", next_page.tag_name)
-                        ActionChains(self.driver, 500).move_to_element(next_page).pause(0.5).click().perform()
-                    else:
-                        break
-                else:
-                    break
-                            
-    def scrape_items_infos(self, update=False, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.WITHOUT_INFO):
+        asyncio.run(self.async_scrape_items_infos(update, items_filter))
+
+    async def async_scrape_items_infos(self, update=False, items_filter=ItemsFilterByInfo.WITHOUT_INFO):
         if self.parse_info_func is None:
             raise ParserNotSetException()
-        items = []
-        with self.db_class(self.config['DATABASE']) as conn:
-            items = get_items_by_filter(conn, items_filter)
-        for item in items:
-            logger.info("GETTING INFO %s", item['URL'])
-            self.driver.get(item['URL'])
-            config_sleep(self.config['DRIVER']['AFTER_GET_DELAY'])
-            info = self.parse_info_func(self.driver)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.db_executor, self.write_buffer.flush)
+        columns = self.get_item_columns()
+        items = iter_items_to_scrape(self.db_class, self.config['DATABASE'], items_filter, columns)
+        await self._async_scrape_items(items, update)
+
+    def _scrape_items(self, items, update: bool):
+        asyncio.run(self._async_scrape_items(items, update))
+
+    async def _next_items(self, items):
+        loop = asyncio.get_running_loop()
+        self.in_flight = 0
+        while (item := await loop.run_in_executor(self.db_executor, next, items, None)) is not None:
+            self.in_flight += 1
+            yield item
+            while (entry := self.retry_queue.pop_due()) is not None:
+                self.in_flight += 1
+                yield entry
+        while self.retry_queue.enabled and (self.retry_queue or self.in_flight):
+            entry = self.retry_queue.pop_due()
+            if entry is None:
+                await asyncio.sleep(self.retry_queue.get_wait(0.1))
+                continue
+            self.in_flight += 1
+            yield entry
+
+    async def _async_scrape_items(self, items, update: bool):
+        loop = asyncio.get_running_loop()
+        concurrency = self.config['SCRAPER']['CONCURRENCY']
+        queue = asyncio.Queue(maxsize=self.config['SCRAPER']['QUEUE_SIZE'] or concurrency * 2)
+        self.metrics.gauge('queue_depth', queue.qsize, queue='fetch')
+        workers = [asyncio.create_task(self._info_worker(queue, update)) for _ in range(concurrency)]
+        producer = asyncio.create_task(self._produce_items(items, queue, len(workers)))
+        await self._supervise(producer, *workers)
+        await loop.run_in_executor(self.db_executor, self.write_buffer.flush)
+
+    async def _produce_items(self, items, queue: asyncio.Queue, workers: int):
+        async for item in self._next_items(items):
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def _supervise(self, *tasks):
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _info_worker(self, queue: asyncio.Queue, update: bool):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            response = await self._fetch_item(item)
+            if response is None:
+                continue
+            if asyncio.iscoroutinefunction(self.parse_info_func):
+                start = time.perf_counter()
+                info = await self.parse_info_func(response)
+                self.metrics.observe('parse_seconds', time.perf_counter() - start)
+            else:
+                info = await loop.run_in_executor(self.executor, self.parse, self.parse_info_func, response)
             if info is None:
                 logger.info("NO INFO %s", item['URL'])
+                self.write_buffer.fail_item(item['ID'], "NO INFO")
                 continue
-            with self.db_class(self.config['DATABASE']) as conn:
-                if update and item['INFO'] is not None:
-                    info.update(json.loads(item['INFO']))
-                conn.set_info_by_id(item['ID'], json.dumps(info))
-                logger.info("INFO SAVED %s", item['URL'])
-
-    def scrape_items_infos_key_url(self, key: str, parse_info_func: Callable[[uc.Chrome], Dict]):
-        items = []
-        with self.db_class(self.config['DATABASE']) as conn:
-            items = conn.get_all_with_info()
-            for item in items:
-                info = json.loads(item['INFO'])
-                if key not in info:
-                    logger.error("KEY NOT FOUND IN %s", item['URL'])
-                    continue
-                key_url = info.get(key)
-                if key_url is None:
-                    logger.error("NO KEY VALUE %s", item['URL'])
-                    continue
-                logger.info("GETTING KEY INFO %s", key_url)
-                self.driver.get(key_url)
-                config_sleep(self.config['DRIVER']['AFTER_GET_DELAY'])
-                key_info = parse_info_func(self.driver)
-                if key_info is None:
-                    logger.info("NO INFO %s", key_url)
-                    continue
-                info.update(key_info)
-                with self.db_class(self.config['DATABASE']) as conn:
-                    conn.set_info_by_id(item['ID'], json.dumps(info))
-                    logger.info("INFO SAVED %s", item['URL'])
\ No newline at end of file
+            await loop.run_in_executor(self.db_executor, self._save_info, item, info, update, response)
+
+    async def _fetch_item(self, item):
+        try:
+            return await self._fetch_item_once(item)
+        finally:
+            self.in_flight -= 1
+
+    async def _fetch_item_once(self, item):
+        loop = asyncio.get_running_loop()
+        logger.info("GETTING INFO %s", item['URL'])
+        await asyncio.sleep(self.rate_limiter.reserve(item['URL']))
+        try:
+            response = await loop.run_in_executor(self.executor, self.fetch, item['URL'])
+        except requests.RequestException as e:
+            logger.exception("FETCH FAILED %s", item['URL'])
+            self.retry_item(item, None, str(e))
+            return None
+        if not response.ok:
+            logger.error("FETCH FAILED %s", item['URL'])
+            self.retry_item(item, response.status_code, f"HTTP {response.status_code}")
+            return None
+        self.retry_queue.pop_attempts(item['URL'])
+        if self.is_unchanged(item, response):
+            logger.info("INFO UNCHANGED %s", item['URL'])
+            self.metrics.inc('items_unchanged_total')
+            self.write_buffer.complete_item(item['ID'])
+            return None
+        await loop.run_in_executor(self.db_executor, self.archive_response, item, response)
+        return response
+
+    def _save_info(self, item, info: dict, update: bool, response: requests.Response):
+        self.write_info(item, info, update)
+        self.cache_response(response)
+        self.write_buffer.complete_item(item['ID'])
+        logger.info("INFO SAVED %s", item['URL'])
+
+class PipelineWebScraperRequest(AsyncWebScraperRequest):
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.parse_workers = get_parse_workers(config['SCRAPER']['PARSE_WORKERS'])
+        self.parse_executor: ProcessPoolExecutor = None
+
+    def __enter__(self):
+        super().__enter__()
+        self.parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.parse_executor.shutdown(wait=True)
+        super().__exit__(type, value, traceback)
+
+    async def _async_scrape_items(self, items, update: bool):
+        if asyncio.iscoroutinefunction(self.parse_info_func):
+            raise ValueError("PipelineWebScraperRequest parse_info_func must not be a coroutine function")
+        loop = asyncio.get_running_loop()
+        scraper_config = self.config['SCRAPER']
+        concurrency = scraper_config['CONCURRENCY']
+        parse_workers = self.parse_workers
+        fetch_queue = asyncio.Queue(maxsize=scraper_config['QUEUE_SIZE'] or concurrency * 2)
+        parse_queue = asyncio.Queue(maxsize=scraper_config['PARSE_QUEUE_SIZE'] or parse_workers * 2)
+        write_queue = asyncio.Queue(maxsize=scraper_config['WRITE_QUEUE_SIZE'] or parse_workers * 2)
+        self.metrics.gauge('queue_depth', fetch_queue.qsize, queue='fetch')
+        self.metrics.gauge('queue_depth', parse_queue.qsize, queue='parse')
+        self.metrics.gauge('queue_depth', write_queue.qsize, queue='write')
+        fetchers = [asyncio.create_task(self._fetch_worker(fetch_queue, parse_queue)) for _ in range(concurrency)]
+        parsers = [asyncio.create_task(self._parse_worker(parse_queue, write_queue)) for _ in range(parse_workers)]
+        writer = asyncio.create_task(self._write_worker(write_queue, update))
+        producer = asyncio.create_task(self._produce_items(items, fetch_queue, len(fetchers)))
+        fetchers_closer = asyncio.create_task(self._close_stage(fetchers, parse_queue, len(parsers)))
+        parsers_closer = asyncio.create_task(self._close_stage(parsers, write_queue, 1))
+        await self._supervise(producer, *fetchers, fetchers_closer, *parsers, parsers_closer, writer)
+        await loop.run_in_executor(self.db_executor, self.write_buffer.flush)
+
+    async def _close_stage(self, workers: list, next_queue: asyncio.Queue, next_workers: int):
+        await asyncio.gather(*workers)
+        for _ in range(next_workers):
+            await next_queue.put(None)
+
+    async def _fetch_worker(self, fetch_queue: asyncio.Queue, parse_queue: asyncio.Queue):
+        while True:
+            item = await fetch_queue.get()
+            if item is None:
+                return
+            response = await self._fetch_item(item)
+            if response is not None:
+                await parse_queue.put((item, response))
+
+    async def _parse_worker(self, parse_queue: asyncio.Queue, write_queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await parse_queue.get()
+            if entry is None:
+                return
+            item, response = entry
+            start = time.perf_counter()
+            try:
+                info = await loop.run_in_executor(self.parse_executor, parse_raw_response, self.parse_info_func,
+                                                  response.url, response.status_code, dict(response.headers), response.encoding, response.content)
+                self.metrics.observe('parse_seconds', time.perf_counter() - start)
+            except Exception:
+                logger.error("PARSE FAILED %s", item['URL'])
+                raise
+            if info is None:
+                logger.info("NO INFO %s", item['URL'])
+                self.write_buffer.fail_item(item['ID'], "NO INFO")
+                continue
+            await write_queue.put((item, info, response))
+
+    async def _write_worker(self, write_queue: asyncio.Queue, update: bool):
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await write_queue.get()
+            if entry is None:
+                return
+            item, info, response = entry
+            await loop.run_in_executor(self.db_executor, self._save_info, item, info, update, response)
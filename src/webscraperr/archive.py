@@ -0,0 +1,208 @@
+import os
+import gzip
+import json
+import mmap
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict
+import requests
+from .utils import get_parse_workers, parse_raw_response
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_COMMIT_INTERVAL = 100
+
+def compress(data: bytes, compression: str):
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def decompress(data: bytes, compression: str):
+    if compression == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def build_record(item_id: int, response: requests.Response):
+    http_headers = "".join(f"{name}: {value}\r\n" for name, value in response.headers.items())
+    http_block = f"HTTP/1.1 {response.status_code} {response.reason or ''}\r\n{http_headers}\r\n".encode() + response.content
+    warc_headers = "".join([
+        "WARC/1.0\r\n",
+        "WARC-Type: response\r\n",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n",
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n",
+        f"WARC-Target-URI: {response.url}\r\n",
+        f"WARC-Item-ID: {item_id}\r\n",
+        f"WARC-Encoding: {response.encoding or ''}\r\n",
+        "Content-Type: application/http; msgtype=response\r\n",
+        f"Content-Length: {len(http_block)}\r\n",
+        "\r\n"
+    ])
+    return warc_headers.encode() + http_block + b"\r\n\r\n"
+
+def read_record(data: bytes):
+    warc_block, rest = data.split(b"\r\n\r\n", 1)
+    warc_headers = dict(line.split(": ", 1) for line in warc_block.decode().split("\r\n")[1:])
+    http_block = rest[:int(warc_headers['Content-Length'])]
+    head, body = http_block.split(b"\r\n\r\n", 1)
+    status_line, *header_lines = head.decode('iso-8859-1').split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines if line)
+    return {
+        'URL': warc_headers['WARC-Target-URI'],
+        'ITEM_ID': int(warc_headers['WARC-Item-ID']),
+        'STATUS': int(status_line.split(" ")[1]),
+        'HEADERS': headers,
+        'ENCODING': warc_headers.get('WARC-Encoding') or None,
+        'BODY': body
+    }
+
+_segments = {}
+
+def read_archived(path: str, offset: int, length: int, compression: str):
+    segment = _segments.get(path)
+    if segment is None or offset + length > len(segment):
+        if segment is not None:
+            segment.close()
+        with open(path, 'rb') as f:
+            segment = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _segments[path] = segment
+    return read_record(decompress(segment[offset:offset + length], compression))
+
+def reparse_archived(parse_info_func: Callable[[requests.Response], Dict], path: str, offset: int, length: int, compression: str):
+    record = read_archived(path, offset, length, compression)
+    info = parse_raw_response(parse_info_func, record['URL'], record['STATUS'], record['HEADERS'], record['ENCODING'], record['BODY'])
+    return record['ITEM_ID'], record['URL'], info
+
+class ResponseArchive:
+    def __init__(self, config: dict):
+        self.config = config
+        self.path = config['PATH']
+        self.segment_size = config.get('SEGMENT_SIZE_MB', 256) * 1024 * 1024
+        self.compression = config.get('COMPRESSION') or ('zstd' if zstandard else 'gzip')
+        if self.compression == 'zstd' and zstandard is None:
+            raise ImportError("zstandard is required for zstd compression. Install it with pip install webscraperr[archive]")
+        self.index: sqlite3.Connection = None
+        self.segment = None
+        self.segment_number = None
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        os.makedirs(self.path, exist_ok=True)
+        self.index = sqlite3.connect(os.path.join(self.path, 'index.db'), check_same_thread=False)
+        self.index.row_factory = sqlite3.Row
+        self.index.execute("PRAGMA journal_mode=WAL")
+        self.index.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+        ID          INTEGER NOT NULL
+                           PRIMARY KEY AUTOINCREMENT,
+        ITEM_ID     INTEGER,
+        URL         TEXT    NOT NULL,
+        SEGMENT     INTEGER NOT NULL,
+        OFFSET      INTEGER NOT NULL,
+        LENGTH      INTEGER NOT NULL,
+        COMPRESSION TEXT    NOT NULL,
+        STORED_AT   REAL    NOT NULL
+        );
+    """)
+        self.index.execute("CREATE INDEX IF NOT EXISTS records_ITEM_ID ON records(ITEM_ID)")
+        self.index.execute("CREATE INDEX IF NOT EXISTS records_URL ON records(URL)")
+        self.index.commit()
+        last_segment = self.index.execute("SELECT MAX(SEGMENT) FROM records").fetchone()[0]
+        self.segment_number = last_segment or 0
+
+    def close(self):
+        with self.lock:
+            if self.segment:
+                self.segment.close()
+                self.segment = None
+            if self.index:
+                self.index.commit()
+                self.index.close()
+                self.index = None
+
+    def get_segment_path(self, segment_number: int):
+        return os.path.join(self.path, f"segment-{segment_number:05d}.warc")
+
+    def append(self, item_id: int, response: requests.Response):
+        data = compress(build_record(item_id, response), self.compression)
+        with self.lock:
+            if self.segment is None:
+                self.segment = open(self.get_segment_path(self.segment_number), 'ab')
+            if self.segment.tell() > 0 and self.segment.tell() + len(data) > self.segment_size:
+                self.segment.close()
+                self.segment_number += 1
+                self.segment = open(self.get_segment_path(self.segment_number), 'ab')
+            offset = self.segment.tell()
+            self.segment.write(data)
+            self.segment.flush()
+            self.index.execute("INSERT INTO records(ITEM_ID, URL, SEGMENT, OFFSET, LENGTH, COMPRESSION, STORED_AT) VALUES(?, ?, ?, ?, ?, ?, ?)",
+                               [item_id, response.url, self.segment_number, offset, len(data), self.compression, time.time()])
+            self.pending += 1
+            if self.pending >= INDEX_COMMIT_INTERVAL:
+                self.index.commit()
+                self.pending = 0
+
+    def iter_latest_records(self, chunk_size: int = 1000):
+        with self.lock:
+            self.index.commit()
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.index.execute("SELECT MAX(ID) AS ID, ITEM_ID, SEGMENT, OFFSET, LENGTH, COMPRESSION FROM records WHERE ITEM_ID IS NOT NULL AND ITEM_ID>? GROUP BY ITEM_ID ORDER BY ITEM_ID LIMIT ?",
+                                          [last_id, chunk_size]).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1]['ITEM_ID']
+
+    def get_latest_record(self, item_id: int):
+        with self.lock:
+            row = self.index.execute("SELECT * FROM records WHERE ITEM_ID=? ORDER BY ID DESC LIMIT 1", [item_id]).fetchone()
+        if row is None:
+            return None
+        return read_archived(self.get_segment_path(row['SEGMENT']), row['OFFSET'], row['LENGTH'], row['COMPRESSION'])
+
+    def reparse(self, parse_info_func: Callable[[requests.Response], Dict], write_buffer, workers: int = None):
+        reparsed = 0
+        workers = get_parse_workers(workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            max_in_flight = workers * 4
+            in_flight = set()
+
+            def save_done(done):
+                nonlocal reparsed
+                for future in done:
+                    item_id, url, info = future.result()
+                    if info is None:
+                        logger.info("NO INFO %s", url)
+                        continue
+                    write_buffer.set_info(item_id, json.dumps(info))
+                    reparsed += 1
+
+            for record in self.iter_latest_records():
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    save_done(done)
+                in_flight.add(executor.submit(reparse_archived, parse_info_func, self.get_segment_path(record['SEGMENT']),
+                                              record['OFFSET'], record['LENGTH'], record['COMPRESSION']))
+            save_done(wait(in_flight).done)
+        write_buffer.flush()
+        logger.info("REPARSED %d ARCHIVED RESPONSES", reparsed)
+        return reparsed
@@ -0,0 +1,248 @@
+import signal
+import time
+import threading
+import logging
+from .db import DeadLetterKind
+from .seen import SeenURLIndex
+from .metrics import NULL_METRICS
+
+logger = logging.getLogger(__name__)
+
+WRITE_ORDER = ['urls', 'urls_and_infos', 'infos', 'merges', 'completed', 'failed', 'checkpoints', 'dead_letters']
+
+def get_row_item_id(name: str, row):
+    if name == 'completed':
+        return row
+    if name in ['infos', 'merges', 'failed']:
+        return row[0]
+    return None
+
+class WriteBuffer:
+    def __init__(self, db_class, config: dict, metrics=NULL_METRICS):
+        self.db_class = db_class
+        self.config = config
+        self.metrics = metrics
+        buffer_config = config.get('BUFFER') or {}
+        self.size = buffer_config.get('SIZE', 100)
+        self.interval = buffer_config.get('INTERVAL', 1.0)
+        self.frontier = (config.get('FRONTIER') or {}).get('ENABLED', False)
+        self.seen_urls: SeenURLIndex = None
+        if (config.get('SEEN_URLS') or {}).get('ENABLED'):
+            self.seen_urls = SeenURLIndex(db_class, config)
+        self.urls = []
+        self.urls_and_infos = []
+        self.infos = []
+        self.merges = []
+        self.completed = []
+        self.failed = []
+        self.checkpoints = []
+        self.dead_letters = []
+        self.after_flush_values = {}
+        self.lock = threading.RLock()
+        self.closed = threading.Event()
+        self.flusher: threading.Thread = None
+        self.previous_sigterm_handler = None
+
+    def __enter__(self):
+        self.closed.clear()
+        if self.seen_urls is not None:
+            self.seen_urls.open()
+        if self.interval is not None:
+            self.flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self.flusher.start()
+        if threading.current_thread() is threading.main_thread():
+            self.previous_sigterm_handler = signal.signal(signal.SIGTERM, self._handle_sigterm)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.closed.set()
+        if self.flusher is not None:
+            self.flusher.join()
+            self.flusher = None
+        if self.previous_sigterm_handler is not None:
+            signal.signal(signal.SIGTERM, self.previous_sigterm_handler)
+            self.previous_sigterm_handler = None
+        self.flush()
+        if self.seen_urls is not None:
+            self.seen_urls.save()
+
+    def __len__(self):
+        return len(self.urls) + len(self.urls_and_infos) + len(self.infos) + len(self.merges) + len(self.completed) + len(self.failed) + len(self.checkpoints) + len(self.dead_letters)
+
+    def save_urls(self, urls: list):
+        with self.lock:
+            if self.seen_urls is not None:
+                unseen = self.seen_urls.filter(urls)
+                self.metrics.inc('urls_skipped_total', len(urls) - len(unseen))
+                urls = unseen
+            self.metrics.inc('urls_saved_total', len(urls))
+            self.urls.extend(urls)
+            self._flush_if_full()
+
+    def save_url_and_info_many(self, datas: list):
+        with self.lock:
+            if self.seen_urls is not None:
+                unseen = self.seen_urls.filter(datas)
+                self.metrics.inc('urls_skipped_total', len(datas) - len(unseen))
+                datas = unseen
+            self.metrics.inc('urls_saved_total', len(datas))
+            self.urls_and_infos.extend(datas)
+            self._flush_if_full()
+
+    def set_info(self, id: int, info: str):
+        self.metrics.inc('infos_saved_total')
+        with self.lock:
+            self.infos.append((id, info))
+            self._flush_if_full()
+
+    def merge_info(self, id: int, partial: str, overwrite: bool = True):
+        self.metrics.inc('infos_merged_total')
+        with self.lock:
+            self.merges.append((id, partial, overwrite))
+            self._flush_if_full()
+
+    def complete_item(self, id: int):
+        if not self.frontier:
+            return
+        with self.lock:
+            self.completed.append(id)
+            self._flush_if_full()
+
+    def fail_item(self, id: int, error: str):
+        self.metrics.inc('items_failed_total')
+        if not self.frontier:
+            return
+        with self.lock:
+            self.failed.append((id, error))
+            self._flush_if_full()
+
+    def save_checkpoint(self, seed_url: str, next_page: str, done: bool):
+        if not self.frontier:
+            return
+        with self.lock:
+            self.checkpoints.append((seed_url, next_page, int(done)))
+            self._flush_if_full()
+
+    def save_dead_letter(self, url: str, kind: DeadLetterKind, item_id: int, seed_url: str, status_code: int, error: str, attempts: int):
+        self.metrics.inc('dead_letters_total')
+        with self.lock:
+            self.dead_letters.append((url, kind, item_id, seed_url, None, status_code, error, attempts, time.time()))
+            self._flush_if_full()
+
+    def after_flush(self, callback, value):
+        with self.lock:
+            self.after_flush_values.setdefault(callback, []).append(value)
+
+    def flush(self):
+        with self.lock:
+            pending = len(self)
+            if pending == 0 and not self.after_flush_values:
+                return
+            batch = {name: getattr(self, name) for name in WRITE_ORDER}
+            for name in WRITE_ORDER:
+                setattr(self, name, [])
+            after_flush_values, self.after_flush_values = self.after_flush_values, {}
+            try:
+                with self.metrics.timer('SAVE'), self.db_class(self.config) as conn:
+                    for name in WRITE_ORDER:
+                        if batch[name]:
+                            self._write(conn, name, batch[name])
+            except Exception:
+                logger.exception("WRITE BUFFER FLUSH FAILED, WRITING %d ROWS ONE BY ONE", pending)
+                rejected = self._write_rows(batch)
+                self.metrics.inc('rows_flushed_total', pending - rejected)
+                return
+            self._mark_seen(batch['urls'] + batch['urls_and_infos'], True)
+            for callback, values in after_flush_values.items():
+                try:
+                    callback(values)
+                except Exception:
+                    logger.exception("AFTER FLUSH CALLBACK FAILED")
+            self.metrics.inc('rows_flushed_total', pending)
+            logger.debug("FLUSHED %d URLS, %d URLS AND INFOS, %d INFOS, %d MERGES", len(batch['urls']), len(batch['urls_and_infos']), len(batch['infos']), len(batch['merges']))
+
+    def _write(self, conn, name: str, rows: list):
+        match name:
+            case 'urls':
+                conn.save_urls(rows)
+            case 'urls_and_infos':
+                conn.save_url_and_info_many(rows)
+            case 'infos':
+                conn.set_info_many(rows)
+            case 'merges':
+                for overwrite in [True, False]:
+                    ids_partials = [(id, partial) for id, partial, merge_overwrite in rows if merge_overwrite == overwrite]
+                    if ids_partials:
+                        conn.merge_info_many(ids_partials, overwrite)
+            case 'completed':
+                conn.complete_items(rows)
+            case 'failed':
+                conn.fail_items(rows)
+            case 'checkpoints':
+                conn.save_checkpoints(rows)
+            case 'dead_letters':
+                conn.save_dead_letters(rows)
+
+    def _write_rows(self, batch: dict):
+        rejected = []
+        for name in WRITE_ORDER:
+            for row in batch[name]:
+                try:
+                    with self.db_class(self.config) as conn:
+                        self._write(conn, name, [row])
+                except Exception as e:
+                    rejected.append((name, row, e))
+                    continue
+                if name in ['urls', 'urls_and_infos']:
+                    self._mark_seen([row], True)
+        if not rejected:
+            return 0
+        try:
+            self._reject_rows(rejected)
+        except Exception:
+            for name, row, _ in rejected:
+                getattr(self, name).append(row)
+            raise
+        self._mark_seen([row for name, row, _ in rejected if name in ['urls', 'urls_and_infos']], False)
+        return len(rejected)
+
+    def _mark_seen(self, datas: list, saved: bool):
+        if self.seen_urls is not None and datas:
+            self.seen_urls.mark(datas, saved)
+
+    def _reject_rows(self, rejected: list):
+        now = time.time()
+        with self.db_class(self.config) as conn:
+            ids = [get_row_item_id(name, row) for name, row, _ in rejected]
+            urls = {item['ID']: item['URL'] for item in conn.get_by_ids([id for id in ids if id is not None], ('ID', 'URL'))}
+            dead_letters = []
+            for (name, row, error), item_id in zip(rejected, ids):
+                logger.error("WRITE FAILED %s %r: %s", name.upper(), row, error)
+                self.metrics.inc('rows_rejected_total', table=name)
+                if name == 'dead_letters':
+                    continue
+                if name in ['urls', 'urls_and_infos']:
+                    dead_letters.append((row[0], DeadLetterKind.URL, None, None, row[1] if name == 'urls_and_infos' else None, None, f"WRITE FAILED: {error}", 1, now))
+                elif name == 'checkpoints':
+                    dead_letters.append((row[0], DeadLetterKind.PAGE, None, row[0], None, None, f"WRITE FAILED: {error}", 1, now))
+                elif item_id in urls:
+                    dead_letters.append((urls[item_id], DeadLetterKind.ITEM, item_id, None, None, None, f"WRITE FAILED: {error}", 1, now))
+            if dead_letters:
+                conn.save_dead_letters(dead_letters)
+
+    def _flush_if_full(self):
+        if len(self) >= self.size:
+            self.flush()
+
+    def _flush_periodically(self):
+        while not self.closed.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("WRITE BUFFER FLUSH FAILED")
+
+    def _handle_sigterm(self, signum, frame):
+        raise SystemExit(128 + signum)
@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import hashlib
+import json
+import time
+import zlib
+import logging
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+EVICTION_INTERVAL = 100
+
+class HTTPCache:
+    def __init__(self, config: dict):
+        self.config = config
+        self.path = config.get('PATH') or 'httpcache.db'
+        self.max_size = config.get('MAX_SIZE_MB', 1024) * 1024 * 1024
+        self.max_age = config.get('MAX_AGE')
+        self.conn: sqlite3.Connection = None
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+        URL           TEXT    NOT NULL
+                             PRIMARY KEY,
+        STATUS        INTEGER NOT NULL,
+        HEADERS       TEXT    NOT NULL,
+        ENCODING      TEXT,
+        ETAG          TEXT,
+        LAST_MODIFIED TEXT,
+        CONTENT_HASH  TEXT    NOT NULL,
+        BODY          BLOB    NOT NULL,
+        SIZE          INTEGER NOT NULL,
+        STORED_AT     REAL    NOT NULL,
+        ACCESSED_AT   REAL    NOT NULL
+        );
+    """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_ACCESSED_AT ON responses(ACCESSED_AT)")
+        self.conn.commit()
+
+    def close(self):
+        if self.conn:
+            with self.lock:
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
+
+    def get(self, url: str):
+        with self.lock:
+            row = self.conn.execute("SELECT ETAG, LAST_MODIFIED, CONTENT_HASH, STORED_AT FROM responses WHERE URL=?", [url]).fetchone()
+        if row is None:
+            return None
+        if self.max_age is not None and time.time() - row['STORED_AT'] > self.max_age:
+            return None
+        return row
+
+    def get_conditional_headers(self, cached):
+        headers = {}
+        if cached is None:
+            return headers
+        if cached['ETAG']:
+            headers['If-None-Match'] = cached['ETAG']
+        if cached['LAST_MODIFIED']:
+            headers['If-Modified-Since'] = cached['LAST_MODIFIED']
+        return headers
+
+    def update(self, url: str, response: requests.Response, cached):
+        response.from_cache = False
+        response.unchanged = False
+        response.cache_row = None
+        if response.status_code == 304 and cached is not None:
+            stored = self._get_stored(url)
+            if stored is None:
+                return response
+            response = self._build_cached_response(response, stored)
+            self._touch(url, response)
+            return response
+        if response.status_code != 200:
+            return response
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if cached is not None and cached['CONTENT_HASH'] == content_hash:
+            response.unchanged = True
+            self._touch(url, response)
+            return response
+        response.cache_row = self._get_row(url, response, content_hash)
+        return response
+
+    def _get_stored(self, url: str):
+        with self.lock:
+            return self.conn.execute("SELECT STATUS, HEADERS, ENCODING, BODY FROM responses WHERE URL=?", [url]).fetchone()
+
+    def _build_cached_response(self, not_modified: requests.Response, cached):
+        response = requests.Response()
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.cookies = not_modified.cookies
+        response.status_code = cached['STATUS']
+        response.headers = CaseInsensitiveDict(json.loads(cached['HEADERS']))
+        response.headers.update(not_modified.headers)
+        response.encoding = cached['ENCODING']
+        response._content = zlib.decompress(cached['BODY'])
+        response.from_cache = True
+        response.unchanged = True
+        response.cache_row = None
+        return response
+
+    def _touch(self, url: str, response: requests.Response):
+        with self.lock:
+            self.conn.execute("UPDATE responses SET ETAG=COALESCE(?, ETAG), LAST_MODIFIED=COALESCE(?, LAST_MODIFIED), STORED_AT=?, ACCESSED_AT=? WHERE URL=?",
+                              [response.headers.get('ETag'), response.headers.get('Last-Modified'), time.time(), time.time(), url])
+            self.conn.commit()
+
+    def _get_row(self, url: str, response: requests.Response, content_hash: str):
+        body = zlib.compress(response.content)
+        return (url, response.status_code, json.dumps(dict(response.headers)), response.encoding, response.headers.get('ETag'),
+                response.headers.get('Last-Modified'), content_hash, body, len(body))
+
+    def store_many(self, rows: list):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO responses(URL, STATUS, HEADERS, ENCODING, ETAG, LAST_MODIFIED, CONTENT_HASH, BODY, SIZE, STORED_AT, ACCESSED_AT) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  [(*row, now, now) for row in rows])
+            self.conn.commit()
+            writes = self.writes
+            self.writes += len(rows)
+            if writes // EVICTION_INTERVAL != self.writes // EVICTION_INTERVAL:
+                self._evict()
+
+    def _evict(self):
+        if self.max_age is not None:
+            self.conn.execute("DELETE FROM responses WHERE STORED_AT<?", [time.time() - self.max_age])
+        total_size = self.conn.execute("SELECT COALESCE(SUM(SIZE), 0) FROM responses").fetchone()[0]
+        if total_size > self.max_size:
+            evicted = []
+            for row in self.conn.execute("SELECT URL, SIZE FROM responses ORDER BY ACCESSED_AT"):
+                if total_size <= self.max_size:
+                    break
+                evicted.append([row['URL']])
+                total_size -= row['SIZE']
+            self.conn.executemany("DELETE FROM responses WHERE URL=?", evicted)
+            logger.info("EVICTED %d CACHED RESPONSES", len(evicted))
+        self.conn.commit()
@@ -0,0 +1,203 @@
+from typing import Callable, List, Dict, Union, Tuple
+from .driver import ChromeDriverPool, prepare_navigation, wait_until_ready
+from .db import *
+from .exceptions import *
+from .ratelimit import RateLimiter
+from .buffer import WriteBuffer
+from .metrics import get_metrics
+from concurrent.futures import ThreadPoolExecutor
+import json
+import seleniumwire.undetected_chromedriver as uc
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import WebDriverException
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WebScraperChrome:
+    def __init__(self, config: dict):
+        self.config = config
+        self.get_items_urls_func : Callable[[uc.Chrome], List[str]] = None
+        self.get_items_urls_and_infos_func: Callable[[uc.Chrome], List[Tuple[str, Dict]]] = None
+        self.get_next_page_func : Callable[[uc.Chrome], Union[str, WebElement]] = None
+        self.parse_info_func : Callable[[uc.Chrome], Dict] = None
+        self.driver_pool = ChromeDriverPool(config['DRIVER'])
+        self.db_pool = get_db_pool_by_config(config['DATABASE'])
+        self.db_class = get_db_class_by_config(config['DATABASE'], self.db_pool)
+        self.rate_limiter = RateLimiter(config['SCRAPER'])
+        self.metrics = get_metrics(config['SCRAPER'].get('METRICS'))
+        self.write_buffer = WriteBuffer(self.db_class, config['DATABASE'], self.metrics)
+
+    @property
+    def driver(self) -> uc.Chrome:
+        return self.driver_pool.drivers[0] if self.driver_pool.drivers else None
+
+    def __enter__(self):
+        self.metrics.start()
+        self.metrics.gauge('write_buffer_pending', self.write_buffer.__len__)
+        self.metrics.gauge_group('rate_limit', self.rate_limiter.metrics, 'host')
+        self.driver_pool.__enter__()
+        self.write_buffer.__enter__()
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        try:
+            self.write_buffer.close()
+        finally:
+            self.db_pool.close()
+            self.driver_pool.close()
+            self.metrics.close()
+
+    def get(self, driver: uc.Chrome, url: str):
+        with self.metrics.timer('RATE_LIMIT'):
+            self.rate_limiter.wait(url)
+        prepare_navigation(driver, self.config['DRIVER'])
+        try:
+            with self.metrics.timer('FETCH'):
+                driver.get(url)
+        except WebDriverException:
+            self.metrics.inc('fetch_errors_total')
+            raise
+        self.metrics.inc('pages_loaded_total')
+        self.driver_pool.record_page(driver)
+
+    def wait_until_ready(self, driver: uc.Chrome):
+        with self.metrics.timer('READY'):
+            wait_until_ready(driver, self.config['DRIVER'])
+
+    def parse(self, parse_func: Callable, driver: uc.Chrome):
+        with self.metrics.timer('PARSE'):
+            return parse_func(driver)
+
+    def run_workers(self, worker: Callable, items):
+        items_lock = threading.Lock()
+        stop = threading.Event()
+        def next_item():
+            with items_lock:
+                return None if stop.is_set() else next(items, None)
+        def run():
+            try:
+                worker(next_item)
+            except:
+                stop.set()
+                raise
+        with ThreadPoolExecutor(max_workers=self.driver_pool.size) as executor:
+            futures = [executor.submit(run) for _ in range(self.driver_pool.size)]
+            for future in futures:
+                future.result()
+
+    def scrape_items_urls(self, urls: list):
+        if self.get_items_urls_func is None and self.get_items_urls_and_infos_func is None:
+            raise ParserNotSetException()
+        self.run_workers(self._urls_worker, iter(urls))
+        self.write_buffer.flush()
+
+    def _urls_worker(self, next_url: Callable):
+        while (url := next_url()) is not None:
+            start_page = get_start_page(self.db_class, self.config['DATABASE'], url)
+            if start_page is None:
+                logger.info("SEED ALREADY DONE %s", url)
+                continue
+            try:
+                with self.driver_pool.lease() as driver:
+                    self._scrape_seed_urls(driver, url, start_page)
+            except WebDriverException:
+                logger.exception("SCRAPING URLS FAILED %s", url)
+
+    def _scrape_seed_urls(self, driver: uc.Chrome, url: str, start_page: str):
+        logger.info("SCRAPING URLS %s", start_page)
+        self.get(driver, start_page)
+        while True:
+            self.wait_until_ready(driver)
+            if self.get_items_urls_func:
+                items_urls = [[i] for i in self.parse(self.get_items_urls_func, driver)]
+                if len(items_urls) > 0:
+                    self.write_buffer.save_urls(items_urls)
+                    logger.info("FOUND %d URLS IN %s", len(items_urls), driver.current_url)
+                else:
+                    logger.info("NO URLS FOUND IN %s", url)
+            
+            if self.get_items_urls_and_infos_func:
+                items_urls_and_infos = [[i[0], json.dumps(i[1])] for i in self.parse(self.get_items_urls_and_infos_func, driver)]
+                if len(items_urls_and_infos) > 0:
+                    self.write_buffer.save_url_and_info_many(items_urls_and_infos)
+                    logger.info("FOUND %d URLS AND INFOS IN %s", len(items_urls_and_infos), url)
+                else:
+                    logger.info("NO URLS AND INFOS FOUND IN %s", url)
+
+            if self.get_next_page_func:
+                next_page = self.get_next_page_func(driver)
+                if isinstance(next_page, str):
+                    logger.info("GOING TO NEXT PAGE %s", next_page)
+                    self.write_buffer.save_checkpoint(url, next_page, False)
+                    self.get(driver, next_page)
+                elif isinstance(next_page, WebElement):
+                    logger.info("GOING TO NEXT PAGE ELEMENT %s", next_page.tag_name)
+                    prepare_navigation(driver, self.config['DRIVER'])
+                    ActionChains(driver, 500).move_to_element(next_page).pause(0.5).click().perform()
+                    self.driver_pool.record_page(driver)
+                else:
+                    self.write_buffer.save_checkpoint(url, None, True)
+                    break
+            else:
+                self.write_buffer.save_checkpoint(url, None, True)
+                break
+                            
+    def scrape_items_infos(self, update=False, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.WITHOUT_INFO):
+        if self.parse_info_func is None:
+            raise ParserNotSetException()
+        self.write_buffer.flush()
+        items = iter_items_to_scrape(self.db_class, self.config['DATABASE'], items_filter, URL_COLUMNS)
+        self.run_workers(lambda next_item: self._infos_worker(next_item, update), items)
+        self.write_buffer.flush()
+
+    def _infos_worker(self, next_item: Callable, update: bool):
+        while (item := next_item()) is not None:
+            try:
+                with self.driver_pool.lease() as driver:
+                    self._scrape_item_info(driver, item, update)
+            except WebDriverException as e:
+                logger.exception("FETCH FAILED %s", item['URL'])
+                self.write_buffer.fail_item(item['ID'], str(e))
+
+    def _scrape_item_info(self, driver: uc.Chrome, item, update: bool):
+        logger.info("GETTING INFO %s", item['URL'])
+        self.get(driver, item['URL'])
+        self.wait_until_ready(driver)
+        info = self.parse(self.parse_info_func, driver)
+        if info is None:
+            logger.info("NO INFO %s", item['URL'])
+            self.write_buffer.fail_item(item['ID'], "NO INFO")
+            return
+        if update:
+            self.write_buffer.merge_info(item['ID'], json.dumps(info), overwrite=False)
+        else:
+            self.write_buffer.set_info(item['ID'], json.dumps(info))
+        self.write_buffer.complete_item(item['ID'])
+        logger.info("INFO SAVED %s", item['URL'])
+
+    def scrape_items_infos_key_url(self, key: str, parse_info_func: Callable[[uc.Chrome], Dict]):
+        self.write_buffer.flush()
+        items = iter_key_url_items(self.db_class, self.config['DATABASE'], key)
+        self.run_workers(lambda next_item: self._key_url_worker(next_item, key, parse_info_func), items)
+        self.write_buffer.flush()
+
+    def _key_url_worker(self, next_item: Callable, key: str, parse_info_func: Callable[[uc.Chrome], Dict]):
+        while (item := next_item()) is not None:
+            key_url = item['KEY_URL']
+            logger.info("GETTING KEY INFO %s", key_url)
+            try:
+                with self.driver_pool.lease() as driver:
+                    self.get(driver, key_url)
+                    self.wait_until_ready(driver)
+                    key_info = self.parse(parse_info_func, driver)
+            except WebDriverException:
+                logger.exception("FETCH FAILED %s", key_url)
+                continue
+            if key_info is None:
+                logger.info("NO INFO %s", key_url)
+                continue
+            self.write_buffer.merge_info(item['ID'], json.dumps(key_info))
+            logger.info("INFO SAVED %s", item['URL'])
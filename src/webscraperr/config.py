@@ -1,11 +1,43 @@
-from seleniumwire.undetected_chromedriver import ChromeOptions
 from .db import DBTypes
+from .urls import DEFAULT_STRIP_PARAMS
+from .metrics import METRICS_STAGES
+from .retry import DEFAULT_RETRY_STATUSES
+
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico', '.bmp'),
+    'font': ('.woff', '.woff2', '.ttf', '.otf', '.eot'),
+    'media': ('.mp4', '.webm', '.ogg', '.ogv', '.mp3', '.wav', '.m4a', '.m3u8'),
+    'stylesheet': ('.css',),
+    'script': ('.js',)
+}
 
 def get_default_config():
     default_config = {
         "DRIVER": {
             "OPTIONS": None,
-            "AFTER_GET_DELAY": None
+            "AFTER_GET_DELAY": None,
+            "POOL": {
+                "SIZE": 1,
+                "MAX_PAGES": None,
+                "MAX_MEMORY_MB": None,
+                "MEMORY_CHECK_PAGES": 10
+            },
+            "BLOCK": {
+                "RESOURCE_TYPES": [],
+                "DOMAINS": [],
+                "URL_PATTERNS": []
+            },
+            "CAPTURE": {
+                "DISABLED": False,
+                "MAX_REQUESTS": None
+            },
+            "READY": {
+                "SELECTOR": None,
+                "NETWORK_IDLE": None,
+                "DOM_STABLE": None,
+                "TIMEOUT": 10,
+                "POLL_INTERVAL": 0.1
+            }
         },
         "DATABASE": {
             "TYPE": DBTypes.SQLITE,
@@ -17,13 +49,101 @@ def get_default_config():
             },
             "TABLE": "items",
             "DATABASE": "",
+            "SCHEMA_VERSION": 1,
+            "CANONICALIZE": {
+                "ENABLED": False,
+                "STRIP_PARAMS": list(DEFAULT_STRIP_PARAMS),
+                "SORT_PARAMS": True,
+                "REMOVE_FRAGMENT": True,
+                "REMOVE_TRAILING_SLASH": False
+            },
+            "INDEXED_KEYS": [],
+            "POOL_SIZE": 5,
+            "CHUNK_SIZE": 1000,
+            "BUFFER": {
+                "SIZE": 100,
+                "INTERVAL": 1.0
+            },
+            "FRONTIER": {
+                "ENABLED": False,
+                "WORKER_ID": None,
+                "BATCH_SIZE": 100,
+                "LEASE_SECONDS": 300,
+                "MAX_ATTEMPTS": 3
+            },
+            "SEEN_URLS": {
+                "ENABLED": False,
+                "TYPE": "SET",
+                "PATH": None,
+                "CAPACITY": 1000000,
+                "ERROR_RATE": 0.001
+            }
         },
         "SCRAPER": {
-            "REQUEST_DELAY": None
+            "REQUEST_DELAY": None,
+            "CONCURRENCY": 8,
+            "QUEUE_SIZE": None,
+            "PARSE_WORKERS": None,
+            "PARSE_QUEUE_SIZE": None,
+            "WRITE_QUEUE_SIZE": None,
+            "PAGINATION": {
+                "PARAM": None,
+                "START": 1,
+                "MAX_PAGES": None,
+                "MAX_FAILED_PAGES": 3,
+                "PROBE_LAST_PAGE": False
+            },
+            "RATE_LIMIT": {
+                "RATE": None,
+                "BURST": 1,
+                "HOSTS": {}
+            },
+            "HTTP_CACHE": {
+                "ENABLED": False,
+                "PATH": "httpcache.db",
+                "MAX_SIZE_MB": 1024,
+                "MAX_AGE": None
+            },
+            "ARCHIVE": {
+                "ENABLED": False,
+                "PATH": "archive",
+                "SEGMENT_SIZE_MB": 256,
+                "COMPRESSION": None
+            },
+            "METRICS": {
+                "ENABLED": False,
+                "EXPORTER": None,
+                "HOST": "127.0.0.1",
+                "PORT": 9100,
+                "PATH": "metrics.json",
+                "INTERVAL": 10,
+                "PROFILE": None,
+                "PROFILE_STAGES": [],
+                "PROFILE_DIR": "profiles",
+                "BUCKETS": None
+            },
+            "RETRY": {
+                "ENABLED": False,
+                "MAX_ATTEMPTS": 3,
+                "BACKOFF": 1.0,
+                "MAX_BACKOFF": 60.0,
+                "STATUSES": list(DEFAULT_RETRY_STATUSES)
+            }
         }
     }
     return default_config
 
+def validate_rate_limit(rate_limit: dict, name: str):
+    rate = rate_limit.get("RATE")
+    if rate is not None:
+        if type(rate) not in [int, float]:
+            raise ValueError(f"{name} RATE must be an int or float")
+        if rate <= 0:
+            raise ValueError(f"{name} RATE must be greater than 0")
+    burst = rate_limit.get("BURST", 1)
+    if type(burst) is not int or burst <= 0:
+        raise ValueError(f"{name} BURST must be an int greater than 0")
+
 def validate_config(config):
     # Validate DRIVER section
     driver_config = config.get("DRIVER", {})
@@ -31,6 +151,7 @@ def validate_config(config):
         raise ValueError("Invalid DRIVER configuration")
 
     if "OPTIONS" in driver_config and driver_config["OPTIONS"] is not None:
+        from seleniumwire.undetected_chromedriver import ChromeOptions
         if not isinstance(driver_config["OPTIONS"], ChromeOptions):
             raise ValueError("DRIVER OPTIONS must be an instance of ChromeOptions")
     else:
@@ -47,6 +168,75 @@ def validate_config(config):
     else:
         driver_config["AFTER_GET_DELAY"] = None
 
+    pool_config = driver_config.get("POOL") or {}
+    if not isinstance(pool_config, dict):
+        raise ValueError("DRIVER POOL must be a dictionary")
+    pool_size = pool_config.get("SIZE", 1)
+    if type(pool_size) is not int or pool_size <= 0:
+        raise ValueError("DRIVER POOL SIZE must be an int greater than 0")
+    for key in ["MAX_PAGES", "MAX_MEMORY_MB"]:
+        value = pool_config.get(key)
+        if value is not None:
+            if type(value) is not int or value <= 0:
+                raise ValueError(f"DRIVER POOL {key} must be an int greater than 0")
+        pool_config[key] = value
+    memory_check_pages = pool_config.get("MEMORY_CHECK_PAGES", 10)
+    if type(memory_check_pages) is not int or memory_check_pages <= 0:
+        raise ValueError("DRIVER POOL MEMORY_CHECK_PAGES must be an int greater than 0")
+    pool_config["SIZE"] = pool_size
+    pool_config["MEMORY_CHECK_PAGES"] = memory_check_pages
+    driver_config["POOL"] = pool_config
+
+    block_config = driver_config.get("BLOCK") or {}
+    if not isinstance(block_config, dict):
+        raise ValueError("DRIVER BLOCK must be a dictionary")
+    for key in ["RESOURCE_TYPES", "DOMAINS", "URL_PATTERNS"]:
+        values = block_config.get(key) or []
+        if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+            raise ValueError(f"DRIVER BLOCK {key} must be a list of strings")
+        block_config[key] = values
+    for resource_type in block_config["RESOURCE_TYPES"]:
+        if resource_type not in RESOURCE_TYPE_EXTENSIONS:
+            raise ValueError(f"DRIVER BLOCK RESOURCE_TYPES must be one of {', '.join(RESOURCE_TYPE_EXTENSIONS)}")
+    driver_config["BLOCK"] = block_config
+
+    capture_config = driver_config.get("CAPTURE") or {}
+    if not isinstance(capture_config, dict):
+        raise ValueError("DRIVER CAPTURE must be a dictionary")
+    capture_disabled = capture_config.get("DISABLED", False)
+    if not isinstance(capture_disabled, bool):
+        raise ValueError("DRIVER CAPTURE DISABLED must be a bool")
+    if capture_disabled and any(block_config.values()):
+        raise ValueError("DRIVER BLOCK needs DRIVER CAPTURE to be enabled")
+    max_requests = capture_config.get("MAX_REQUESTS")
+    if max_requests is not None:
+        if type(max_requests) is not int or max_requests < 0:
+            raise ValueError("DRIVER CAPTURE MAX_REQUESTS must be an int greater than or equal to 0")
+    capture_config["DISABLED"] = capture_disabled
+    capture_config["MAX_REQUESTS"] = max_requests
+    driver_config["CAPTURE"] = capture_config
+
+    ready_config = driver_config.get("READY") or {}
+    if not isinstance(ready_config, dict):
+        raise ValueError("DRIVER READY must be a dictionary")
+    selector = ready_config.get("SELECTOR")
+    if selector is not None and (not isinstance(selector, str) or not selector):
+        raise ValueError("DRIVER READY SELECTOR must be a non empty string")
+    for key, default in [("NETWORK_IDLE", None), ("DOM_STABLE", None), ("TIMEOUT", 10), ("POLL_INTERVAL", 0.1)]:
+        value = ready_config.get(key, default)
+        if value is not None:
+            if type(value) not in [int, float]:
+                raise ValueError(f"DRIVER READY {key} must be an int or float")
+            if value <= 0:
+                raise ValueError(f"DRIVER READY {key} must be greater than 0")
+        ready_config[key] = value
+    if ready_config["TIMEOUT"] is None:
+        raise ValueError("DRIVER READY TIMEOUT must be set")
+    if ready_config["NETWORK_IDLE"] is not None and capture_disabled:
+        raise ValueError("DRIVER READY NETWORK_IDLE needs DRIVER CAPTURE to be enabled")
+    ready_config["SELECTOR"] = selector
+    driver_config["READY"] = ready_config
+
     # Validate DATABASE section
     database_config = config.get("DATABASE", {})
     if not isinstance(database_config, dict):
@@ -74,13 +264,108 @@ def validate_config(config):
     if not isinstance(database_name, str) or not database_name:
         raise ValueError("DATABASE NAME must be set")
 
+    schema_version = database_config.get("SCHEMA_VERSION", 1)
+    if schema_version not in [1, 2]:
+        raise ValueError("DATABASE SCHEMA_VERSION must be 1 or 2")
+    database_config["SCHEMA_VERSION"] = schema_version
+
+    canonicalize = database_config.get("CANONICALIZE") or {}
+    if not isinstance(canonicalize, dict):
+        raise ValueError("DATABASE CANONICALIZE must be a dictionary")
+    for key, default in [("ENABLED", False), ("SORT_PARAMS", True), ("REMOVE_FRAGMENT", True), ("REMOVE_TRAILING_SLASH", False)]:
+        value = canonicalize.get(key, default)
+        if not isinstance(value, bool):
+            raise ValueError(f"DATABASE CANONICALIZE {key} must be a bool")
+        canonicalize[key] = value
+    strip_params = canonicalize.get("STRIP_PARAMS", list(DEFAULT_STRIP_PARAMS))
+    if not isinstance(strip_params, list) or not all(isinstance(param, str) and param for param in strip_params):
+        raise ValueError("DATABASE CANONICALIZE STRIP_PARAMS must be a list of strings")
+    canonicalize["STRIP_PARAMS"] = strip_params
+    database_config["CANONICALIZE"] = canonicalize
+
+    indexed_keys = database_config.get("INDEXED_KEYS") or []
+    if not isinstance(indexed_keys, list) or not all(isinstance(key, str) and key for key in indexed_keys):
+        raise ValueError("DATABASE INDEXED_KEYS must be a list of strings")
+    database_config["INDEXED_KEYS"] = indexed_keys
+
+    pool_size = database_config.get("POOL_SIZE", 5)
+    if type(pool_size) is not int or pool_size <= 0:
+        raise ValueError("DATABASE POOL_SIZE must be an int greater than 0")
+    database_config["POOL_SIZE"] = pool_size
+
+    chunk_size = database_config.get("CHUNK_SIZE", 1000)
+    if type(chunk_size) is not int or chunk_size <= 0:
+        raise ValueError("DATABASE CHUNK_SIZE must be an int greater than 0")
+    database_config["CHUNK_SIZE"] = chunk_size
+
+    buffer_config = database_config.get("BUFFER") or {}
+    if not isinstance(buffer_config, dict):
+        raise ValueError("DATABASE BUFFER must be a dictionary")
+    buffer_size = buffer_config.get("SIZE", 100)
+    if type(buffer_size) is not int or buffer_size <= 0:
+        raise ValueError("DATABASE BUFFER SIZE must be an int greater than 0")
+    buffer_interval = buffer_config.get("INTERVAL", 1.0)
+    if buffer_interval is not None:
+        if type(buffer_interval) not in [int, float]:
+            raise ValueError("DATABASE BUFFER INTERVAL must be an int or float")
+        if buffer_interval <= 0:
+            raise ValueError("DATABASE BUFFER INTERVAL must be greater than 0")
+    buffer_config["SIZE"] = buffer_size
+    buffer_config["INTERVAL"] = buffer_interval
+    database_config["BUFFER"] = buffer_config
+
+    frontier_config = database_config.get("FRONTIER") or {}
+    if not isinstance(frontier_config, dict):
+        raise ValueError("DATABASE FRONTIER must be a dictionary")
+    if not isinstance(frontier_config.get("ENABLED", False), bool):
+        raise ValueError("DATABASE FRONTIER ENABLED must be a bool")
+    worker_id = frontier_config.get("WORKER_ID")
+    if worker_id is not None and (not isinstance(worker_id, str) or not worker_id):
+        raise ValueError("DATABASE FRONTIER WORKER_ID must be a non empty string")
+    for key, default in [("BATCH_SIZE", 100), ("MAX_ATTEMPTS", 3)]:
+        value = frontier_config.get(key, default)
+        if type(value) is not int or value <= 0:
+            raise ValueError(f"DATABASE FRONTIER {key} must be an int greater than 0")
+        frontier_config[key] = value
+    lease_seconds = frontier_config.get("LEASE_SECONDS", 300)
+    if type(lease_seconds) not in [int, float] or lease_seconds <= 0:
+        raise ValueError("DATABASE FRONTIER LEASE_SECONDS must be an int or float greater than 0")
+    frontier_config["ENABLED"] = frontier_config.get("ENABLED", False)
+    frontier_config["WORKER_ID"] = worker_id
+    frontier_config["LEASE_SECONDS"] = lease_seconds
+    database_config["FRONTIER"] = frontier_config
+
+    seen_urls = database_config.get("SEEN_URLS") or {}
+    if not isinstance(seen_urls, dict):
+        raise ValueError("DATABASE SEEN_URLS must be a dictionary")
+    if not isinstance(seen_urls.get("ENABLED", False), bool):
+        raise ValueError("DATABASE SEEN_URLS ENABLED must be a bool")
+    seen_urls_type = seen_urls.get("TYPE", "SET")
+    if seen_urls_type not in ["SET", "BLOOM"]:
+        raise ValueError("DATABASE SEEN_URLS TYPE must be 'SET' or 'BLOOM'")
+    seen_urls_path = seen_urls.get("PATH")
+    if seen_urls_path is not None and (not isinstance(seen_urls_path, str) or not seen_urls_path):
+        raise ValueError("DATABASE SEEN_URLS PATH must be a non empty string")
+    capacity = seen_urls.get("CAPACITY", 1000000)
+    if type(capacity) is not int or capacity <= 0:
+        raise ValueError("DATABASE SEEN_URLS CAPACITY must be an int greater than 0")
+    error_rate = seen_urls.get("ERROR_RATE", 0.001)
+    if type(error_rate) is not float or not 0 < error_rate < 1:
+        raise ValueError("DATABASE SEEN_URLS ERROR_RATE must be a float between 0 and 1")
+    seen_urls["ENABLED"] = seen_urls.get("ENABLED", False)
+    seen_urls["TYPE"] = seen_urls_type
+    seen_urls["PATH"] = seen_urls_path
+    seen_urls["CAPACITY"] = capacity
+    seen_urls["ERROR_RATE"] = error_rate
+    database_config["SEEN_URLS"] = seen_urls
+
     # Validate SCRAPER section
     scraper_config = config.get("SCRAPER", {})
     if not isinstance(scraper_config, dict):
         raise ValueError("Invalid SCRAPER configuration")
 
-    if "REQUEST_DELAY" in driver_config:
-        request_delay = driver_config.get('REQUEST_DELAY')
+    if "REQUEST_DELAY" in scraper_config:
+        request_delay = scraper_config.get('REQUEST_DELAY')
         if request_delay is not None:
             if type(request_delay) not in [int, float]:
                 raise ValueError("SCRAPER REQUEST_DELAY must be an int or float")
@@ -90,6 +375,159 @@ def validate_config(config):
     else:
         scraper_config["REQUEST_DELAY"] = None
 
+    concurrency = scraper_config.get("CONCURRENCY", 8)
+    if type(concurrency) is not int or concurrency <= 0:
+        raise ValueError("SCRAPER CONCURRENCY must be an int greater than 0")
+    scraper_config["CONCURRENCY"] = concurrency
+
+    for key in ["QUEUE_SIZE", "PARSE_WORKERS", "PARSE_QUEUE_SIZE", "WRITE_QUEUE_SIZE"]:
+        value = scraper_config.get(key)
+        if value is not None:
+            if type(value) is not int or value <= 0:
+                raise ValueError(f"SCRAPER {key} must be an int greater than 0")
+        scraper_config[key] = value
+
+    pagination = scraper_config.get("PAGINATION") or {}
+    if not isinstance(pagination, dict):
+        raise ValueError("SCRAPER PAGINATION must be a dictionary")
+    param = pagination.get("PARAM")
+    if param is not None and (not isinstance(param, str) or not param):
+        raise ValueError("SCRAPER PAGINATION PARAM must be a non empty string")
+    start = pagination.get("START", 1)
+    if type(start) is not int or start < 0:
+        raise ValueError("SCRAPER PAGINATION START must be an int greater than or equal to 0")
+    max_pages = pagination.get("MAX_PAGES")
+    if max_pages is not None and (type(max_pages) is not int or max_pages <= 0):
+        raise ValueError("SCRAPER PAGINATION MAX_PAGES must be an int greater than 0")
+    max_failed_pages = pagination.get("MAX_FAILED_PAGES", 3)
+    if type(max_failed_pages) is not int or max_failed_pages <= 0:
+        raise ValueError("SCRAPER PAGINATION MAX_FAILED_PAGES must be an int greater than 0")
+    if not isinstance(pagination.get("PROBE_LAST_PAGE", False), bool):
+        raise ValueError("SCRAPER PAGINATION PROBE_LAST_PAGE must be a bool")
+    pagination["PARAM"] = param
+    pagination["START"] = start
+    pagination["MAX_PAGES"] = max_pages
+    pagination["MAX_FAILED_PAGES"] = max_failed_pages
+    pagination["PROBE_LAST_PAGE"] = pagination.get("PROBE_LAST_PAGE", False)
+    scraper_config["PAGINATION"] = pagination
+
+    rate_limit = scraper_config.get("RATE_LIMIT") or {}
+    if not isinstance(rate_limit, dict):
+        raise ValueError("SCRAPER RATE_LIMIT must be a dictionary")
+    validate_rate_limit(rate_limit, "SCRAPER RATE_LIMIT")
+    hosts = rate_limit.get("HOSTS") or {}
+    if not isinstance(hosts, dict):
+        raise ValueError("SCRAPER RATE_LIMIT HOSTS must be a dictionary")
+    for host, host_rate_limit in hosts.items():
+        if not isinstance(host_rate_limit, dict):
+            raise ValueError(f"SCRAPER RATE_LIMIT HOSTS '{host}' must be a dictionary")
+        validate_rate_limit(host_rate_limit, f"SCRAPER RATE_LIMIT HOSTS '{host}'")
+    rate_limit.setdefault("RATE", None)
+    rate_limit.setdefault("BURST", 1)
+    rate_limit["HOSTS"] = hosts
+    scraper_config["RATE_LIMIT"] = rate_limit
+
+    http_cache = scraper_config.get("HTTP_CACHE") or {}
+    if not isinstance(http_cache, dict):
+        raise ValueError("SCRAPER HTTP_CACHE must be a dictionary")
+    if not isinstance(http_cache.get("ENABLED", False), bool):
+        raise ValueError("SCRAPER HTTP_CACHE ENABLED must be a bool")
+    http_cache_path = http_cache.get("PATH", "httpcache.db")
+    if not isinstance(http_cache_path, str) or not http_cache_path:
+        raise ValueError("SCRAPER HTTP_CACHE PATH must be set")
+    max_size_mb = http_cache.get("MAX_SIZE_MB", 1024)
+    if type(max_size_mb) not in [int, float] or max_size_mb <= 0:
+        raise ValueError("SCRAPER HTTP_CACHE MAX_SIZE_MB must be an int or float greater than 0")
+    max_age = http_cache.get("MAX_AGE")
+    if max_age is not None:
+        if type(max_age) not in [int, float] or max_age <= 0:
+            raise ValueError("SCRAPER HTTP_CACHE MAX_AGE must be an int or float greater than 0")
+    http_cache["ENABLED"] = http_cache.get("ENABLED", False)
+    http_cache["PATH"] = http_cache_path
+    http_cache["MAX_SIZE_MB"] = max_size_mb
+    http_cache["MAX_AGE"] = max_age
+    scraper_config["HTTP_CACHE"] = http_cache
+
+    archive = scraper_config.get("ARCHIVE") or {}
+    if not isinstance(archive, dict):
+        raise ValueError("SCRAPER ARCHIVE must be a dictionary")
+    if not isinstance(archive.get("ENABLED", False), bool):
+        raise ValueError("SCRAPER ARCHIVE ENABLED must be a bool")
+    archive_path = archive.get("PATH", "archive")
+    if not isinstance(archive_path, str) or not archive_path:
+        raise ValueError("SCRAPER ARCHIVE PATH must be set")
+    segment_size_mb = archive.get("SEGMENT_SIZE_MB", 256)
+    if type(segment_size_mb) not in [int, float] or segment_size_mb <= 0:
+        raise ValueError("SCRAPER ARCHIVE SEGMENT_SIZE_MB must be an int or float greater than 0")
+    compression = archive.get("COMPRESSION")
+    if compression not in [None, "zstd", "gzip"]:
+        raise ValueError("SCRAPER ARCHIVE COMPRESSION must be 'zstd' or 'gzip'")
+    archive["ENABLED"] = archive.get("ENABLED", False)
+    archive["PATH"] = archive_path
+    archive["SEGMENT_SIZE_MB"] = segment_size_mb
+    archive["COMPRESSION"] = compression
+    scraper_config["ARCHIVE"] = archive
+
+    metrics = scraper_config.get("METRICS") or {}
+    if not isinstance(metrics, dict):
+        raise ValueError("SCRAPER METRICS must be a dictionary")
+    if not isinstance(metrics.get("ENABLED", False), bool):
+        raise ValueError("SCRAPER METRICS ENABLED must be a bool")
+    exporter = metrics.get("EXPORTER")
+    if exporter not in [None, "prometheus", "json"]:
+        raise ValueError("SCRAPER METRICS EXPORTER must be 'prometheus' or 'json'")
+    for key, default in [("HOST", "127.0.0.1"), ("PATH", "metrics.json"), ("PROFILE_DIR", "profiles")]:
+        value = metrics.get(key, default)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"SCRAPER METRICS {key} must be set")
+        metrics[key] = value
+    port = metrics.get("PORT", 9100)
+    if type(port) is not int or not 0 <= port <= 65535:
+        raise ValueError("SCRAPER METRICS PORT must be an int between 0 and 65535")
+    interval = metrics.get("INTERVAL", 10)
+    if type(interval) not in [int, float] or interval <= 0:
+        raise ValueError("SCRAPER METRICS INTERVAL must be an int or float greater than 0")
+    profile = metrics.get("PROFILE")
+    if profile not in [None, "cprofile", "pyinstrument"]:
+        raise ValueError("SCRAPER METRICS PROFILE must be 'cprofile' or 'pyinstrument'")
+    profile_stages = metrics.get("PROFILE_STAGES") or []
+    if not isinstance(profile_stages, list) or not all(stage in METRICS_STAGES for stage in profile_stages):
+        raise ValueError(f"SCRAPER METRICS PROFILE_STAGES must be a list of {', '.join(METRICS_STAGES)}")
+    buckets = metrics.get("BUCKETS")
+    if buckets is not None:
+        if not isinstance(buckets, list) or not buckets or not all(type(bucket) in [int, float] and bucket > 0 for bucket in buckets):
+            raise ValueError("SCRAPER METRICS BUCKETS must be a list of numbers greater than 0")
+        buckets = sorted(buckets)
+    metrics["ENABLED"] = metrics.get("ENABLED", False)
+    metrics["EXPORTER"] = exporter
+    metrics["PORT"] = port
+    metrics["INTERVAL"] = interval
+    metrics["PROFILE"] = profile
+    metrics["PROFILE_STAGES"] = profile_stages
+    metrics["BUCKETS"] = buckets
+    scraper_config["METRICS"] = metrics
+
+    retry = scraper_config.get("RETRY") or {}
+    if not isinstance(retry, dict):
+        raise ValueError("SCRAPER RETRY must be a dictionary")
+    if not isinstance(retry.get("ENABLED", False), bool):
+        raise ValueError("SCRAPER RETRY ENABLED must be a bool")
+    max_attempts = retry.get("MAX_ATTEMPTS", 3)
+    if type(max_attempts) is not int or max_attempts <= 0:
+        raise ValueError("SCRAPER RETRY MAX_ATTEMPTS must be an int greater than 0")
+    for key, default in [("BACKOFF", 1.0), ("MAX_BACKOFF", 60.0)]:
+        value = retry.get(key, default)
+        if type(value) not in [int, float] or value < 0:
+            raise ValueError(f"SCRAPER RETRY {key} must be an int or float greater than or equal to 0")
+        retry[key] = value
+    statuses = retry.get("STATUSES", list(DEFAULT_RETRY_STATUSES))
+    if not isinstance(statuses, list) or not all(type(status) is int for status in statuses):
+        raise ValueError("SCRAPER RETRY STATUSES must be a list of ints")
+    retry["ENABLED"] = retry.get("ENABLED", False)
+    retry["MAX_ATTEMPTS"] = max_attempts
+    retry["STATUSES"] = statuses
+    scraper_config["RETRY"] = retry
+
     config["DRIVER"] = driver_config
     config["DATABASE"] = database_config
     config["SCRAPER"] = scraper_config
\ No newline at end of file
@@ -1,7 +1,16 @@
+import re
+import json
 import sqlite3
-from mysql.connector import connect
+import threading
+import hashlib
+import os
+import socket
+import time
+import logging
+from functools import partial
 from enum import IntEnum, StrEnum
 from .exceptions import DatabaseNotSupportedException
+from .urls import canonicalize_url, url_hash
 
 class ItemsFilterByInfo(IntEnum):
     ALL = 0
@@ -12,6 +21,23 @@ class DBTypes(StrEnum):
     SQLITE = 'SQLITE',
     MYSQL = 'MYSQL'
 
+class FrontierStatus(StrEnum):
+    PENDING = 'PENDING'
+    IN_PROGRESS = 'IN_PROGRESS'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+class DeadLetterKind(StrEnum):
+    PAGE = 'PAGE'
+    ITEM = 'ITEM'
+    URL = 'URL'
+
+logger = logging.getLogger(__name__)
+
+ALL_COLUMNS = ('ID', 'URL', 'INFO')
+URL_COLUMNS = ('ID', 'URL')
+HASHED_SCHEMA_VERSION = 2
+
 def get_items_by_filter(conn, items_filter: ItemsFilterByInfo):
     items = []
     match items_filter:
@@ -25,15 +51,194 @@ def get_items_by_filter(conn, items_filter: ItemsFilterByInfo):
             raise ValueError("Invalid UpdateInfoItemsFilter value")
     return items
 
-def get_db_class_by_config(database_config: dict):
+def get_items_filter_condition(items_filter: ItemsFilterByInfo):
+    match items_filter:
+        case ItemsFilterByInfo.WITHOUT_INFO:
+            return "INFO IS NULL"
+        case ItemsFilterByInfo.WITH_INFO:
+            return "INFO IS NOT NULL"
+        case ItemsFilterByInfo.ALL:
+            return None
+        case _:
+            raise ValueError("Invalid UpdateInfoItemsFilter value")
+
+def is_hashed_schema(database_config: dict):
+    return database_config.get('SCHEMA_VERSION', 1) >= HASHED_SCHEMA_VERSION
+
+def prepare_url(database_config: dict, url: str):
+    canonicalize = database_config.get('CANONICALIZE') or {}
+    if canonicalize.get('ENABLED'):
+        return canonicalize_url(url, canonicalize)
+    return url
+
+def get_url_row(database_config: dict, url: str, *values):
+    url = prepare_url(database_config, url)
+    if is_hashed_schema(database_config):
+        return (url_hash(url), url, *values)
+    return (url, *values)
+
+def get_url_key(database_config: dict, url: str):
+    url = prepare_url(database_config, url)
+    if is_hashed_schema(database_config):
+        return 'URL_HASH', url_hash(url)
+    return 'URL', url
+
+def get_insert_columns(database_config: dict, *columns):
+    if is_hashed_schema(database_config):
+        return ('URL_HASH', 'URL', *columns)
+    return ('URL', *columns)
+
+def get_info_key_column(key: str):
+    return "INFO_" + re.sub(r'\W', '_', key)
+
+def get_info_key_json_path(key: str):
+    escaped_key = key.replace('\\', '\\\\').replace('"', '\\"')
+    return f'$."{escaped_key}"'
+
+def get_info_key_path(key: str):
+    return get_info_key_json_path(key).replace("'", "''")
+
+def get_merge_info_params(ids_partials: list):
+    params_by_count = {}
+    for id, partial in ids_partials:
+        values = json.loads(partial)
+        params = [param for key, value in values.items() for param in (get_info_key_json_path(key), json.dumps(value))]
+        params_by_count.setdefault(len(values), []).append((*params, id))
+    return params_by_count
+
+def get_info_key_expression(database_config: dict, key: str):
+    if key in database_config.get('INDEXED_KEYS', []):
+        return get_info_key_column(key)
     if database_config['TYPE'] == DBTypes.MYSQL:
-        return WebScraperDBMySQL
+        return f"JSON_UNQUOTE(NULLIF(JSON_EXTRACT(INFO, '{get_info_key_path(key)}'), CAST('null' AS JSON)))"
+    return f"json_extract(INFO, '{get_info_key_path(key)}')"
+
+def iter_chunks_by_filter(db_class, database_config: dict, items_filter: ItemsFilterByInfo, columns=ALL_COLUMNS, chunk_size: int = None, last_id: int = 0, info_key: str = None):
+    chunk_size = chunk_size or database_config.get('CHUNK_SIZE', 1000)
+    while True:
+        with db_class(database_config) as conn:
+            rows = conn.get_chunk(items_filter, last_id, chunk_size, columns, info_key)
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]['ID']
+
+def iter_items_by_filter(db_class, database_config: dict, items_filter: ItemsFilterByInfo, columns=ALL_COLUMNS, chunk_size: int = None, info_key: str = None):
+    for rows in iter_chunks_by_filter(db_class, database_config, items_filter, columns, chunk_size, info_key=info_key):
+        yield from rows
+
+def iter_key_url_items(db_class, database_config: dict, key: str):
+    columns = ('ID', 'URL', f"{get_info_key_expression(database_config, key)} AS KEY_URL")
+    return iter_items_by_filter(db_class, database_config, ItemsFilterByInfo.WITH_INFO, columns, info_key=key)
+
+def get_worker_id(frontier_config: dict):
+    return frontier_config.get('WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+
+def iter_claimed_items(db_class, database_config: dict, items_filter: ItemsFilterByInfo, columns=ALL_COLUMNS):
+    frontier_config = database_config['FRONTIER']
+    worker_id = get_worker_id(frontier_config)
+    with db_class(database_config) as conn:
+        conn.enqueue_items(items_filter)
+    while True:
+        with db_class(database_config) as conn:
+            rows = conn.claim_items(worker_id, frontier_config['BATCH_SIZE'], columns)
+        if not rows:
+            return
+        yield from rows
+
+def iter_items_to_scrape(db_class, database_config: dict, items_filter: ItemsFilterByInfo, columns=ALL_COLUMNS):
+    if database_config.get('FRONTIER', {}).get('ENABLED'):
+        return iter_claimed_items(db_class, database_config, items_filter, columns)
+    return iter_items_by_filter(db_class, database_config, items_filter, columns)
+
+def get_start_page(db_class, database_config: dict, seed_url: str):
+    if not database_config.get('FRONTIER', {}).get('ENABLED'):
+        return seed_url
+    with db_class(database_config) as conn:
+        checkpoint = conn.get_checkpoint(seed_url)
+    if checkpoint is None:
+        return seed_url
+    if checkpoint['DONE']:
+        return None
+    return checkpoint['NEXT_PAGE'] or seed_url
+
+def import_mysql_connector():
+    try:
+        import mysql.connector
+    except ImportError as e:
+        raise ImportError("mysql-connector-python is required for DBTypes.MYSQL. Install it with pip install webscraperr[mysql]") from e
+    return mysql.connector
+
+def get_db_class_by_config(database_config: dict, pool=None):
+    if database_config['TYPE'] == DBTypes.MYSQL:
+        db_class = WebScraperDBMySQL
     elif database_config['TYPE'] == DBTypes.SQLITE:
-        return WebScraperDBSqlite
+        db_class = WebScraperDBSqlite
     else:
         raise DatabaseNotSupportedException()
+    if pool is not None:
+        return partial(db_class, pool=pool)
+    return db_class
+
+def get_db_pool_by_config(database_config: dict):
+    if database_config['TYPE'] == DBTypes.MYSQL:
+        return MySQLPool(database_config)
+    elif database_config['TYPE'] == DBTypes.SQLITE:
+        return SqlitePool(database_config)
+    else:
+        raise DatabaseNotSupportedException()
+
+def get_mysql_items_table_sql(database_config: dict, table: str):
+    if is_hashed_schema(database_config):
+        return f"""
+            CREATE TABLE IF NOT EXISTS `{database_config['DATABASE']}`.`{table}` (
+            `ID` INT NOT NULL AUTO_INCREMENT,
+            `URL_HASH` BINARY(16) NOT NULL,
+            `URL` TEXT NOT NULL,
+            `INFO` JSON NULL,
+            PRIMARY KEY (`ID`),
+            UNIQUE INDEX `URL_HASH_UNIQUE` (`URL_HASH` ASC) VISIBLE);
+        """
+    return f"""
+            CREATE TABLE IF NOT EXISTS`{database_config['DATABASE']}`.`{table}` (
+            `ID` INT NOT NULL AUTO_INCREMENT,
+            `URL` VARCHAR(255) NOT NULL,
+            `INFO` JSON NULL,
+            PRIMARY KEY (`ID`),
+            UNIQUE INDEX `URL_UNIQUE` (`URL` ASC) VISIBLE);
+        """
+
+def get_sqlite_items_table_sql(database_config: dict, table: str):
+    if is_hashed_schema(database_config):
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+        ID       INTEGER NOT NULL
+                        PRIMARY KEY AUTOINCREMENT,
+        URL_HASH BLOB    NOT NULL
+                        UNIQUE,
+        URL      TEXT    NOT NULL,
+        INFO     TEXT
+        );
+    """
+    return f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+        ID   INTEGER NOT NULL
+                    PRIMARY KEY AUTOINCREMENT,
+        URL  TEXT    NOT NULL
+                    UNIQUE,
+        INFO TEXT
+        );
+    """
+
+def init_info_indexes(database_config: dict):
+    if not database_config.get('INDEXED_KEYS'):
+        return
+    with get_db_class_by_config(database_config)(database_config) as conn:
+        for key in database_config['INDEXED_KEYS']:
+            conn.create_info_index(key)
 
 def init_mysql(database_config: dict):
+    connect = import_mysql_connector().connect
     temp_auth = database_config['AUTH'].copy()
     if 'database' in temp_auth:
         del temp_auth['database']
@@ -43,48 +248,249 @@ def init_mysql(database_config: dict):
 
     with connect(**database_config['AUTH']) as conn:
         cursor = conn.cursor()
+        cursor.execute(get_mysql_items_table_sql(database_config, database_config['TABLE']))
         cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS`{database_config['DATABASE']}`.`{database_config['TABLE']}` (
-            `ID` INT NOT NULL AUTO_INCREMENT,
-            `URL` VARCHAR(255) NOT NULL,
+            CREATE TABLE IF NOT EXISTS `{database_config['DATABASE']}`.`{database_config['TABLE']}_frontier` (
+            `ITEM_ID` INT NOT NULL,
+            `STATUS` VARCHAR(16) NOT NULL DEFAULT 'PENDING',
+            `ATTEMPTS` INT NOT NULL DEFAULT 0,
+            `LAST_ERROR` TEXT NULL,
+            `LEASED_BY` VARCHAR(255) NULL,
+            `LEASE_EXPIRY` DOUBLE NULL,
+            PRIMARY KEY (`ITEM_ID`),
+            INDEX `STATUS_INDEX` (`STATUS` ASC, `ITEM_ID` ASC));
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{database_config['DATABASE']}`.`{database_config['TABLE']}_checkpoints` (
+            `SEED_HASH` CHAR(64) NOT NULL,
+            `SEED_URL` TEXT NOT NULL,
+            `NEXT_PAGE` TEXT NULL,
+            `DONE` TINYINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (`SEED_HASH`));
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{database_config['DATABASE']}`.`{database_config['TABLE']}_dead_letters` (
+            `URL_HASH` CHAR(64) NOT NULL,
+            `URL` TEXT NOT NULL,
+            `KIND` VARCHAR(8) NOT NULL DEFAULT 'PAGE',
+            `ITEM_ID` INT NULL,
+            `SEED_URL` TEXT NULL,
             `INFO` JSON NULL,
-            PRIMARY KEY (`ID`),
-            UNIQUE INDEX `URL_UNIQUE` (`URL` ASC) VISIBLE);
+            `STATUS_CODE` INT NULL,
+            `ERROR` TEXT NULL,
+            `ATTEMPTS` INT NOT NULL DEFAULT 1,
+            `FAILED_AT` DOUBLE NOT NULL,
+            PRIMARY KEY (`URL_HASH`));
         """)
+        cursor.execute(f"SHOW COLUMNS FROM `{database_config['DATABASE']}`.`{database_config['TABLE']}_dead_letters` LIKE 'KIND'")
+        if not cursor.fetchall():
+            cursor.execute(f"ALTER TABLE `{database_config['DATABASE']}`.`{database_config['TABLE']}_dead_letters` ADD COLUMN `KIND` VARCHAR(8) NOT NULL DEFAULT 'PAGE' AFTER `URL`, ADD COLUMN `INFO` JSON NULL AFTER `SEED_URL`")
+            cursor.execute(f"UPDATE `{database_config['DATABASE']}`.`{database_config['TABLE']}_dead_letters` SET `KIND`='ITEM' WHERE `ITEM_ID` IS NOT NULL")
+        conn.commit()
+
+    init_info_indexes(database_config)
 
 def init_sqlite(database_config: dict):
     with sqlite3.connect(database_config['DATABASE']) as conn:
+        conn.execute(get_sqlite_items_table_sql(database_config, database_config['TABLE']))
         conn.execute(f"""
-            CREATE TABLE IF NOT EXISTS {database_config['TABLE']} (
-        ID   INTEGER NOT NULL
-                    PRIMARY KEY AUTOINCREMENT,
-        URL  TEXT    NOT NULL
-                    UNIQUE,
-        INFO TEXT
+            CREATE TABLE IF NOT EXISTS {database_config['TABLE']}_frontier (
+        ITEM_ID      INTEGER NOT NULL
+                            PRIMARY KEY,
+        STATUS       TEXT    NOT NULL
+                            DEFAULT 'PENDING',
+        ATTEMPTS     INTEGER NOT NULL
+                            DEFAULT 0,
+        LAST_ERROR   TEXT,
+        LEASED_BY    TEXT,
+        LEASE_EXPIRY REAL
+        );
+    """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {database_config['TABLE']}_frontier_STATUS ON {database_config['TABLE']}_frontier(STATUS, ITEM_ID)")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {database_config['TABLE']}_checkpoints (
+        SEED_URL  TEXT    NOT NULL
+                         PRIMARY KEY,
+        NEXT_PAGE TEXT,
+        DONE      INTEGER NOT NULL
+                         DEFAULT 0
         );
     """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {database_config['TABLE']}_dead_letters (
+        URL         TEXT    NOT NULL
+                           PRIMARY KEY,
+        KIND        TEXT    NOT NULL
+                           DEFAULT 'PAGE',
+        ITEM_ID     INTEGER,
+        SEED_URL    TEXT,
+        INFO        TEXT,
+        STATUS_CODE INTEGER,
+        ERROR       TEXT,
+        ATTEMPTS    INTEGER NOT NULL
+                           DEFAULT 1,
+        FAILED_AT   REAL    NOT NULL
+        );
+    """)
+        if 'KIND' not in [row[1] for row in conn.execute(f"PRAGMA table_info({database_config['TABLE']}_dead_letters)")]:
+            conn.execute(f"ALTER TABLE {database_config['TABLE']}_dead_letters ADD COLUMN KIND TEXT NOT NULL DEFAULT 'PAGE'")
+            conn.execute(f"ALTER TABLE {database_config['TABLE']}_dead_letters ADD COLUMN INFO TEXT")
+            conn.execute(f"UPDATE {database_config['TABLE']}_dead_letters SET KIND='ITEM' WHERE ITEM_ID IS NOT NULL")
+
+    init_info_indexes(database_config)
+
+def migrate_to_hashed_schema(database_config: dict, chunk_size: int = None):
+    table = database_config['TABLE']
+    target_config = {**database_config, 'TABLE': f"{table}_migrating", 'SCHEMA_VERSION': HASHED_SCHEMA_VERSION}
+    db_class = get_db_class_by_config(database_config)
+    with db_class(target_config) as conn:
+        conn.create_items_table()
+    copied = 0
+    for rows in iter_chunks_by_filter(db_class, database_config, ItemsFilterByInfo.ALL, ALL_COLUMNS, chunk_size):
+        with db_class(target_config) as conn:
+            conn.merge_items([(row['ID'], *get_url_row(target_config, row['URL'], row['INFO'])) for row in rows])
+        copied += len(rows)
+    with db_class(target_config) as conn:
+        conn.replace_items_table(table)
+    init_info_indexes(database_config)
+    with db_class(database_config) as conn:
+        migrated = conn.get_count()
+    logger.info("MIGRATED %d ITEMS TO %s, MERGED %d DUPLICATES, OLD TABLE KEPT AS %s_v1", migrated, table, copied - migrated, table)
+    return migrated
+
+class SqlitePool:
+    PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-16000",
+        "PRAGMA busy_timeout=5000"
+    ]
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.connections = []
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        conn = sqlite3.connect(self.config['DATABASE'], check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        with self.lock:
+            self.connections.append(conn)
+        return conn
+
+    def release(self, conn):
+        with self.lock:
+            pooled = any(conn is pooled_conn for pooled_conn in self.connections)
+            if pooled:
+                self.idle.append(conn)
+        if not pooled:
+            conn.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.connections, self.idle = self.idle, [], []
+        for conn in idle:
+            conn.close()
+
+class MySQLPool:
+    def __init__(self, config: dict):
+        self.config = config
+        self.size = config.get('POOL_SIZE', 5)
+        self.connections = []
+        self.idle = []
+        self.semaphore = threading.BoundedSemaphore(self.size)
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        self.semaphore.acquire()
+        try:
+            with self.lock:
+                conn = self.idle.pop() if self.idle else None
+            if conn is not None and not conn.is_connected():
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = import_mysql_connector().connect(**self.config['AUTH'])
+                with self.lock:
+                    self.connections.append(conn)
+            return conn
+        except:
+            self.semaphore.release()
+            raise
+
+    def release(self, conn):
+        try:
+            with self.lock:
+                pooled = any(conn is pooled_conn for pooled_conn in self.connections)
+                if pooled:
+                    self.idle.append(conn)
+            if not pooled:
+                conn.close()
+        finally:
+            self.semaphore.release()
+
+    def _discard(self, conn):
+        with self.lock:
+            self.connections = [pooled_conn for pooled_conn in self.connections if pooled_conn is not conn]
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.lock:
+            idle, self.connections, self.idle = self.idle, [], []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                logger.exception("FAILED TO CLOSE MYSQL CONNECTION")
 
 class WebScraperDBSqlite:
-    def __init__(self, config):
+    def __init__(self, config, pool: SqlitePool = None):
         self.config = config
+        self.pool = pool
         self.conn = None
         self.cursor = None
 
     def __enter__(self):
-        self.conn = sqlite3.connect(self.config['DATABASE'])
+        if self.pool:
+            self.conn = self.pool.get_connection()
+        else:
+            self.conn = sqlite3.connect(self.config['DATABASE'])
         self.cursor = self.conn.cursor()
         self.cursor.row_factory = sqlite3.Row
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.conn:
-            self.conn.commit()
-            self.conn.close()
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+            if self.pool:
+                self.pool.release(self.conn)
+            else:
+                self.conn.close()
 
     def get_all(self):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']}")
         return self.cursor.fetchall()
 
+    def get_max_id(self):
+        self.cursor.execute(f"SELECT COALESCE(MAX(ID), 0) AS MAX_ID FROM {self.config['TABLE']}")
+        return self.cursor.fetchone()['MAX_ID']
+
+    def get_count(self):
+        self.cursor.execute(f"SELECT COUNT(*) AS COUNT FROM {self.config['TABLE']}")
+        return self.cursor.fetchone()['COUNT']
+
     def get_all_without_info(self):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE INFO IS NULL")
         return self.cursor.fetchall()
@@ -93,54 +499,221 @@ class WebScraperDBSqlite:
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE INFO IS NOT NULL")
         return self.cursor.fetchall()
     
+    def get_chunk(self, items_filter: ItemsFilterByInfo, last_id: int, limit: int, columns=ALL_COLUMNS, info_key: str = None):
+        condition = get_items_filter_condition(items_filter)
+        where = f"ID > ?" if condition is None else f"ID > ? AND {condition}"
+        if info_key is not None:
+            where += f" AND {get_info_key_expression(self.config, info_key)} IS NOT NULL"
+        self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE {where} ORDER BY ID LIMIT ?", (last_id, limit))
+        return self.cursor.fetchall()
+
+    def iter_items(self, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.ALL, columns=ALL_COLUMNS, chunk_size: int = None):
+        chunk_size = chunk_size or self.config.get('CHUNK_SIZE', 1000)
+        last_id = 0
+        while True:
+            rows = self.get_chunk(items_filter, last_id, chunk_size, columns)
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1]['ID']
+
+    def iter_all(self, columns=ALL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.ALL, columns, chunk_size)
+
+    def iter_without_info(self, columns=URL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.WITHOUT_INFO, columns, chunk_size)
+
+    def iter_with_info(self, columns=ALL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.WITH_INFO, columns, chunk_size)
+
     def get_by_id(self, id: int):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE ID=?", [id])
         return self.cursor.fetchone()
 
+    def get_by_ids(self, ids: list, columns=ALL_COLUMNS):
+        items = []
+        chunk_size = self.config.get('CHUNK_SIZE', 1000)
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE ID IN ({', '.join(['?'] * len(chunk))}) ORDER BY ID", chunk)
+            items.extend(self.cursor.fetchall())
+        return items
+
     def get_by_url(self, url: int):
-        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE URL=?", [url])
+        column, value = get_url_key(self.config, url)
+        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE {column}=?", [value])
         return self.cursor.fetchone()
 
+    def _insert_urls(self, datas: list, *columns):
+        insert_columns = get_insert_columns(self.config, *columns)
+        self.cursor.executemany(f"INSERT OR IGNORE INTO {self.config['TABLE']}({', '.join(insert_columns)}) VALUES({', '.join('?' * len(insert_columns))})",
+                                [get_url_row(self.config, *data) for data in datas])
+
     def save_url(self, url: str):
-        self.cursor.execute(f"INSERT OR IGNORE INTO {self.config['TABLE']}(URL) VALUES(?)", [url])
+        self._insert_urls([[url]])
 
     def save_urls(self, urls: list):
-        self.cursor.executemany(f"INSERT OR IGNORE INTO {self.config['TABLE']}(URL) VALUES(?)", urls)
+        self._insert_urls(urls)
 
     def save_url_and_info(self, url: str, info: str):
-        self.cursor.execute(f"INSERT OR IGNORE INTO {self.config['TABLE']}(URL, INFO) VALUES(?, ?)", [url, info])
+        self._insert_urls([[url, info]], 'INFO')
 
     def save_url_and_info_many(self, datas: list):
-        self.cursor.executemany(f"INSERT OR IGNORE INTO {self.config['TABLE']}(URL, INFO) VALUES(?, ?)", datas)
+        self._insert_urls(datas, 'INFO')
 
     def set_info_by_id(self, id: int, info: str):
         self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=? WHERE ID=?", [info, id])
+
+    def set_info_many(self, ids_infos: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']} SET INFO=? WHERE ID=?", [(info, id) for id, info in ids_infos])
     
     def set_info_by_url(self, url: str, info: str):
-        self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=? WHERE URL=?", [info, url])
+        column, value = get_url_key(self.config, url)
+        self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=? WHERE {column}=?", [info, value])
+
+    def merge_info_by_id(self, id: int, partial: str, overwrite: bool = True):
+        self.merge_info_many([(id, partial)], overwrite)
+
+    def merge_info_many(self, ids_partials: list, overwrite: bool = True):
+        ids = list({id: None for id, _ in ids_partials})
+        self.cursor.execute(f"SELECT ID, INFO FROM {self.config['TABLE']} WHERE ID IN ({', '.join('?' * len(ids))})", ids)
+        infos = {row['ID']: row['INFO'] for row in self.cursor.fetchall()}
+        for id, partial in ids_partials:
+            if id not in infos:
+                continue
+            info = json.loads(infos[id] or '{}')
+            values = json.loads(partial)
+            infos[id] = json.dumps({**info, **values} if overwrite else {**values, **info})
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']} SET INFO=? WHERE ID=?", [(info, id) for id, info in infos.items()])
+
+    def create_info_index(self, key: str):
+        column = get_info_key_column(key)
+        self.cursor.execute(f"PRAGMA table_xinfo({self.config['TABLE']})")
+        if column not in [row['name'] for row in self.cursor.fetchall()]:
+            self.cursor.execute(f"ALTER TABLE {self.config['TABLE']} ADD COLUMN {column} GENERATED ALWAYS AS (json_extract(INFO, '{get_info_key_path(key)}')) VIRTUAL")
+        self.cursor.execute(f"CREATE INDEX IF NOT EXISTS {self.config['TABLE']}_{column} ON {self.config['TABLE']}({column})")
 
     def clear_database(self):
         self.cursor.execute(f"DELETE FROM {self.config['TABLE']}")
 
+    def enqueue_items(self, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.ALL):
+        condition = get_items_filter_condition(items_filter)
+        where = "" if condition is None else f" WHERE {condition}"
+        self.cursor.execute(f"INSERT OR IGNORE INTO {self.config['TABLE']}_frontier(ITEM_ID) SELECT ID FROM {self.config['TABLE']}{where}")
+
+    def create_items_table(self):
+        self.cursor.execute(get_sqlite_items_table_sql(self.config, self.config['TABLE']))
+
+    def merge_items(self, rows: list):
+        self.cursor.executemany(f"INSERT INTO {self.config['TABLE']}(ID, URL_HASH, URL, INFO) VALUES(?, ?, ?, ?) ON CONFLICT(URL_HASH) DO UPDATE SET INFO=COALESCE(INFO, excluded.INFO)", rows)
+
+    def replace_items_table(self, table: str):
+        self.cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? AND name LIKE ?", [f"{table}_v1", f"{table}_INFO_%"])
+        for row in self.cursor.fetchall():
+            self.cursor.execute(f"DROP INDEX {row['name']}")
+        self.cursor.execute(f"ALTER TABLE {self.config['TABLE']} RENAME TO {table}")
+        self.cursor.execute(f"DELETE FROM {table}_frontier WHERE ITEM_ID NOT IN (SELECT ID FROM {table})")
+
+    def claim_items(self, worker_id: str, limit: int, columns=ALL_COLUMNS):
+        frontier = f"{self.config['TABLE']}_frontier"
+        frontier_config = self.config['FRONTIER']
+        now = time.time()
+        self.conn.commit()
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.execute(f"UPDATE {frontier} SET STATUS=?, LAST_ERROR=?, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE STATUS=? AND LEASE_EXPIRY<? AND ATTEMPTS>=?",
+                                [FrontierStatus.FAILED, "LEASE EXPIRED", FrontierStatus.IN_PROGRESS, now, frontier_config['MAX_ATTEMPTS']])
+            self.cursor.execute(f"SELECT ITEM_ID FROM {frontier} WHERE (STATUS=? OR (STATUS=? AND LEASE_EXPIRY<?)) AND ATTEMPTS<? ORDER BY ITEM_ID LIMIT ?",
+                                [FrontierStatus.PENDING, FrontierStatus.IN_PROGRESS, now, frontier_config['MAX_ATTEMPTS'], limit])
+            ids = [row['ITEM_ID'] for row in self.cursor.fetchall()]
+            if ids:
+                self.cursor.execute(f"UPDATE {frontier} SET STATUS=?, ATTEMPTS=ATTEMPTS+1, LEASED_BY=?, LEASE_EXPIRY=? WHERE ITEM_ID IN ({', '.join('?' * len(ids))})",
+                                    [FrontierStatus.IN_PROGRESS, worker_id, now + frontier_config['LEASE_SECONDS'], *ids])
+            self.conn.commit()
+        except:
+            self.conn.rollback()
+            raise
+        if not ids:
+            return []
+        self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE ID IN ({', '.join('?' * len(ids))}) ORDER BY ID", ids)
+        return self.cursor.fetchall()
+
+    def complete_items(self, ids: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']}_frontier SET STATUS=?, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE ITEM_ID=?",
+                                [(FrontierStatus.DONE, id) for id in ids])
+
+    def fail_items(self, ids_errors: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']}_frontier SET STATUS=CASE WHEN ATTEMPTS>=? THEN ? ELSE ? END, LAST_ERROR=?, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE ITEM_ID=?",
+                                [(self.config['FRONTIER']['MAX_ATTEMPTS'], FrontierStatus.FAILED, FrontierStatus.PENDING, error, id) for id, error in ids_errors])
+
+    def get_frontier_stats(self):
+        self.cursor.execute(f"SELECT STATUS, COUNT(*) AS COUNT FROM {self.config['TABLE']}_frontier GROUP BY STATUS")
+        return {row['STATUS']: row['COUNT'] for row in self.cursor.fetchall()}
+
+    def reset_frontier(self):
+        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_frontier")
+
+    def get_checkpoint(self, seed_url: str):
+        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']}_checkpoints WHERE SEED_URL=?", [seed_url])
+        return self.cursor.fetchone()
+
+    def save_checkpoints(self, checkpoints: list):
+        self.cursor.executemany(f"INSERT OR REPLACE INTO {self.config['TABLE']}_checkpoints(SEED_URL, NEXT_PAGE, DONE) VALUES(?, ?, ?)", checkpoints)
+
+    def reset_checkpoints(self):
+        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_checkpoints")
+
+    def save_dead_letters(self, dead_letters: list):
+        self.cursor.executemany(f"INSERT OR REPLACE INTO {self.config['TABLE']}_dead_letters(URL, KIND, ITEM_ID, SEED_URL, INFO, STATUS_CODE, ERROR, ATTEMPTS, FAILED_AT) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)", dead_letters)
+
+    def get_dead_letters(self):
+        self.cursor.execute(f"SELECT URL, KIND, ITEM_ID, SEED_URL, INFO, STATUS_CODE, ERROR, ATTEMPTS, FAILED_AT FROM {self.config['TABLE']}_dead_letters ORDER BY FAILED_AT")
+        return self.cursor.fetchall()
+
+    def delete_dead_letters(self, failed_before: float = None):
+        if failed_before is None:
+            self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_dead_letters")
+        else:
+            self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_dead_letters WHERE FAILED_AT<?", [failed_before])
+
 class WebScraperDBMySQL:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, pool: MySQLPool = None):
         self.config = config
+        self.pool = pool
         self.conn = None
         self.cursor = None
 
     def __enter__(self):
-        self.conn = connect(**self.config['AUTH'])
+        if self.pool:
+            self.conn = self.pool.get_connection()
+        else:
+            self.conn = import_mysql_connector().connect(**self.config['AUTH'])
         self.cursor = self.conn.cursor(dictionary=True)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.conn:
-            self.conn.commit()
-            self.conn.close()
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+            if self.pool:
+                self.pool.release(self.conn)
+            else:
+                self.conn.close()
     
     def get_all(self):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']}")
         return self.cursor.fetchall()
+
+    def get_max_id(self):
+        self.cursor.execute(f"SELECT COALESCE(MAX(ID), 0) AS MAX_ID FROM {self.config['TABLE']}")
+        return self.cursor.fetchone()['MAX_ID']
+
+    def get_count(self):
+        self.cursor.execute(f"SELECT COUNT(*) AS COUNT FROM {self.config['TABLE']}")
+        return self.cursor.fetchone()['COUNT']
     
     def get_all_without_info(self):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE INFO IS NULL")
@@ -150,31 +723,173 @@ class WebScraperDBMySQL:
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE INFO IS NOT NULL")
         return self.cursor.fetchall()
     
+    def get_chunk(self, items_filter: ItemsFilterByInfo, last_id: int, limit: int, columns=ALL_COLUMNS, info_key: str = None):
+        condition = get_items_filter_condition(items_filter)
+        where = f"ID > %s" if condition is None else f"ID > %s AND {condition}"
+        if info_key is not None:
+            where += f" AND {get_info_key_expression(self.config, info_key)} IS NOT NULL"
+        self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE {where} ORDER BY ID LIMIT %s", (last_id, limit))
+        return self.cursor.fetchall()
+
+    def iter_items(self, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.ALL, columns=ALL_COLUMNS, chunk_size: int = None):
+        chunk_size = chunk_size or self.config.get('CHUNK_SIZE', 1000)
+        last_id = 0
+        while True:
+            rows = self.get_chunk(items_filter, last_id, chunk_size, columns)
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1]['ID']
+
+    def iter_all(self, columns=ALL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.ALL, columns, chunk_size)
+
+    def iter_without_info(self, columns=URL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.WITHOUT_INFO, columns, chunk_size)
+
+    def iter_with_info(self, columns=ALL_COLUMNS, chunk_size: int = None):
+        return self.iter_items(ItemsFilterByInfo.WITH_INFO, columns, chunk_size)
+
     def get_by_url(self, url: str):
-        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE URL=%s", (url, ))
+        column, value = get_url_key(self.config, url)
+        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE {column}=%s", (value, ))
         return self.cursor.fetchone()
 
     def get_by_id(self, id: int):
         self.cursor.execute(f"SELECT * FROM {self.config['TABLE']} WHERE ID=%s", (id, ))
         return self.cursor.fetchone()
 
+    def get_by_ids(self, ids: list, columns=ALL_COLUMNS):
+        items = []
+        chunk_size = self.config.get('CHUNK_SIZE', 1000)
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE ID IN ({', '.join(['%s'] * len(chunk))}) ORDER BY ID", chunk)
+            items.extend(self.cursor.fetchall())
+        return items
+
+    def _insert_urls(self, datas: list, *columns):
+        insert_columns = get_insert_columns(self.config, *columns)
+        self.cursor.executemany(f"INSERT IGNORE INTO {self.config['TABLE']}({', '.join(insert_columns)}) VALUES({', '.join(['%s'] * len(insert_columns))})",
+                                [get_url_row(self.config, *data) for data in datas])
+
     def save_url(self, url: str):
-        self.cursor.execute(f"INSERT IGNORE INTO {self.config['TABLE']}(URL) VALUES(%s)", (url,))
+        self._insert_urls([[url]])
     
     def save_urls(self, urls: str):
-        self.cursor.executemany(f"INSERT IGNORE INTO {self.config['TABLE']}(URL) VALUES(%s)", urls)
+        self._insert_urls(urls)
     
     def save_url_and_info(self, url: str, info: str):
-        self.cursor.execute(f"INSERT IGNORE INTO {self.config['TABLE']}(URL, INFO) VALUES(%s, %s)", (url, info))
+        self._insert_urls([[url, info]], 'INFO')
 
     def save_url_and_info_many(self, datas: list):
-        self.cursor.executemany(f"INSERT IGNORE INTO {self.config['TABLE']}(URL, INFO) VALUES(%s, %s)", datas)
+        self._insert_urls(datas, 'INFO')
 
     def set_info_by_id(self, id: int, info: str):
         self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=%s WHERE ID=%s", (info, id))
 
+    def set_info_many(self, ids_infos: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']} SET INFO=%s WHERE ID=%s", [(info, id) for id, info in ids_infos])
+
     def set_info_by_url(self, url: str, info: str):
-        self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=%s WHERE URL=%s", (info, url))
+        column, value = get_url_key(self.config, url)
+        self.cursor.execute(f"UPDATE {self.config['TABLE']} SET INFO=%s WHERE {column}=%s", (info, value))
+
+    def merge_info_by_id(self, id: int, partial: str, overwrite: bool = True):
+        self.merge_info_many([(id, partial)], overwrite)
+
+    def merge_info_many(self, ids_partials: list, overwrite: bool = True):
+        function = "JSON_SET" if overwrite else "JSON_INSERT"
+        for count, params in get_merge_info_params(ids_partials).items():
+            merged = f"{function}(COALESCE(INFO, '{{}}'){', %s, CAST(%s AS JSON)' * count})"
+            self.cursor.executemany(f"UPDATE {self.config['TABLE']} SET INFO={merged} WHERE ID=%s", params)
+
+    def create_info_index(self, key: str):
+        column = get_info_key_column(key)
+        self.cursor.execute("SELECT COUNT(*) AS COUNT FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE() AND TABLE_NAME=%s AND COLUMN_NAME=%s",
+                            (self.config['TABLE'], column))
+        if self.cursor.fetchone()['COUNT'] == 0:
+            self.cursor.execute(f"ALTER TABLE {self.config['TABLE']} ADD COLUMN {column} TEXT GENERATED ALWAYS AS (JSON_UNQUOTE(NULLIF(JSON_EXTRACT(INFO, '{get_info_key_path(key)}'), CAST('null' AS JSON)))) STORED, ADD INDEX {column}_INDEX ({column}(255))")
     
     def clear_database(self):
-        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}")
\ No newline at end of file
+        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}")
+
+    def enqueue_items(self, items_filter: ItemsFilterByInfo = ItemsFilterByInfo.ALL):
+        condition = get_items_filter_condition(items_filter)
+        where = "" if condition is None else f" WHERE {condition}"
+        self.cursor.execute(f"INSERT IGNORE INTO {self.config['TABLE']}_frontier(ITEM_ID) SELECT ID FROM {self.config['TABLE']}{where}")
+
+    def create_items_table(self):
+        self.cursor.execute(get_mysql_items_table_sql(self.config, self.config['TABLE']))
+
+    def merge_items(self, rows: list):
+        self.cursor.executemany(f"INSERT INTO {self.config['TABLE']}(ID, URL_HASH, URL, INFO) VALUES(%s, %s, %s, %s) ON DUPLICATE KEY UPDATE INFO=COALESCE(INFO, VALUES(INFO))", rows)
+
+    def replace_items_table(self, table: str):
+        self.cursor.execute(f"RENAME TABLE {table} TO {table}_v1, {self.config['TABLE']} TO {table}")
+        self.cursor.execute(f"DELETE FROM {table}_frontier WHERE ITEM_ID NOT IN (SELECT ID FROM {table})")
+
+    def claim_items(self, worker_id: str, limit: int, columns=ALL_COLUMNS):
+        frontier = f"{self.config['TABLE']}_frontier"
+        frontier_config = self.config['FRONTIER']
+        now = time.time()
+        self.conn.commit()
+        self.conn.start_transaction()
+        try:
+            self.cursor.execute(f"UPDATE {frontier} SET STATUS=%s, LAST_ERROR=%s, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE STATUS=%s AND LEASE_EXPIRY<%s AND ATTEMPTS>=%s",
+                                (FrontierStatus.FAILED, "LEASE EXPIRED", FrontierStatus.IN_PROGRESS, now, frontier_config['MAX_ATTEMPTS']))
+            self.cursor.execute(f"SELECT ITEM_ID FROM {frontier} WHERE (STATUS=%s OR (STATUS=%s AND LEASE_EXPIRY<%s)) AND ATTEMPTS<%s ORDER BY ITEM_ID LIMIT %s FOR UPDATE SKIP LOCKED",
+                                (FrontierStatus.PENDING, FrontierStatus.IN_PROGRESS, now, frontier_config['MAX_ATTEMPTS'], limit))
+            ids = [row['ITEM_ID'] for row in self.cursor.fetchall()]
+            if ids:
+                self.cursor.execute(f"UPDATE {frontier} SET STATUS=%s, ATTEMPTS=ATTEMPTS+1, LEASED_BY=%s, LEASE_EXPIRY=%s WHERE ITEM_ID IN ({', '.join(['%s'] * len(ids))})",
+                                    (FrontierStatus.IN_PROGRESS, worker_id, now + frontier_config['LEASE_SECONDS'], *ids))
+            self.conn.commit()
+        except:
+            self.conn.rollback()
+            raise
+        if not ids:
+            return []
+        self.cursor.execute(f"SELECT {', '.join(columns)} FROM {self.config['TABLE']} WHERE ID IN ({', '.join(['%s'] * len(ids))}) ORDER BY ID", ids)
+        return self.cursor.fetchall()
+
+    def complete_items(self, ids: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']}_frontier SET STATUS=%s, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE ITEM_ID=%s",
+                                [(FrontierStatus.DONE, id) for id in ids])
+
+    def fail_items(self, ids_errors: list):
+        self.cursor.executemany(f"UPDATE {self.config['TABLE']}_frontier SET STATUS=CASE WHEN ATTEMPTS>=%s THEN %s ELSE %s END, LAST_ERROR=%s, LEASED_BY=NULL, LEASE_EXPIRY=NULL WHERE ITEM_ID=%s",
+                                [(self.config['FRONTIER']['MAX_ATTEMPTS'], FrontierStatus.FAILED, FrontierStatus.PENDING, error, id) for id, error in ids_errors])
+
+    def get_frontier_stats(self):
+        self.cursor.execute(f"SELECT STATUS, COUNT(*) AS COUNT FROM {self.config['TABLE']}_frontier GROUP BY STATUS")
+        return {row['STATUS']: row['COUNT'] for row in self.cursor.fetchall()}
+
+    def reset_frontier(self):
+        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_frontier")
+
+    def get_checkpoint(self, seed_url: str):
+        self.cursor.execute(f"SELECT * FROM {self.config['TABLE']}_checkpoints WHERE SEED_HASH=%s", (hashlib.sha256(seed_url.encode()).hexdigest(), ))
+        return self.cursor.fetchone()
+
+    def save_checkpoints(self, checkpoints: list):
+        self.cursor.executemany(f"INSERT INTO {self.config['TABLE']}_checkpoints(SEED_HASH, SEED_URL, NEXT_PAGE, DONE) VALUES(%s, %s, %s, %s) ON DUPLICATE KEY UPDATE NEXT_PAGE=VALUES(NEXT_PAGE), DONE=VALUES(DONE)",
+                                [(hashlib.sha256(seed_url.encode()).hexdigest(), seed_url, next_page, done) for seed_url, next_page, done in checkpoints])
+
+    def reset_checkpoints(self):
+        self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_checkpoints")
+
+    def save_dead_letters(self, dead_letters: list):
+        self.cursor.executemany(f"INSERT INTO {self.config['TABLE']}_dead_letters(URL_HASH, URL, KIND, ITEM_ID, SEED_URL, INFO, STATUS_CODE, ERROR, ATTEMPTS, FAILED_AT) VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                                "ON DUPLICATE KEY UPDATE KIND=VALUES(KIND), ITEM_ID=VALUES(ITEM_ID), SEED_URL=VALUES(SEED_URL), INFO=VALUES(INFO), STATUS_CODE=VALUES(STATUS_CODE), ERROR=VALUES(ERROR), ATTEMPTS=VALUES(ATTEMPTS), FAILED_AT=VALUES(FAILED_AT)",
+                                [(hashlib.sha256(url.encode()).hexdigest(), url, *values) for url, *values in dead_letters])
+
+    def get_dead_letters(self):
+        self.cursor.execute(f"SELECT URL, KIND, ITEM_ID, SEED_URL, INFO, STATUS_CODE, ERROR, ATTEMPTS, FAILED_AT FROM {self.config['TABLE']}_dead_letters ORDER BY FAILED_AT")
+        return self.cursor.fetchall()
+
+    def delete_dead_letters(self, failed_before: float = None):
+        if failed_before is None:
+            self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_dead_letters")
+        else:
+            self.cursor.execute(f"DELETE FROM {self.config['TABLE']}_dead_letters WHERE FAILED_AT<%s", (failed_before, ))
@@ -1,14 +1,271 @@
 import os
 import sys
-import seleniumwire.undetected_chromedriver as uc
+import re
+import queue
+import fnmatch
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import Union
+from urllib.parse import urlsplit
+from .config import RESOURCE_TYPE_EXTENSIONS
+
+try:
+    import seleniumwire.undetected_chromedriver as uc
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+except ImportError as e:
+    raise ImportError("selenium-wire and undetected-chromedriver are required for WebScraperChrome. Install them with pip install webscraperr[chrome]") from e
+
+logger = logging.getLogger(__name__)
+
+LEASE_POLL_INTERVAL = 1.0
+
+RESOURCE_TYPE_ACCEPT = {
+    'image': 'image/',
+    'stylesheet': 'text/css'
+}
+
+class RequestBlocker:
+    def __init__(self, config: dict):
+        resource_types = config.get('RESOURCE_TYPES') or []
+        self.extensions = tuple(extension for resource_type in resource_types for extension in RESOURCE_TYPE_EXTENSIONS[resource_type])
+        self.accept = tuple(RESOURCE_TYPE_ACCEPT[resource_type] for resource_type in resource_types if resource_type in RESOURCE_TYPE_ACCEPT)
+        self.domains = tuple(domain.lower().lstrip('.') for domain in config.get('DOMAINS') or [])
+        self.url_patterns = [re.compile(fnmatch.translate(pattern)) for pattern in config.get('URL_PATTERNS') or []]
+        self.blocked = 0
+
+    def __bool__(self):
+        return bool(self.extensions or self.domains or self.url_patterns)
+
+    def is_blocked(self, url: str, accept: str = ''):
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        if any(host == domain or host.endswith('.' + domain) for domain in self.domains):
+            return True
+        if self.extensions and parts.path.lower().endswith(self.extensions):
+            return True
+        if self.accept and accept and accept.startswith(self.accept):
+            return True
+        return any(pattern.match(url) for pattern in self.url_patterns)
+
+    def __call__(self, request):
+        if self.is_blocked(request.url, request.headers.get('Accept') or ''):
+            self.blocked += 1
+            request.abort()
+
+def get_seleniumwire_options(config: dict):
+    capture_config = config.get('CAPTURE') or {}
+    seleniumwire_options = {}
+    if capture_config.get('DISABLED'):
+        seleniumwire_options['disable_capture'] = True
+    elif capture_config.get('MAX_REQUESTS') is not None:
+        seleniumwire_options['request_storage'] = 'memory'
+        seleniumwire_options['request_storage_max_size'] = capture_config['MAX_REQUESTS']
+    return seleniumwire_options
     
 def get_driver(config: dict):
     driver = None
+    seleniumwire_options = get_seleniumwire_options(config)
     if config['OPTIONS']:
-        driver = uc.Chrome(options=config['OPTIONS'])
+        driver = uc.Chrome(options=config['OPTIONS'], seleniumwire_options=seleniumwire_options)
     else:
         options = uc.ChromeOptions()
         options.headless = False
-        driver = uc.Chrome(options=options)
+        driver = uc.Chrome(options=options, seleniumwire_options=seleniumwire_options)
+    request_blocker = RequestBlocker(config.get('BLOCK') or {})
+    if request_blocker:
+        driver.request_interceptor = request_blocker
     driver.maximize_window()
-    return driver
\ No newline at end of file
+    return driver
+
+DOM_SIGNATURE_SCRIPT = "return document.getElementsByTagName('*').length + ':' + (document.body ? document.body.innerHTML.length : 0)"
+
+def is_network_idle(driver: uc.Chrome, quiet_seconds: float):
+    now = datetime.now()
+    last_activity = None
+    for request in driver.requests:
+        if request.response is None:
+            return False
+        activity = request.response.date or request.date
+        if last_activity is None or activity > last_activity:
+            last_activity = activity
+    return last_activity is None or now - last_activity >= timedelta(seconds=quiet_seconds)
+
+def prepare_navigation(driver: uc.Chrome, config: dict):
+    ready_config = config.get('READY') or {}
+    if ready_config.get('NETWORK_IDLE') is not None:
+        del driver.requests
+
+def wait_until_ready(driver: uc.Chrome, config: dict):
+    ready_config = config.get('READY') or {}
+    selector = ready_config.get('SELECTOR')
+    network_idle = ready_config.get('NETWORK_IDLE')
+    dom_stable = ready_config.get('DOM_STABLE')
+    if selector is None and network_idle is None and dom_stable is None:
+        if config.get('AFTER_GET_DELAY') is not None:
+            time.sleep(config['AFTER_GET_DELAY'])
+        return True
+    timeout = ready_config.get('TIMEOUT', 10)
+    poll_interval = ready_config.get('POLL_INTERVAL', 0.1)
+    start = time.monotonic()
+    dom_signature = None
+    dom_changed_at = start
+    while True:
+        now = time.monotonic()
+        ready = True
+        if selector is not None:
+            ready = len(driver.find_elements(By.CSS_SELECTOR, selector)) > 0
+        if ready and network_idle is not None:
+            ready = is_network_idle(driver, network_idle)
+        if dom_stable is not None:
+            signature = driver.execute_script(DOM_SIGNATURE_SCRIPT)
+            if signature != dom_signature:
+                dom_signature = signature
+                dom_changed_at = now
+            ready = ready and now - dom_changed_at >= dom_stable
+        if ready:
+            logger.debug("PAGE READY AFTER %.2f SECONDS %s", now - start, driver.current_url)
+            return True
+        if now - start >= timeout:
+            logger.warning("PAGE NOT READY AFTER %.1f SECONDS %s", timeout, driver.current_url)
+            return False
+        time.sleep(poll_interval)
+
+def get_driver_memory_mb(driver: uc.Chrome) -> Union[float, None]:
+    pid = getattr(driver, 'browser_pid', None)
+    if pid is None or not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f'/proc/{current}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        pids.extend(children.get(current, []))
+    return total / (1024 * 1024)
+
+class ChromeDriverPool:
+    def __init__(self, config: dict):
+        self.config = config
+        pool_config = config.get('POOL') or {}
+        self.size = pool_config.get('SIZE', 1)
+        self.max_pages = pool_config.get('MAX_PAGES')
+        self.max_memory_mb = pool_config.get('MAX_MEMORY_MB')
+        self.memory_check_pages = pool_config.get('MEMORY_CHECK_PAGES', 10)
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.pages = {}
+        self.memory_checked = {}
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        try:
+            for _ in range(self.size):
+                self.idle.put(self._launch())
+        except:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _launch(self):
+        driver = get_driver(self.config)
+        with self.lock:
+            self.drivers.append(driver)
+            self.pages[id(driver)] = 0
+            self.memory_checked[id(driver)] = 0
+        return driver
+
+    def _quit(self, driver: uc.Chrome):
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+            self.pages.pop(id(driver), None)
+            self.memory_checked.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            logger.exception("FAILED TO QUIT CHROME DRIVER")
+
+    @contextmanager
+    def lease(self):
+        while True:
+            with self.lock:
+                if not self.drivers:
+                    raise WebDriverException("No chrome drivers available.")
+            try:
+                driver = self.idle.get(timeout=LEASE_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if not healthy or not self.is_healthy(driver):
+                self._quit(driver)
+                try:
+                    driver = self._launch()
+                except Exception:
+                    logger.exception("FAILED TO LAUNCH CHROME DRIVER")
+                    driver = None
+            if driver is not None:
+                self.idle.put(driver)
+
+    def record_page(self, driver: uc.Chrome):
+        with self.lock:
+            self.pages[id(driver)] = self.pages.get(id(driver), 0) + 1
+
+    def should_check_memory(self, driver: uc.Chrome):
+        with self.lock:
+            pages = self.pages.get(id(driver), 0)
+            if pages - self.memory_checked.get(id(driver), 0) < self.memory_check_pages:
+                return False
+            self.memory_checked[id(driver)] = pages
+        return True
+
+    def is_healthy(self, driver: uc.Chrome):
+        if self.max_pages is not None and self.pages.get(id(driver), 0) >= self.max_pages:
+            logger.info("RECYCLING CHROME DRIVER AFTER %d PAGES", self.pages[id(driver)])
+            return False
+        if self.max_memory_mb is not None and self.should_check_memory(driver):
+            memory_mb = get_driver_memory_mb(driver)
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                logger.info("RECYCLING CHROME DRIVER USING %.0f MB", memory_mb)
+                return False
+        try:
+            driver.current_url
+        except WebDriverException:
+            logger.error("CHROME DRIVER NOT RESPONDING")
+            return False
+        return True
+
+    def close(self):
+        with self.lock:
+            drivers = list(self.drivers)
+        for driver in drivers:
+            self._quit(driver)
+        while not self.idle.empty():
+            self.idle.get_nowait()
@@ -0,0 +1,209 @@
+import argparse
+import csv
+import json
+import logging
+import time
+from enum import StrEnum
+from .config import get_default_config, validate_config
+from .db import DBTypes, ItemsFilterByInfo, ALL_COLUMNS, get_db_class_by_config, get_db_pool_by_config, iter_chunks_by_filter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+class ExportFormats(StrEnum):
+    JSONL = 'JSONL'
+    CSV = 'CSV'
+    PARQUET = 'PARQUET'
+    ARROW = 'ARROW'
+
+def json_loads(data):
+    if data is None:
+        return None
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False)
+
+def get_info_text(row):
+    info = row['INFO']
+    if isinstance(info, (bytes, bytearray)):
+        info = info.decode()
+    return info
+
+def flatten_row(row):
+    info = json_loads(get_info_text(row)) or {}
+    if not isinstance(info, dict):
+        info = {'INFO': info}
+    flat = {'ID': row['ID'], 'URL': row['URL']}
+    for key, value in info.items():
+        while key in flat:
+            key = f"INFO.{key}"
+        flat[key] = value
+    return flat
+
+class JSONLWriter:
+    COLLECTS_COLUMNS = False
+
+    def __init__(self, path: str):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_chunk(self, rows: list):
+        self.file.write("".join(
+            f'{{"ID": {row["ID"]}, "URL": {json_dumps(row["URL"])}, "INFO": {get_info_text(row) or "null"}}}\n'
+            for row in rows
+        ))
+
+    def close(self):
+        self.file.close()
+
+class CSVWriter:
+    COLLECTS_COLUMNS = True
+
+    def __init__(self, path: str):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.fieldnames = {}
+        self.writer: csv.DictWriter = None
+
+    def collect_columns(self, rows: list):
+        for row in rows:
+            self.fieldnames.update(dict.fromkeys(flatten_row(row)))
+
+    def write_chunk(self, rows: list):
+        records = [flatten_row(row) for row in rows]
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(self.fieldnames), extrasaction='raise')
+            self.writer.writeheader()
+        self.writer.writerows(
+            {key: json_dumps(value) if isinstance(value, (dict, list)) else value for key, value in record.items()}
+            for record in records
+        )
+
+    def close(self):
+        self.file.close()
+
+class ArrowWriter:
+    COLLECTS_COLUMNS = True
+
+    def __init__(self, path: str, export_format: ExportFormats):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to export to Parquet or Arrow. Install it with pip install webscraperr[export]")
+        self.path = path
+        self.export_format = export_format
+        self.schema: pyarrow.Schema = None
+        self.writer = None
+
+    def collect_columns(self, rows: list):
+        schema = pyarrow.schema(list(pyarrow.array([flatten_row(row) for row in rows]).type))
+        try:
+            self.schema = schema if self.schema is None else pyarrow.unify_schemas([self.schema, schema])
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as e:
+            raise ValueError(f"Items from ID {rows[0]['ID']} do not match the schema of the previous items: {e}") from e
+
+    def get_schema(self):
+        schema = self.schema
+        for i, field in enumerate(schema):
+            if pyarrow.types.is_null(field.type):
+                schema = schema.set(i, field.with_type(pyarrow.string()))
+            elif pyarrow.types.is_list(field.type) and pyarrow.types.is_null(field.type.value_type):
+                schema = schema.set(i, field.with_type(pyarrow.list_(pyarrow.string())))
+        return schema
+
+    def write_chunk(self, rows: list):
+        records = [flatten_row(row) for row in rows]
+        if self.writer is None:
+            self.schema = self.get_schema()
+            if self.export_format == ExportFormats.PARQUET:
+                self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+        extra = {key for record in records for key in record}.difference(self.schema.names)
+        if extra:
+            raise ValueError(f"Items from ID {rows[0]['ID']} have keys that are not in the schema: {', '.join(sorted(extra))}")
+        try:
+            table = pyarrow.Table.from_pylist(records, schema=self.schema)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as e:
+            raise ValueError(f"Items from ID {rows[0]['ID']} do not match the schema of the export: {e}") from e
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def get_writer(path: str, export_format: ExportFormats):
+    match export_format:
+        case ExportFormats.JSONL:
+            return JSONLWriter(path)
+        case ExportFormats.CSV:
+            return CSVWriter(path)
+        case ExportFormats.PARQUET | ExportFormats.ARROW:
+            return ArrowWriter(path, export_format)
+        case _:
+            raise ValueError("Invalid ExportFormats value")
+
+def export_items(database_config: dict, path: str, export_format: ExportFormats = ExportFormats.JSONL,
+                 items_filter: ItemsFilterByInfo = ItemsFilterByInfo.WITH_INFO, chunk_size: int = None):
+    pool = get_db_pool_by_config(database_config)
+    db_class = get_db_class_by_config(database_config, pool)
+    writer = get_writer(path, export_format)
+    exported = 0
+    try:
+        if writer.COLLECTS_COLUMNS:
+            for rows in iter_chunks_by_filter(db_class, database_config, items_filter, ALL_COLUMNS, chunk_size):
+                writer.collect_columns(rows)
+        for rows in iter_chunks_by_filter(db_class, database_config, items_filter, ALL_COLUMNS, chunk_size):
+            writer.write_chunk(rows)
+            exported += len(rows)
+    finally:
+        writer.close()
+        pool.close()
+    logger.info("EXPORTED %d ITEMS TO %s", exported, path)
+    return exported
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='webscraperr-export', description="Export the items table to JSONL, CSV, Parquet or Arrow")
+    parser.add_argument('output', help="Output file")
+    parser.add_argument('--format', choices=[i.lower() for i in ExportFormats], default='jsonl')
+    parser.add_argument('--type', choices=[i.lower() for i in DBTypes], default='sqlite')
+    parser.add_argument('--database', required=True, help="SQLite file or MySQL database name")
+    parser.add_argument('--table', default='items')
+    parser.add_argument('--user', default='')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='')
+    parser.add_argument('--filter', choices=[i.name.lower() for i in ItemsFilterByInfo], default='with_info')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args(args)
+
+    config = get_default_config()
+    config['DATABASE']['TYPE'] = DBTypes(args.type.upper())
+    config['DATABASE']['DATABASE'] = args.database
+    config['DATABASE']['TABLE'] = args.table
+    config['DATABASE']['AUTH'] = {
+        'user': args.user,
+        'password': args.password,
+        'host': args.host,
+        'database': args.database
+    }
+    validate_config(config)
+    start = time.perf_counter()
+    exported = export_items(config['DATABASE'], args.output, ExportFormats(args.format.upper()),
+                            ItemsFilterByInfo[args.filter.upper()], args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {exported} items to {args.output} in {elapsed:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import os
+import json
+import threading
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+class PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = self.server.metrics.to_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class PrometheusExporter:
+    def __init__(self, metrics, host: str, port: int):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server: ThreadingHTTPServer = None
+        self.thread: threading.Thread = None
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), PrometheusHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = self.metrics
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info("METRICS SERVED ON http://%s:%d/metrics", self.host, self.server.server_address[1])
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+class JSONExporter:
+    def __init__(self, metrics, path: str, interval: float):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.closed = threading.Event()
+        self.thread: threading.Thread = None
+
+    def start(self):
+        self.closed.clear()
+        self.thread = threading.Thread(target=self._write_periodically, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.closed.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.write()
+
+    def write(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _write_periodically(self):
+        while not self.closed.wait(self.interval):
+            try:
+                self.write()
+            except Exception:
+                logger.exception("METRICS WRITE FAILED %s", self.path)
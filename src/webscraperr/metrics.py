@@ -0,0 +1,296 @@
+import os
+import bisect
+import json
+import time
+import threading
+import logging
+import importlib.util
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+NULL_TIMER = nullcontext()
+
+METRICS_STAGES = ['RATE_LIMIT', 'FETCH', 'READY', 'PARSE', 'SAVE']
+
+STAGE_METRICS = {stage: f"{stage.lower()}_seconds" for stage in METRICS_STAGES}
+
+def get_metric_key(name: str, labels: dict):
+    if not labels:
+        return (name, ())
+    return (name, tuple(sorted(labels.items())))
+
+def format_metric_key(key: tuple, quote: bool = False):
+    name, labels = key
+    if not labels:
+        return name
+    if quote:
+        return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+    return name + "{" + ",".join(f"{label}={value}" for label, value in labels) + "}"
+
+class Histogram:
+    def __init__(self, buckets: list):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float):
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self):
+        return {
+            'COUNT': self.count,
+            'SUM': self.sum,
+            'MEAN': self.sum / self.count if self.count else None,
+            'MAX': self.max,
+            'P50': self.quantile(0.5),
+            'P99': self.quantile(0.99)
+        }
+
+class StageProfiler:
+    def __init__(self, profiler_type: str, path: str):
+        if profiler_type == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+            raise ImportError("pyinstrument is required for METRICS PROFILE 'pyinstrument'. Install it with pip install webscraperr[profile]")
+        self.profiler_type = profiler_type
+        self.path = path
+        self.local = threading.local()
+        self.profilers = []
+        self.lock = threading.Lock()
+
+    def get_profiler(self):
+        profiler = getattr(self.local, 'profiler', None)
+        if profiler is None:
+            if self.profiler_type == 'pyinstrument':
+                import pyinstrument
+                profiler = pyinstrument.Profiler(async_mode='disabled')
+            else:
+                import cProfile
+                profiler = cProfile.Profile()
+            self.local.profiler = profiler
+            with self.lock:
+                self.profilers.append(profiler)
+        return profiler
+
+    @contextmanager
+    def profile(self):
+        profiler = self.get_profiler()
+        if self.profiler_type == 'pyinstrument':
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+        else:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+
+    def dump(self):
+        with self.lock:
+            profilers = list(self.profilers)
+        if not profilers:
+            return
+        if self.profiler_type == 'pyinstrument':
+            with open(f"{self.path}.txt", 'w') as f:
+                for profiler in profilers:
+                    f.write(profiler.output_text(unicode=True))
+        else:
+            import pstats
+            stats = pstats.Stats(profilers[0])
+            for profiler in profilers[1:]:
+                stats.add(profiler)
+            stats.dump_stats(f"{self.path}.prof")
+        logger.info("PROFILE SAVED %s", self.path)
+
+class StageTimer:
+    __slots__ = ('metrics', 'name', 'profiler', 'start')
+
+    def __init__(self, metrics, name: str, profiler):
+        self.metrics = metrics
+        self.name = name
+        self.profiler = profiler
+
+    def __enter__(self):
+        if self.profiler is not None:
+            self.profiler = self.profiler.profile()
+            self.profiler.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        if self.profiler is not None:
+            self.profiler.__exit__(exc_type, exc_val, exc_tb)
+
+class Metrics:
+    def __init__(self, config: dict):
+        self.config = config
+        self.buckets = config.get('BUCKETS') or DEFAULT_BUCKETS
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.gauge_groups = {}
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.profilers = {}
+        if config.get('PROFILE'):
+            os.makedirs(config.get('PROFILE_DIR') or 'profiles', exist_ok=True)
+            for stage in config.get('PROFILE_STAGES') or []:
+                self.profilers[stage] = StageProfiler(config['PROFILE'], os.path.join(config.get('PROFILE_DIR') or 'profiles', stage.lower()))
+        self.exporter = None
+        if config.get('EXPORTER') == 'prometheus':
+            from .exporters import PrometheusExporter
+            self.exporter = PrometheusExporter(self, config.get('HOST') or '127.0.0.1', config.get('PORT', 9100))
+        elif config.get('EXPORTER') == 'json':
+            from .exporters import JSONExporter
+            self.exporter = JSONExporter(self, config.get('PATH') or 'metrics.json', config.get('INTERVAL', 10))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        self.started_at = time.time()
+        if self.exporter:
+            self.exporter.start()
+
+    def close(self):
+        if self.exporter:
+            self.exporter.close()
+        for profiler in self.profilers.values():
+            profiler.dump()
+        logger.info("METRICS %s", json.dumps(self.snapshot()['COUNTERS']))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = get_metric_key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = get_metric_key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def gauge(self, name: str, func, **labels):
+        with self.lock:
+            self.gauges[get_metric_key(name, labels)] = func
+
+    def gauge_group(self, prefix: str, func, label: str):
+        with self.lock:
+            self.gauge_groups[prefix] = (func, label)
+
+    def timer(self, stage: str):
+        return StageTimer(self, STAGE_METRICS.get(stage) or f"{stage.lower()}_seconds", self.profilers.get(stage))
+
+    def read_gauges(self):
+        with self.lock:
+            gauges = dict(self.gauges)
+            gauge_groups = dict(self.gauge_groups)
+        values = {}
+        for key, func in gauges.items():
+            try:
+                values[key] = func()
+            except Exception:
+                logger.exception("METRICS GAUGE FAILED %s", format_metric_key(key))
+        for prefix, (func, label) in gauge_groups.items():
+            try:
+                groups = func()
+            except Exception:
+                logger.exception("METRICS GAUGE FAILED %s", prefix)
+                continue
+            for label_value, group in groups.items():
+                for name, value in group.items():
+                    if value is not None:
+                        values[get_metric_key(f"{prefix}_{name.lower()}", {label: label_value})] = value
+        return values
+
+    def snapshot(self):
+        gauges = self.read_gauges()
+        with self.lock:
+            return {
+                'ELAPSED': time.time() - self.started_at,
+                'COUNTERS': {format_metric_key(key): value for key, value in self.counters.items()},
+                'HISTOGRAMS': {format_metric_key(key): histogram.summary() for key, histogram in self.histograms.items()},
+                'GAUGES': {format_metric_key(key): value for key, value in gauges.items()}
+            }
+
+    def to_prometheus(self):
+        gauges = self.read_gauges()
+        lines = []
+        with self.lock:
+            for key, value in sorted(self.counters.items()):
+                lines.append(f"webscraperr_{format_metric_key(key, quote=True)} {value}")
+            for key, value in sorted(gauges.items()):
+                lines.append(f"webscraperr_{format_metric_key(key, quote=True)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bucket, count in zip(self.buckets + ['+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f"webscraperr_{format_metric_key((name + '_bucket', labels + (('le', bucket),)), quote=True)} {cumulative}")
+                lines.append(f"webscraperr_{format_metric_key((name + '_sum', labels), quote=True)} {histogram.sum}")
+                lines.append(f"webscraperr_{format_metric_key((name + '_count', labels), quote=True)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+class NullMetrics:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def gauge(self, name: str, func, **labels):
+        pass
+
+    def gauge_group(self, prefix: str, func, label: str):
+        pass
+
+    def timer(self, stage: str):
+        return NULL_TIMER
+
+NULL_METRICS = NullMetrics()
+
+def get_metrics(config: dict):
+    if config and config.get('ENABLED'):
+        return Metrics(config)
+    return NULL_METRICS
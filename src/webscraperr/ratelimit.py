@@ -0,0 +1,119 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Union
+from urllib.parse import urlsplit
+
+BACKOFF_STATUS_CODES = (429, 503)
+MIN_RATE_FACTOR = 0.05
+RECOVERY_FACTOR = 1.1
+
+def parse_retry_after(value: Union[str, None]):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    def __init__(self, rate: Union[float, None], burst: int):
+        self.rate = rate
+        self.current_rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.last_wait = 0.0
+        self.total_wait = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.current_rate is not None:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.current_rate)
+                self.updated = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = max(wait, -self.tokens / self.current_rate)
+            self.requests += 1
+            self.last_wait = wait
+            self.total_wait += wait
+            return wait
+
+    def backoff(self, retry_after: Union[float, None]):
+        with self.lock:
+            self.throttled += 1
+            if self.current_rate is not None:
+                self.current_rate = max(self.rate * MIN_RATE_FACTOR, self.current_rate / 2)
+            delay = retry_after
+            if delay is None:
+                delay = 1 / self.current_rate if self.current_rate else 1.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def recover(self):
+        with self.lock:
+            if self.current_rate is not None and self.current_rate < self.rate:
+                self.current_rate = min(self.rate, self.current_rate * RECOVERY_FACTOR)
+
+class RateLimiter:
+    def __init__(self, config: dict):
+        rate_limit = config.get('RATE_LIMIT') or {}
+        self.rate = rate_limit.get('RATE')
+        if self.rate is None and config.get('REQUEST_DELAY'):
+            self.rate = 1 / config['REQUEST_DELAY']
+        self.burst = rate_limit.get('BURST', 1)
+        self.hosts = rate_limit.get('HOSTS') or {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, url: str):
+        host = urlsplit(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                host_config = self.hosts.get(host, {})
+                bucket = TokenBucket(host_config.get('RATE', self.rate), host_config.get('BURST', self.burst))
+                self.buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url: str):
+        return self.get_bucket(url).reserve()
+
+    def wait(self, url: str):
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def update(self, url: str, response):
+        bucket = self.get_bucket(url)
+        if response.status_code in BACKOFF_STATUS_CODES or 'Retry-After' in response.headers:
+            bucket.backoff(parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            bucket.recover()
+
+    def metrics(self):
+        with self.lock:
+            buckets = dict(self.buckets)
+        return {
+            host: {
+                'RATE': bucket.current_rate,
+                'REQUESTS': bucket.requests,
+                'THROTTLED': bucket.throttled,
+                'LAST_WAIT': bucket.last_wait,
+                'TOTAL_WAIT': bucket.total_wait
+            }
+            for host, bucket in buckets.items()
+        }
@@ -0,0 +1,71 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+DEFAULT_RETRY_STATUSES = [408, 429, 500, 502, 503, 504]
+
+class RetryQueue:
+    def __init__(self, config: dict):
+        config = config or {}
+        self.enabled = config.get('ENABLED', False)
+        self.max_attempts = config.get('MAX_ATTEMPTS', 3)
+        self.backoff = config.get('BACKOFF', 1.0)
+        self.max_backoff = config.get('MAX_BACKOFF', 60.0)
+        self.statuses = set(config.get('STATUSES', DEFAULT_RETRY_STATUSES))
+        self.attempts = {}
+        self.heap = []
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def is_retryable(self, status_code: int = None):
+        return status_code is None or status_code in self.statuses
+
+    def get_backoff(self, attempts: int, status_code: int = None):
+        if not self.enabled or not self.is_retryable(status_code) or attempts >= self.max_attempts:
+            return None
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def schedule(self, key: str, entry, status_code: int = None):
+        with self.lock:
+            attempts = self.attempts[key] = self.attempts.get(key, 0) + 1
+        delay = self.get_backoff(attempts, status_code)
+        if delay is None:
+            return None
+        with self.lock:
+            heapq.heappush(self.heap, (time.monotonic() + delay, next(self.counter), entry))
+        return delay
+
+    def pop_due(self):
+        with self.lock:
+            if self.heap and self.heap[0][0] <= time.monotonic():
+                return heapq.heappop(self.heap)[2]
+        return None
+
+    def pop_attempts(self, key: str):
+        with self.lock:
+            return self.attempts.pop(key, 1)
+
+    def get_wait(self, limit: float = None):
+        with self.lock:
+            wait = self.heap[0][0] - time.monotonic() if self.heap else limit or 0.0
+        return max(0.0, min(wait, limit) if limit is not None else wait)
+
+    def iter_with_retries(self, items):
+        exhausted = False
+        while True:
+            entry = self.pop_due()
+            if entry is None and not exhausted:
+                entry = next(items, None)
+                exhausted = entry is None
+            if entry is not None:
+                yield entry
+            elif not self.heap:
+                return
+            else:
+                time.sleep(self.get_wait())
@@ -0,0 +1,195 @@
+import os
+import json
+import math
+import struct
+import logging
+from array import array
+from .db import DBTypes, ItemsFilterByInfo, URL_COLUMNS, iter_chunks_by_filter, prepare_url
+from .urls import url_hash
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WSSEEN1\n'
+
+def get_database_id(database_config: dict):
+    if database_config['TYPE'] == DBTypes.MYSQL:
+        auth = database_config.get('AUTH') or {}
+        return f"MYSQL:{auth.get('host', '')}:{auth.get('port', 3306)}/{database_config['DATABASE']}"
+    return f"SQLITE:{os.path.abspath(database_config['DATABASE'])}"
+
+class HashedURLSet:
+    def __init__(self):
+        self.hashes = set()
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def contains(self, digest: bytes):
+        return int.from_bytes(digest[:8], 'little') in self.hashes
+
+    def add(self, digest: bytes):
+        key = int.from_bytes(digest[:8], 'little')
+        if key in self.hashes:
+            return False
+        self.hashes.add(key)
+        return True
+
+    def get_state(self):
+        return {}, array('Q', self.hashes).tobytes()
+
+    def load_state(self, header: dict, data: bytes):
+        hashes = array('Q')
+        hashes.frombytes(data)
+        self.hashes = set(hashes)
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def get_positions(self, digest: bytes):
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def contains(self, positions: list):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def add(self, positions: list):
+        for p in positions:
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+class ScalableBloomFilter:
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(capacity, error_rate * (1 - self.TIGHTENING))]
+
+    def __len__(self):
+        return sum(f.count for f in self.filters)
+
+    def contains(self, digest: bytes):
+        return any(f.contains(f.get_positions(digest)) for f in self.filters)
+
+    def add(self, digest: bytes):
+        if self.contains(digest):
+            return False
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * self.GROWTH, current.error_rate * self.TIGHTENING)
+            self.filters.append(current)
+        current.add(current.get_positions(digest))
+        return True
+
+    def get_state(self):
+        header = {'FILTERS': [[f.capacity, f.error_rate, f.count] for f in self.filters]}
+        return header, b"".join(bytes(f.bits) for f in self.filters)
+
+    def load_state(self, header: dict, data: bytes):
+        self.filters = []
+        offset = 0
+        for capacity, error_rate, count in header['FILTERS']:
+            f = BloomFilter(capacity, error_rate)
+            f.bits = bytearray(data[offset:offset + len(f.bits)])
+            f.count = count
+            offset += len(f.bits)
+            self.filters.append(f)
+
+class SeenURLIndex:
+    def __init__(self, db_class, database_config: dict):
+        self.db_class = db_class
+        self.database_config = database_config
+        self.config = database_config['SEEN_URLS']
+        self.path = self.config.get('PATH') or f"{database_config['TABLE']}.seen"
+        self.database_id = get_database_id(database_config)
+        self.index = self._new_index()
+        self.pending = set()
+        self.watermark = 0
+        self.skipped = 0
+
+    def _new_index(self):
+        if self.config.get('TYPE', 'SET') == 'BLOOM':
+            return ScalableBloomFilter(self.config.get('CAPACITY', 1000000), self.config.get('ERROR_RATE', 0.001))
+        return HashedURLSet()
+
+    def __len__(self):
+        return len(self.index)
+
+    def open(self):
+        with self.db_class(self.database_config) as conn:
+            max_id = conn.get_max_id()
+        self.load()
+        if self.watermark > max_id:
+            logger.info("SEEN URLS INDEX %s IS AHEAD OF THE TABLE, REBUILDING", self.path)
+            self.index = self._new_index()
+            self.watermark = 0
+        warmed = 0
+        for rows in iter_chunks_by_filter(self.db_class, self.database_config, ItemsFilterByInfo.ALL, URL_COLUMNS, last_id=self.watermark):
+            for row in rows:
+                self.index.add(url_hash(row['URL']))
+            warmed += len(rows)
+            self.watermark = rows[-1]['ID']
+        logger.info("SEEN URLS INDEX LOADED %d URLS, WARMED %d FROM THE TABLE", len(self.index), warmed)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                logger.warning("SEEN URLS INDEX %s IS INVALID, IGNORING IT", self.path)
+                return
+            header = json.loads(f.readline())
+            data = f.read()
+        if header['TYPE'] != self.config.get('TYPE', 'SET') or header['TABLE'] != self.database_config['TABLE']:
+            return
+        if header.get('DATABASE') != self.database_id:
+            logger.warning("SEEN URLS INDEX %s BELONGS TO %s, NOT %s, IGNORING IT", self.path, header.get('DATABASE'), self.database_id)
+            return
+        self.index.load_state(header, data)
+        self.watermark = header['WATERMARK']
+
+    def save(self):
+        with self.db_class(self.database_config) as conn:
+            self.watermark = max(self.watermark, conn.get_max_id())
+        header, data = self.index.get_state()
+        header.update({
+            'TYPE': self.config.get('TYPE', 'SET'),
+            'TABLE': self.database_config['TABLE'],
+            'DATABASE': self.database_id,
+            'WATERMARK': self.watermark
+        })
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        logger.info("SEEN URLS INDEX SAVED %d URLS, SKIPPED %d SEEN URLS", len(self.index), self.skipped)
+
+    def _get_digest(self, data):
+        return url_hash(prepare_url(self.database_config, data[0]))
+
+    def filter(self, datas: list):
+        unseen = []
+        for data in datas:
+            digest = self._get_digest(data)
+            if digest in self.pending or self.index.contains(digest):
+                continue
+            self.pending.add(digest)
+            unseen.append(data)
+        self.skipped += len(datas) - len(unseen)
+        return unseen
+
+    def mark(self, datas: list, saved: bool):
+        for data in datas:
+            digest = self._get_digest(data)
+            self.pending.discard(digest)
+            if saved:
+                self.index.add(digest)
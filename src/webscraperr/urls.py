@@ -0,0 +1,60 @@
+import re
+import hashlib
+from fnmatch import fnmatchcase
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_STRIP_PARAMS = ['utm_*', 'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl']
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+
+PERCENT_ENCODED = re.compile(r'%[0-9A-Fa-f]{2}')
+
+def url_hash(url: str):
+    return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+def normalize_percent_encoding(value: str):
+    def normalize(match):
+        char = chr(int(match.group(0)[1:], 16))
+        return char if char in UNRESERVED else match.group(0).upper()
+    return PERCENT_ENCODED.sub(normalize, value)
+
+def is_stripped_param(name: str, strip_params: list):
+    name = name.lower()
+    return any(fnmatchcase(name, pattern.lower()) for pattern in strip_params)
+
+def canonicalize_url(url: str, config: dict):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if parts.hostname:
+        host = parts.hostname.rstrip('.')
+        if ':' in host:
+            host = f"[{host}]"
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        userinfo = netloc.rpartition('@')[0]
+        netloc = f"{userinfo}@{host}" if userinfo else host
+
+    path = normalize_percent_encoding(parts.path) or ('/' if netloc else '')
+    if config.get('REMOVE_TRAILING_SLASH', False) and len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = parts.query
+    strip_params = config.get('STRIP_PARAMS', DEFAULT_STRIP_PARAMS)
+    sort_params = config.get('SORT_PARAMS', True)
+    if query and (strip_params or sort_params):
+        params = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True) if not is_stripped_param(name, strip_params)]
+        if sort_params:
+            params.sort(key=lambda param: param[0])
+        query = urlencode(params)
+
+    fragment = '' if config.get('REMOVE_FRAGMENT', True) else parts.fragment
+    return urlunsplit((scheme, netloc, path, query, fragment))
+
+def set_query_param(url: str, name: str, value):
+    parts = urlsplit(url)
+    params = [(key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+    params.append((name, str(value)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), parts.fragment))
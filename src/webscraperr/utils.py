@@ -1,4 +1,9 @@
+import os
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Callable, Dict
 from .db import get_db_class_by_config
+
 def load_urls(urls_file: str):
     with open(urls_file, 'r') as f:
         return f.read().split('\n')
@@ -7,4 +12,16 @@ def load_urls(urls_file: str):
 def save_urls(database_config: dict, urls: list):
     to_save_urls = [[i] for i in urls]
     with get_db_class_by_config(database_config)(database_config) as conn:
-        conn.save_urls(to_save_urls)
\ No newline at end of file
+        conn.save_urls(to_save_urls)
+
+def get_parse_workers(parse_workers: int = None):
+    return parse_workers or os.cpu_count() or 1
+
+def parse_raw_response(parse_info_func: Callable[[requests.Response], Dict], url: str, status_code: int, headers: dict, encoding: str, content: bytes):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = encoding
+    response._content = content
+    return parse_info_func(response)
@@ -0,0 +1,58 @@
+import threading
+import logging
+import pytest
+import webscraperr
+from webscraperr.config import get_default_config, validate_config
+from webscraperr.db import init_sqlite, get_db_class_by_config
+from benchmarks.fake_shop import FakeShop
+
+webscraperr.logger.setLevel(logging.CRITICAL)
+
+
+@pytest.fixture
+def shop():
+    with FakeShop(items=30, page_size=10, latency=0.0, page_weight=2) as shop:
+        yield shop
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    def make_config(database: dict = None, **scraper):
+        config = get_default_config()
+        config['DATABASE']['DATABASE'] = str(tmp_path / 'items.db')
+        config['DATABASE'].update(database or {})
+        config['SCRAPER']['CONCURRENCY'] = 4
+        config['SCRAPER']['RATE_LIMIT'] = {'RATE': 10000, 'BURST': 100}
+        config['SCRAPER'].update(scraper)
+        validate_config(config)
+        init_sqlite(config['DATABASE'])
+        return config
+    return make_config
+
+
+def save_urls(config: dict, urls: list):
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        conn.save_urls([[url] for url in urls])
+
+
+def get_items(config: dict):
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        return [dict(row) for row in conn.get_all()]
+
+
+def run_with_timeout(func, *args, timeout: float = 30):
+    result = {}
+
+    def target():
+        try:
+            result['VALUE'] = func(*args)
+        except BaseException as e:
+            result['ERROR'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{getattr(func, '__name__', func)} did not finish within {timeout}s"
+    if 'ERROR' in result:
+        raise result['ERROR']
+    return result.get('VALUE')
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+import webscraperr
+from .conftest import save_urls
+from .test_scrapers import get_scraper
+
+
+def content_length_parse_info_func(response):
+    return {'length': len(response.content)}
+
+
+def test_import_does_not_load_archive():
+    code = "import sys, webscraperr; print(sorted({'zstandard', 'webscraperr.archive'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', code], env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_archived_responses_are_reparsed(shop, make_config, tmp_path):
+    config = make_config(ARCHIVE={'ENABLED': True, 'PATH': str(tmp_path / 'archive'), 'COMPRESSION': 'gzip'})
+    save_urls(config, [f"{shop.base_url}/item/{i}" for i in range(3)])
+    with get_scraper(webscraperr.WebScraperRequest, config) as scraper:
+        scraper.scrape_items_infos()
+        requests_made = sum(shop.server.attempts.values())
+        assert scraper.reparse(content_length_parse_info_func) == 3
+    assert sum(shop.server.attempts.values()) == requests_made
@@ -0,0 +1,53 @@
+import json
+import pytest
+from webscraperr.buffer import WriteBuffer
+from webscraperr.db import WebScraperDBSqlite, get_db_class_by_config
+from .conftest import get_items
+
+
+@pytest.fixture
+def buffer(make_config):
+    config = make_config()
+    config['DATABASE']['BUFFER'] = {'SIZE': 1000, 'INTERVAL': None}
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.save_urls([[f"http://localhost/item/{i}"] for i in range(3)])
+        conn.set_info_by_id(2, 'not json')
+    return WriteBuffer(get_db_class_by_config(config['DATABASE']), config['DATABASE'])
+
+
+def get_dead_letters(buffer):
+    with buffer.db_class(buffer.config) as conn:
+        return [dict(row) for row in conn.get_dead_letters()]
+
+
+def test_bad_row_does_not_block_the_buffer(buffer):
+    buffer.merge_info(1, json.dumps({'a': 1}))
+    buffer.merge_info(2, json.dumps({'a': 2}))
+    buffer.merge_info(3, json.dumps({'a': 3}))
+    buffer.flush()
+    assert len(buffer) == 0
+    infos = {item['ID']: item['INFO'] for item in get_items({'DATABASE': buffer.config})}
+    assert json.loads(infos[1]) == {'a': 1}
+    assert infos[2] == 'not json'
+    assert json.loads(infos[3]) == {'a': 3}
+    dead_letters = get_dead_letters(buffer)
+    assert [(row['URL'], row['ITEM_ID']) for row in dead_letters] == [("http://localhost/item/1", 2)]
+    assert dead_letters[0]['ERROR'].startswith("WRITE FAILED")
+
+    buffer.set_info(1, json.dumps({'b': 1}))
+    buffer.flush()
+    assert json.loads(get_items({'DATABASE': buffer.config})[0]['INFO']) == {'b': 1}
+
+
+def test_rows_are_kept_when_the_database_is_unavailable(buffer, monkeypatch):
+    def unavailable(self):
+        raise RuntimeError("database is down")
+
+    buffer.set_info(1, json.dumps({'a': 1}))
+    with monkeypatch.context() as patch:
+        patch.setattr(WebScraperDBSqlite, '__enter__', unavailable)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+    assert len(buffer) == 1
+    buffer.flush()
+    assert json.loads(get_items({'DATABASE': buffer.config})[0]['INFO']) == {'a': 1}
@@ -0,0 +1,39 @@
+import json
+import pytest
+import webscraperr
+from webscraperr.db import WebScraperDBSqlite, ItemsFilterByInfo
+from .conftest import save_urls, get_items
+from .test_scrapers import SCRAPERS, get_scraper
+
+
+def test_cache_is_written_after_info(shop, make_config, tmp_path, monkeypatch):
+    config = make_config(HTTP_CACHE={'ENABLED': True, 'PATH': str(tmp_path / 'cache.db')})
+    url = f"{shop.base_url}/item/1"
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.save_url_and_info(url, json.dumps({'seen': True}))
+
+    def broken_merge_info_many(self, ids_partials, overwrite=True):
+        raise RuntimeError("killed before the flush")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(WebScraperDBSqlite, 'merge_info_many', broken_merge_info_many)
+        with get_scraper(webscraperr.WebScraperRequest, config) as scraper:
+            scraper.scrape_items_infos(update=True, items_filter=ItemsFilterByInfo.ALL)
+            assert scraper.http_cache.get(url) is None
+
+    with get_scraper(webscraperr.WebScraperRequest, config) as scraper:
+        scraper.scrape_items_infos(update=True, items_filter=ItemsFilterByInfo.ALL)
+        assert scraper.http_cache.get(url) is not None
+    assert json.loads(get_items(config)[0]['INFO']) == {'seen': True, 'name': 'Product 1', 'price': '$79.19', 'variants': 2}
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_unchanged_responses_are_revalidated(scraper_class, shop, make_config, tmp_path):
+    config = make_config(HTTP_CACHE={'ENABLED': True, 'PATH': str(tmp_path / 'cache.db')}, METRICS={'ENABLED': True})
+    save_urls(config, [f"{shop.base_url}/item/{i}" for i in range(5)])
+    with get_scraper(scraper_class, config) as scraper:
+        scraper.scrape_items_infos()
+        scraper.scrape_items_infos(update=True, items_filter=ItemsFilterByInfo.ALL)
+        counters = scraper.metrics.snapshot()['COUNTERS']
+    assert counters['items_unchanged_total'] == 5
+    assert all(item['INFO'] is not None for item in get_items(config))
@@ -0,0 +1,118 @@
+import json
+import time
+import webscraperr
+import webscraperr.db as db_module
+from benchmarks.bench_workflow import get_items_urls_func, get_next_page_func
+from webscraperr.db import MySQLPool, WebScraperDBSqlite, migrate_to_hashed_schema
+
+
+class FakeConnection:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+class FakeConnector:
+    def __init__(self):
+        self.connections = []
+
+    def connect(self, **auth):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+
+def test_mysql_pool_reuses_and_closes_connections(monkeypatch):
+    connector = FakeConnector()
+    monkeypatch.setattr(db_module, 'import_mysql_connector', lambda: connector)
+    pool = MySQLPool({'POOL_SIZE': 2, 'AUTH': {}})
+    first = pool.get_connection()
+    second = pool.get_connection()
+    pool.release(first)
+    assert pool.get_connection() is first
+    pool.release(first)
+    first.connected = False
+    third = pool.get_connection()
+    assert third is not first
+    pool.release(third)
+    pool.close()
+    assert len(connector.connections) == 3
+    assert not any(conn.is_connected() for conn in connector.connections if conn is not second)
+    assert second.is_connected()
+    pool.release(second)
+    assert not second.is_connected()
+
+
+def test_migrate_to_hashed_schema_merges_duplicates(make_config):
+    config = make_config(database={'CANONICALIZE': {'ENABLED': True}})
+    database_config = config['DATABASE']
+    with WebScraperDBSqlite(database_config) as conn:
+        conn.cursor.executemany("INSERT INTO items(URL, INFO) VALUES(?, ?)", [
+            ("https://ex.com/p1?utm_source=a", None),
+            ("https://ex.com/p1#x", json.dumps({'a': 1})),
+            ("https://ex.com/p2?b=1&a=2", None),
+            ("https://EX.com/p2?a=2&b=1", None),
+        ])
+    database_config['SCHEMA_VERSION'] = 2
+    assert migrate_to_hashed_schema(database_config) == 2
+    with WebScraperDBSqlite(database_config) as conn:
+        rows = [dict(row) for row in conn.get_all()]
+        assert [(row['URL'], row['INFO']) for row in rows] == [("https://ex.com/p1", '{"a": 1}'), ("https://ex.com/p2?a=2&b=1", None)]
+        conn.save_urls([["https://ex.com/p1?gclid=9"]])
+        assert conn.get_count() == 2
+        assert dict(conn.get_by_url("https://ex.com/p2?b=1&a=2#q"))['ID'] == rows[1]['ID']
+        conn.cursor.execute("SELECT COUNT(*) FROM items_v1")
+        assert conn.cursor.fetchone()[0] == 4
+
+
+def test_frontier_leases_and_fails_after_max_attempts(make_config, monkeypatch):
+    config = make_config(database={'FRONTIER': {'ENABLED': True, 'MAX_ATTEMPTS': 2, 'LEASE_SECONDS': 60}})
+    database_config = config['DATABASE']
+    with WebScraperDBSqlite(database_config) as conn:
+        conn.save_urls([[f"https://ex.com/p{k}"] for k in range(3)])
+        conn.enqueue_items()
+        first = [row['ID'] for row in conn.claim_items('a', 2)]
+        assert first == [1, 2]
+        assert [row['ID'] for row in conn.claim_items('b', 2)] == [3]
+        assert conn.claim_items('b', 2) == []
+        conn.complete_items([3])
+        conn.fail_items([(1, "HTTP 500")])
+        assert conn.get_frontier_stats() == {'PENDING': 1, 'IN_PROGRESS': 1, 'DONE': 1}
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 120)
+        assert [row['ID'] for row in conn.claim_items('b', 5)] == [1, 2]
+        conn.fail_items([(1, "HTTP 500")])
+        monkeypatch.setattr(time, 'time', lambda: now + 240)
+        assert conn.claim_items('c', 5) == []
+        assert conn.get_frontier_stats() == {'FAILED': 2, 'DONE': 1}
+
+
+def test_merge_info_keeps_nulls(make_config):
+    config = make_config()
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.save_url_and_info_many([["https://ex.com/p1", json.dumps({'price': 1, 'sale': None, 'sizes': {'s': 1}})]])
+        conn.save_urls([["https://ex.com/p2"]])
+        conn.merge_info_many([(1, json.dumps({'price': None, 'sizes': {'m': 2}, 'it\'s "q"': 1}))])
+        conn.merge_info_many([(1, json.dumps({'sale': True, 'name': 'a'})), (2, json.dumps({'name': None}))], overwrite=False)
+        assert json.loads(conn.get_by_id(1)['INFO']) == {'price': None, 'sale': None, 'sizes': {'m': 2}, 'it\'s "q"': 1, 'name': 'a'}
+        assert json.loads(conn.get_by_id(2)['INFO']) == {'name': None}
+
+
+def test_sqlite_pool_reuses_connections_across_threads(shop, make_config):
+    config = make_config()
+    scraper = webscraperr.WebScraperRequest(config)
+    scraper.get_items_urls_func = get_items_urls_func
+    scraper.get_next_page_func = get_next_page_func
+    counts = []
+    with scraper:
+        for _ in range(5):
+            scraper.scrape_items_urls([shop.catalogue_url])
+            counts.append(len(scraper.db_pool.connections))
+        assert len(scraper.db_pool.idle) == counts[-1]
+    assert max(counts) <= config['SCRAPER']['CONCURRENCY'] + 2
+    assert scraper.db_pool.connections == []
@@ -0,0 +1,74 @@
+import threading
+import pytest
+
+pytest.importorskip('seleniumwire')
+from selenium.common.exceptions import WebDriverException
+import webscraperr.driver as driver_module
+from webscraperr.driver import ChromeDriverPool
+from .conftest import run_with_timeout
+
+
+class FakeDriver:
+    def __init__(self):
+        self.browser_pid = None
+
+    @property
+    def current_url(self):
+        return 'about:blank'
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def launches(monkeypatch):
+    launches = {'FAIL': False, 'COUNT': 0}
+
+    def get_driver(config):
+        if launches['FAIL']:
+            raise WebDriverException("chrome did not start")
+        launches['COUNT'] += 1
+        return FakeDriver()
+
+    monkeypatch.setattr(driver_module, 'get_driver', get_driver)
+    monkeypatch.setattr(driver_module, 'LEASE_POLL_INTERVAL', 0.05)
+    return launches
+
+
+def test_waiting_lease_raises_when_last_driver_cannot_be_relaunched(launches):
+    with ChromeDriverPool({'POOL': {'SIZE': 1}}) as pool:
+        leased = threading.Event()
+        release = threading.Event()
+
+        def crash():
+            try:
+                with pool.lease():
+                    leased.set()
+                    release.wait()
+                    raise WebDriverException("crashed")
+            except WebDriverException:
+                pass
+
+        def wait_for_driver():
+            with pool.lease():
+                pass
+
+        crasher = threading.Thread(target=crash)
+        crasher.start()
+        leased.wait()
+        launches['FAIL'] = True
+        threading.Timer(0.2, release.set).start()
+        with pytest.raises(WebDriverException, match="No chrome drivers available"):
+            run_with_timeout(wait_for_driver, timeout=5)
+        crasher.join()
+
+
+def test_memory_is_sampled_every_n_pages(launches, monkeypatch):
+    samples = []
+    monkeypatch.setattr(driver_module, 'get_driver_memory_mb', lambda driver: samples.append(driver) or 1.0)
+    with ChromeDriverPool({'POOL': {'SIZE': 1, 'MAX_MEMORY_MB': 100, 'MEMORY_CHECK_PAGES': 5}}) as pool:
+        for _ in range(12):
+            with pool.lease() as driver:
+                pool.record_page(driver)
+    assert len(samples) == 2
+    assert launches['COUNT'] == 1
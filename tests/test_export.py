@@ -0,0 +1,60 @@
+import csv
+import json
+import pytest
+from webscraperr.db import get_db_class_by_config
+from webscraperr.export import ExportFormats, export_items
+
+pyarrow = pytest.importorskip('pyarrow')
+import pyarrow.ipc
+import pyarrow.parquet
+
+
+@pytest.fixture
+def config(make_config):
+    config = make_config()
+    infos = [{'a': 1}, {'a': 2}, {'a': 3, 'b': 'late'}, {'c': [1, 2]}, {'a': None}]
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        conn.save_url_and_info_many([[f"http://localhost/item/{i}", json.dumps(info)] for i, info in enumerate(infos)])
+    return config
+
+
+def test_csv_has_keys_of_later_chunks(config, tmp_path):
+    path = tmp_path / 'items.csv'
+    assert export_items(config['DATABASE'], str(path), ExportFormats.CSV, chunk_size=2) == 5
+    with open(path, newline='') as f:
+        records = list(csv.DictReader(f))
+    assert list(records[0]) == ['ID', 'URL', 'a', 'b', 'c']
+    assert records[2]['b'] == 'late'
+    assert json.loads(records[3]['c']) == [1, 2]
+
+
+@pytest.mark.parametrize('export_format', [ExportFormats.PARQUET, ExportFormats.ARROW])
+def test_arrow_has_keys_of_later_chunks(config, tmp_path, export_format):
+    path = tmp_path / 'items.out'
+    assert export_items(config['DATABASE'], str(path), export_format, chunk_size=2) == 5
+    if export_format == ExportFormats.PARQUET:
+        table = pyarrow.parquet.read_table(path)
+    else:
+        table = pyarrow.ipc.open_file(path).read_all()
+    assert table.column_names == ['ID', 'URL', 'a', 'b', 'c']
+    assert table.column('b').to_pylist() == [None, None, 'late', None, None]
+    assert table.column('c').to_pylist() == [None, None, None, [1, 2], None]
+
+
+def test_arrow_type_conflict_raises(make_config, tmp_path):
+    config = make_config()
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        conn.save_url_and_info_many([["http://localhost/item/1", '{"a": 1}'], ["http://localhost/item/2", '{"a": "x"}']])
+    with pytest.raises(ValueError):
+        export_items(config['DATABASE'], str(tmp_path / 'items.parquet'), ExportFormats.PARQUET, chunk_size=1)
+
+
+def test_info_keys_do_not_overwrite_item_columns(make_config, tmp_path):
+    config = make_config()
+    with get_db_class_by_config(config['DATABASE'])(config['DATABASE']) as conn:
+        conn.save_url_and_info_many([["http://localhost/item/9", json.dumps({'ID': 'SKU-9', 'URL': 'http://cdn/img.png'})]])
+    path = tmp_path / 'items.csv'
+    export_items(config['DATABASE'], str(path), ExportFormats.CSV)
+    with open(path, newline='') as f:
+        records = list(csv.DictReader(f))
+    assert records == [{'ID': '1', 'URL': "http://localhost/item/9", 'INFO.ID': 'SKU-9', 'INFO.URL': 'http://cdn/img.png'}]
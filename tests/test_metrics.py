@@ -0,0 +1,17 @@
+from urllib.parse import urlsplit
+import webscraperr
+from .conftest import save_urls
+from .test_scrapers import get_scraper
+
+
+def test_rate_limiter_state_is_exported_per_host(shop, make_config):
+    config = make_config(METRICS={'ENABLED': True})
+    save_urls(config, [f"{shop.base_url}/item/{i}" for i in range(5)])
+    host = urlsplit(shop.base_url).netloc
+    with get_scraper(webscraperr.WebScraperRequest, config) as scraper:
+        scraper.scrape_items_infos()
+        snapshot = scraper.metrics.snapshot()
+        prometheus = scraper.metrics.to_prometheus()
+    assert snapshot['GAUGES'][f"rate_limit_requests{{host={host}}}"] == 5
+    assert snapshot['GAUGES'][f"rate_limit_rate{{host={host}}}"] == 10000
+    assert f'webscraperr_rate_limit_requests{{host="{host}"}} 5' in prometheus.splitlines()
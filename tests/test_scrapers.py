@@ -0,0 +1,145 @@
+import json
+import pytest
+import webscraperr
+from webscraperr.db import WebScraperDBSqlite
+from benchmarks.bench_workflow import get_items_urls_func, get_next_page_func, parse_info_func
+from .conftest import save_urls, get_items, run_with_timeout
+
+SCRAPERS = [webscraperr.WebScraperRequest, webscraperr.AsyncWebScraperRequest, webscraperr.PipelineWebScraperRequest]
+
+
+def raising_parse_info_func(response):
+    raise RuntimeError("broken parser")
+
+
+def unserializable_parse_info_func(response):
+    return {'tags': {'a', 'b'}}
+
+
+def get_scraper(scraper_class, config: dict, parse_info=parse_info_func):
+    scraper = scraper_class(config)
+    scraper.get_items_urls_func = get_items_urls_func
+    scraper.get_next_page_func = get_next_page_func
+    scraper.parse_info_func = parse_info
+    return scraper
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_scrape_items(scraper_class, shop, make_config):
+    config = make_config()
+    with get_scraper(scraper_class, config) as scraper:
+        scraper.scrape_items_urls([shop.catalogue_url])
+        scraper.scrape_items_infos()
+    items = get_items(config)
+    assert len(items) == 30
+    assert all(item['INFO'] is not None for item in items)
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_raising_parser_propagates(scraper_class, shop, make_config):
+    config = make_config(QUEUE_SIZE=1)
+    save_urls(config, [f"{shop.base_url}/item/{i}" for i in range(30)])
+    with get_scraper(scraper_class, config, raising_parse_info_func) as scraper:
+        with pytest.raises(RuntimeError, match="broken parser"):
+            run_with_timeout(scraper.scrape_items_infos)
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_unserializable_info_propagates(scraper_class, shop, make_config):
+    config = make_config(QUEUE_SIZE=1, PARSE_QUEUE_SIZE=1, WRITE_QUEUE_SIZE=1)
+    save_urls(config, [f"{shop.base_url}/item/{i}" for i in range(30)])
+    with get_scraper(scraper_class, config, unserializable_parse_info_func) as scraper:
+        with pytest.raises(TypeError):
+            run_with_timeout(scraper.scrape_items_infos)
+
+
+@pytest.mark.parametrize('probe_last_page', [False, True])
+def test_failing_numbered_pages_stop(probe_last_page, shop, make_config):
+    shop.server.error_rate = 1.0
+    config = make_config(PAGINATION={'PARAM': 'page', 'PROBE_LAST_PAGE': probe_last_page, 'MAX_FAILED_PAGES': 3})
+    scraper = get_scraper(webscraperr.WebScraperRequest, config)
+    scraper.get_next_page_func = None
+    with scraper:
+        run_with_timeout(scraper.scrape_items_urls, [shop.catalogue_url])
+    assert sum(shop.server.attempts.values()) <= 3 + config['SCRAPER']['CONCURRENCY']
+    assert get_items(config) == []
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_failing_listing_page_is_dead_lettered_and_redriven(scraper_class, shop, make_config):
+    shop.server.error_rate = 1.0
+    config = make_config(RETRY={'ENABLED': True, 'MAX_ATTEMPTS': 2, 'BACKOFF': 0.01})
+    with get_scraper(scraper_class, config) as scraper:
+        run_with_timeout(scraper.scrape_items_urls, [shop.catalogue_url])
+        assert get_items(config) == []
+        with scraper.db_class(config['DATABASE']) as conn:
+            dead_letters = conn.get_dead_letters()
+        assert [(row['URL'], row['STATUS_CODE'], row['ATTEMPTS']) for row in dead_letters] == [(shop.catalogue_url, 503, 2)]
+        shop.server.error_rate = 0.0
+        assert run_with_timeout(scraper.redrive_dead_letters) == 1
+        with scraper.db_class(config['DATABASE']) as conn:
+            assert conn.get_dead_letters() == []
+    assert len(get_items(config)) == 30
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_transient_errors_are_retried(scraper_class, shop, make_config):
+    shop.server.error_rate = 0.3
+    config = make_config(RETRY={'ENABLED': True, 'MAX_ATTEMPTS': 8, 'BACKOFF': 0.01})
+    with get_scraper(scraper_class, config) as scraper:
+        run_with_timeout(scraper.scrape_items_urls, [shop.catalogue_url])
+        run_with_timeout(scraper.scrape_items_infos)
+        with scraper.db_class(config['DATABASE']) as conn:
+            assert conn.get_dead_letters() == []
+    items = get_items(config)
+    assert len(items) == 30
+    assert all(item['INFO'] is not None for item in items)
+    assert max(shop.server.attempts.values()) > 1
+
+
+def test_listing_resumes_from_checkpoint(shop, make_config):
+    config = make_config(database={'FRONTIER': {'ENABLED': True}})
+    pages = []
+
+    def crashing_get_next_page_func(response):
+        pages.append(response.url)
+        if len(pages) == 2:
+            raise RuntimeError("crash")
+        return get_next_page_func(response)
+
+    scraper = get_scraper(webscraperr.WebScraperRequest, config)
+    scraper.get_next_page_func = crashing_get_next_page_func
+    with scraper:
+        with pytest.raises(RuntimeError, match="crash"):
+            scraper.scrape_items_urls([shop.catalogue_url])
+    assert len(get_items(config)) == 20
+    with scraper:
+        scraper.scrape_items_urls([shop.catalogue_url])
+        assert len(get_items(config)) == 30
+        assert pages[0] == shop.catalogue_url
+        assert pages[2] == pages[1] != shop.catalogue_url
+        scraper.scrape_items_urls([shop.catalogue_url])
+    assert len(pages) == 4
+
+
+@pytest.mark.parametrize('with_info', [False, True])
+def test_rejected_url_is_redriven_as_url(with_info, shop, make_config):
+    config = make_config()
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.cursor.execute("CREATE TRIGGER reject_item_5 BEFORE INSERT ON items WHEN NEW.URL LIKE '%/item/5' BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+    scraper = get_scraper(webscraperr.WebScraperRequest, config)
+    if with_info:
+        scraper.get_items_urls_func = None
+        scraper.get_items_urls_and_infos_func = lambda response: [(url, {'listed': True}) for url in get_items_urls_func(response)]
+    with scraper:
+        scraper.scrape_items_urls([shop.catalogue_url])
+        assert len(get_items(config)) == 29
+        with scraper.db_class(config['DATABASE']) as conn:
+            assert [(row['URL'], row['KIND']) for row in conn.get_dead_letters()] == [(f"{shop.base_url}/item/5", 'URL')]
+            conn.cursor.execute("DROP TRIGGER reject_item_5")
+        assert scraper.redrive_dead_letters() == 1
+        with scraper.db_class(config['DATABASE']) as conn:
+            assert conn.get_dead_letters() == []
+            item = conn.get_by_url(f"{shop.base_url}/item/5")
+    assert len(get_items(config)) == 30
+    assert (json.loads(item['INFO']) if with_info else item['INFO']) == ({'listed': True} if with_info else None)
@@ -0,0 +1,40 @@
+from webscraperr.buffer import WriteBuffer
+from webscraperr.db import WebScraperDBSqlite, get_db_class_by_config
+from .conftest import get_items
+
+SEEN_URLS = {'ENABLED': True, 'TYPE': 'SET'}
+
+
+def get_buffer(config: dict):
+    config['DATABASE']['BUFFER'] = {'SIZE': 1000, 'INTERVAL': None}
+    return WriteBuffer(get_db_class_by_config(config['DATABASE']), config['DATABASE'])
+
+
+def test_index_is_not_shared_between_databases(make_config, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = make_config(database={'DATABASE': str(tmp_path / 'a.db'), 'SEEN_URLS': dict(SEEN_URLS)})
+    with get_buffer(first) as buffer:
+        buffer.save_urls([[f"http://shop/p{i}"] for i in range(10)])
+    second = make_config(database={'DATABASE': str(tmp_path / 'b.db'), 'SEEN_URLS': dict(SEEN_URLS)})
+    with WebScraperDBSqlite(second['DATABASE']) as conn:
+        conn.save_urls([[f"http://other/p{i}"] for i in range(10)])
+    with get_buffer(second) as buffer:
+        assert len(buffer.seen_urls) == 10
+        buffer.save_urls([["http://shop/p1"], ["http://shop/p2"], ["http://other/p3"]])
+    assert [item['URL'] for item in get_items(second)][10:] == ["http://shop/p1", "http://shop/p2"]
+
+
+def test_rejected_urls_are_not_marked_seen(make_config, tmp_path):
+    config = make_config(database={'SEEN_URLS': {**SEEN_URLS, 'PATH': str(tmp_path / 'items.seen')}})
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.cursor.execute("CREATE TRIGGER reject_p1 BEFORE INSERT ON items WHEN NEW.URL='http://shop/p1' BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+    with get_buffer(config) as buffer:
+        buffer.save_urls([["http://shop/p0"], ["http://shop/p1"]])
+        buffer.flush()
+        buffer.save_urls([["http://shop/p0"]])
+    assert [item['URL'] for item in get_items(config)] == ["http://shop/p0"]
+    with WebScraperDBSqlite(config['DATABASE']) as conn:
+        conn.cursor.execute("DROP TRIGGER reject_p1")
+    with get_buffer(config) as buffer:
+        buffer.save_urls([["http://shop/p1"]])
+    assert [item['URL'] for item in get_items(config)] == ["http://shop/p0", "http://shop/p1"]
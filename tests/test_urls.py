@@ -0,0 +1,23 @@
+import pytest
+from webscraperr.urls import canonicalize_url, set_query_param
+
+CANONICALIZE = {'STRIP_PARAMS': ['utm_*', 'gclid'], 'SORT_PARAMS': True, 'REMOVE_FRAGMENT': True}
+
+
+@pytest.mark.parametrize('url, expected', [
+    ("HTTPS://Shop.Example.COM:443/a%7eb/%2fc?b=2&utm_source=x&a=1#frag", "https://shop.example.com/a~b/%2Fc?a=1&b=2"),
+    ("http://shop.example.com:8080?gclid=1", "http://shop.example.com:8080/"),
+    ("https://user:pw@EX.com/p?q=a+b&q=c", "https://user:pw@ex.com/p?q=a+b&q=c"),
+    ("https://[::1]:443/x", "https://[::1]/x"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url, CANONICALIZE) == expected
+
+
+def test_canonicalize_url_trailing_slash():
+    assert canonicalize_url("https://ex.com/p/?a=1", {'REMOVE_TRAILING_SLASH': True}) == "https://ex.com/p?a=1"
+    assert canonicalize_url("https://ex.com/p/", CANONICALIZE) == "https://ex.com/p/"
+
+
+def test_set_query_param():
+    assert set_query_param("https://ex.com/list?page=1&sort=asc", 'page', 3) == "https://ex.com/list?sort=asc&page=3"